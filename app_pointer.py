@@ -0,0 +1,83 @@
+"""
+In-app pointer for the "app" input backend.
+
+With the OS backend the recognizer moves the real pointer (pynput) and the GUI clicks with
+pyautogui, so every action goes through the display server and pyautogui's built-in pause.
+With the app backend the recognizer only publishes the smoothed cursor position on the hand
+channel. PointerBridge watches the channel on a thread and wakes the Tk thread with a
+<<GestureCursor>> virtual event; the GUI then hit-tests the position itself, synthesizes
+<Enter>/<Leave> on the widgets under it, and invokes widgets directly on a click gesture.
+Nothing touches the OS pointer, so this also works on headless (Xvfb) rigs.
+"""
+import threading
+
+
+class PointerBridge:
+    """
+    Args:
+        reader: hand_channel.HandChannelReader the recognizer publishes the cursor to.
+        notify: Callable run on the bridge thread when a new cursor position (or its absence)
+            is available through take() (typically generating a Tk virtual event).
+        rate (float): Polls of the channel per second.
+    """
+    def __init__(self, reader, notify, rate=120):
+        self.reader = reader
+        self.notify = notify
+        self.interval = 1.0 / rate
+        self.cursor = None  # Newest (x, y) in screen pixels, None while the cursor is inactive
+        self.sequence = 0
+        self.notified = False
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def take(self):
+        """Return the newest cursor position (Tk thread)."""
+        with self.lock:
+            self.notified = False
+            return self.cursor
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            sequence = self.reader.latest_sequence()
+            if sequence == self.sequence:
+                continue
+            self.sequence = sequence
+            state = self.reader.read(sequence)
+            if state is None:
+                continue
+            cursor = tuple(round(value) for value in state.cursor) if state.cursor is not None else None
+            with self.lock:
+                if cursor == self.cursor:
+                    continue
+                self.cursor = cursor
+                if self.notified:
+                    continue  # The Tk thread has not taken the previous position yet
+                self.notified = True
+            self.notify()
+
+
+def invoke_at(widget, x, y):
+    """
+    Activate a widget the way a click at screen position (x, y) would.
+    Buttons are invoked; sliders jump to the value under the position.
+    :return: True when the widget (or one of its parents) could be activated.
+    """
+    while widget is not None:
+        if widget.winfo_class() == "Scale":
+            value = widget.tk.call(widget._w, "get", x - widget.winfo_rootx(), y - widget.winfo_rooty())
+            widget.set(value)
+            return True
+        if hasattr(widget, "invoke") and str(widget.cget("state")) != "disabled":
+            widget.invoke()
+            return True
+        widget = widget.master
+    return False
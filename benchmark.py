@@ -0,0 +1,651 @@
+"""
+Offline replay harness and FPS benchmark for gestures.GestureRecognizer.
+
+Examples:
+    python benchmark.py --video clip.mp4             # replay a recorded video
+    python benchmark.py --landmarks session.jsonl    # replay recorded landmarks (no MediaPipe cost)
+    python benchmark.py --record session.jsonl       # record landmarks from the camera
+    python benchmark.py --camera --frames 300        # benchmark the live camera
+    python benchmark.py --classify session.jsonl     # batch-classify a landmark recording
+    python benchmark.py --video clip.mp4 --fps 30 --threaded   # threaded pipeline at camera rate
+    python benchmark.py --cursor session.jsonl       # jitter and added latency of the cursor filters
+    python benchmark.py --video clip.mp4 --roi       # crop inference to the tracked hand
+    python benchmark.py --camera --idle-after 2      # idle the loop while no hand is seen
+    python benchmark.py --video clip.mp4 --compare-preview   # FPS with and without the preview window
+    python benchmark.py --landmarks session.jsonl --two-hands   # throughput with two hands in frame
+    python benchmark.py --motion swipes.jsonl --expect "SWIPE LEFT"   # dynamic gesture accuracy and latency
+    python benchmark.py --dwell pointing.jsonl       # dwell-to-click selection throughput, with and without snapping
+"""
+import argparse
+import json
+import math
+import time
+from collections import defaultdict
+from multiprocessing import Queue
+
+import cv2
+import numpy as np
+
+from frame_governor import FrameGovernor
+
+STAGES = ["capture", "resize", "flip", "cvtColor", "process", "detect_gesture", "cursor", "drawing", "imshow"]
+
+
+def percentile(values, pct):
+    """
+    Return the pct-th percentile of values using linear interpolation.
+    :param values: Sequence of numbers.
+    :param pct: Percentile between 0 and 100.
+    :return: Percentile as a float (0.0 for an empty sequence).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lower = math.floor(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def summarize(samples):
+    """Return mean/p50/p95/p99 of a list of durations, in milliseconds."""
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    return {
+        "mean": sum(samples) / len(samples) * 1000,
+        "p50": percentile(samples, 50) * 1000,
+        "p95": percentile(samples, 95) * 1000,
+        "p99": percentile(samples, 99) * 1000,
+    }
+
+
+class StageTimer:
+    """Accumulate per-stage and end-to-end latency for every frame of the recognition loop."""
+    def __init__(self):
+        self.stage_samples = defaultdict(list)
+        self.frame_latencies = []
+        self._frame = None
+        self._frame_start = 0.0
+        self._last = 0.0
+        self._wall_start = None
+        self._wall_end = None
+
+    def start_frame(self):
+        now = time.perf_counter()
+        if self._wall_start is None:
+            self._wall_start = now
+        self._frame_start = self._last = now
+        self._frame = defaultdict(float)
+
+    def mark(self, stage):
+        """Charge the time since the previous mark to the given stage."""
+        now = time.perf_counter()
+        self._frame[stage] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        now = time.perf_counter()
+        self.frame_latencies.append(now - self._frame_start)
+        for stage, elapsed in self._frame.items():
+            self.stage_samples[stage].append(elapsed)
+        self._wall_end = now
+
+    def report(self):
+        """Return a dict with the frame count, FPS, per-stage and end-to-end latency summaries."""
+        frames = len(self.frame_latencies)
+        wall = (self._wall_end - self._wall_start) if frames else 0.0
+        stages = [s for s in STAGES if s in self.stage_samples]
+        stages += [s for s in self.stage_samples if s not in STAGES]
+        return {
+            "frames": frames,
+            "fps": frames / wall if wall > 0 else 0.0,
+            "stages": {stage: summarize(self.stage_samples[stage]) for stage in stages},
+            "end_to_end": summarize(self.frame_latencies),
+        }
+
+
+def format_report(report):
+    """Format a StageTimer report as a plain-text table."""
+    lines = [f"Frames: {report['frames']}   FPS: {report['fps']:.1f}", ""]
+    if "cpu_percent" in report:
+        lines[0] += f"   CPU: {report['cpu_percent']:.0f}%"
+    if "hands_per_frame" in report:
+        lines[0] += f"   Hands/frame: {report['hands_per_frame']:.2f}"
+    if "governor" in report:
+        lines.insert(1, "Governor: " + ", ".join(f"{name}={value}" for name, value in report["governor"].items()))
+    if "roi" in report:
+        lines.insert(1, "ROI: " + ", ".join(f"{name}={value}" for name, value in report["roi"].items()))
+    if "pipeline" in report:
+        counters = report["pipeline"]
+        lines.insert(1, "Pipeline: " + ", ".join(f"{name}={value}" for name, value in counters.items()))
+    lines.append(f"{'stage':<16}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(report["stages"].items()) + [("end-to-end", report["end_to_end"])]
+    for name, stats in rows:
+        lines.append(
+            f"{name:<16}{stats['mean']:>10.2f}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+class FrameLimit:
+    """Wrap a frame source and stop after a fixed number of frames."""
+    def __init__(self, source, max_frames):
+        self.source = source
+        self.remaining = max_frames
+
+    def isOpened(self):
+        return self.source.isOpened()
+
+    def read(self):
+        if self.remaining is not None:
+            if self.remaining <= 0:
+                return False, None
+            self.remaining -= 1
+        return self.source.read()
+
+    def release(self):
+        self.source.release()
+
+
+class PacedSource:
+    """Wrap a frame source and deliver frames no faster than a camera running at fps."""
+    def __init__(self, source, fps):
+        self.source = source
+        self.interval = 1.0 / fps
+        self.next_frame = None
+
+    def isOpened(self):
+        return self.source.isOpened()
+
+    def read(self):
+        now = time.perf_counter()
+        if self.next_frame is None:
+            self.next_frame = now
+        elif now < self.next_frame:
+            time.sleep(self.next_frame - now)
+        self.next_frame += self.interval
+        return self.source.read()
+
+    def release(self):
+        self.source.release()
+
+
+class BlankFrameSource:
+    """Frame source producing black frames, used together with LandmarkReplay."""
+    def __init__(self, width, height, count):
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.remaining = count
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.remaining <= 0:
+            return False, None
+        self.remaining -= 1
+        return True, self.frame.copy()
+
+    def release(self):
+        pass
+
+
+class _ReplayResult:
+    def __init__(self, multi_hand_landmarks, multi_handedness=None):
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+
+
+class LandmarkReplay:
+    """
+    Stand-in for mp_hands.Hands that returns recorded landmarks instead of running inference.
+    Recordings are JSON lines written by record_landmarks().
+
+    Args:
+        path (str): Landmark recording.
+        two_hands (bool): Add a mirrored copy of the hand to every frame that has a single hand,
+            so a one-hand recording benchmarks the two-hand path.
+    """
+    def __init__(self, path, two_hands=False):
+        from mediapipe.framework.formats import classification_pb2, landmark_pb2
+
+        self.results = []
+        self.hand_count = 0
+        self.width, self.height = 640, 480
+        with open(path) as f:
+            for line in f:
+                record = json.loads(line)
+                self.width, self.height = record.get("size", [self.width, self.height])
+                hands = record["hands"]
+                labels = record.get("handedness", [None] * len(hands))
+                if two_hands and len(hands) == 1:
+                    hands = hands + [[[1.0 - x, y, z] for x, y, z in hands[0]]]
+                    labels = labels + [{"Left": "Right", "Right": "Left"}.get(labels[0])]
+                hands_list = []
+                for hand in hands:
+                    landmark_list = landmark_pb2.NormalizedLandmarkList()
+                    for x, y, z in hand:
+                        landmark_list.landmark.add(x=x, y=y, z=z)
+                    hands_list.append(landmark_list)
+                handedness = None
+                if hands_list and all(labels):
+                    handedness = []
+                    for label in labels:
+                        classification_list = classification_pb2.ClassificationList()
+                        classification_list.classification.add(label=label, score=1.0)
+                        handedness.append(classification_list)
+                self.hand_count += len(hands_list)
+                self.results.append(_ReplayResult(hands_list or None, handedness))
+        self.index = 0
+
+    def __len__(self):
+        return len(self.results)
+
+    def hands_per_frame(self):
+        """Mean number of hands per recorded frame."""
+        return self.hand_count / len(self.results) if self.results else 0.0
+
+    def process(self, frame_rgb):
+        result = self.results[self.index % len(self.results)]
+        self.index += 1
+        return result
+
+
+def record_landmarks(path, source, max_frames=None):
+    """
+    Record MediaPipe landmarks from a frame source into a JSON lines file for later replay.
+    :param path: Output file path.
+    :param source: Frame source with the cv2.VideoCapture interface.
+    :param max_frames: Stop after this many frames (None records until the source ends).
+    :return: Number of frames recorded.
+    """
+    from gestures import create_hand_model
+
+    hands = create_hand_model()
+    count = 0
+    with open(path, "w") as f:
+        while source.isOpened() and (max_frames is None or count < max_frames):
+            ret, frame = source.read()
+            if not ret:
+                break
+            frame = cv2.flip(frame, 1)
+            frame_height, frame_width, _ = frame.shape
+            result = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            hands_list = []
+            for hand_landmarks in result.multi_hand_landmarks or []:
+                hands_list.append([[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark])
+            handedness = [hand.classification[0].label for hand in result.multi_handedness or []]
+            f.write(json.dumps({"t": time.time(), "size": [frame_width, frame_height], "hands": hands_list,
+                                "handedness": handedness}) + "\n")
+            count += 1
+    source.release()
+    return count
+
+
+def load_landmark_array(path):
+    """
+    Load every recorded hand of a landmark recording into one array.
+    :param path: JSON lines file written by record_landmarks().
+    :return: Array of shape (hands, 21, 2) with normalized x, y coordinates.
+    """
+    points = []
+    with open(path) as f:
+        for line in f:
+            for hand in json.loads(line)["hands"]:
+                points.append([(x, y) for x, y, _ in hand])
+    return np.array(points).reshape(-1, 21, 2)
+
+
+def evaluate_classifier(path):
+    """
+    Batch-classify a landmark recording and compare against the per-hand rule cascade.
+    :return: Dict with the hand count, per-hand latency of both paths, agreement and gesture counts.
+    """
+    from types import SimpleNamespace
+    from gestures import GESTURES, classify_batch, detect_gesture_rules
+
+    points = load_landmark_array(path)
+    start = time.perf_counter()
+    codes = classify_batch(points)
+    batch_time = time.perf_counter() - start
+
+    hands_list = [[SimpleNamespace(x=x, y=y) for x, y in hand] for hand in points.tolist()]
+    start = time.perf_counter()
+    rule_names = [detect_gesture_rules(hand) for hand in hands_list]
+    rules_time = time.perf_counter() - start
+
+    names = [GESTURES[code] for code in codes]
+    count = max(len(names), 1)
+    return {
+        "hands": len(names),
+        "batch_us_per_hand": batch_time / count * 1e6,
+        "rules_us_per_hand": rules_time / count * 1e6,
+        "agreement": sum(a == b for a, b in zip(names, rule_names)) / count,
+        "gestures": {name: names.count(name) for name in GESTURES if name in names},
+    }
+
+
+def load_cursor_trace(path, width, height):
+    """
+    Load the index fingertip trajectory of the first hand from a landmark recording.
+    :return: Tuple (timestamps, xs, ys) in seconds and screen pixels, frames without a hand skipped.
+    """
+    times, xs, ys = [], [], []
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            if record["hands"]:
+                x, y, _ = record["hands"][0][8]
+                times.append(record["t"])
+                xs.append(x * width)
+                ys.append(y * height)
+    return np.array(times), np.array(xs), np.array(ys)
+
+
+def jitter_rms(xs, ys, window=5):
+    """RMS distance (px) of a path from its own centered moving average, i.e. high-frequency shake."""
+    kernel = np.ones(window) / window
+    smooth_x = np.convolve(xs, kernel, mode="valid")
+    smooth_y = np.convolve(ys, kernel, mode="valid")
+    half = window // 2
+    dx = xs[half:len(xs) - half] - smooth_x
+    dy = ys[half:len(ys) - half] - smooth_y
+    return float(np.sqrt(np.mean(dx ** 2 + dy ** 2)))
+
+
+def added_latency(times, raw, filtered, max_lag=0.2, step=0.002):
+    """Return the delay (s) that best aligns the filtered path with the raw one."""
+    best_lag, best_error = 0.0, None
+    for lag in np.arange(0.0, max_lag, step):
+        shifted = np.interp(times - lag, times, raw)
+        error = np.mean((filtered - shifted) ** 2)
+        if best_error is None or error < best_error:
+            best_lag, best_error = lag, error
+    return float(best_lag)
+
+
+def evaluate_cursor_filters(path, rate=120):
+    """
+    Replay the fingertip trajectory of a recording through every cursor filter.
+    Reports jitter (px RMS) at camera rate, jitter of the interpolated display-rate stream the
+    CursorThread would produce, and the latency the filter adds.
+    """
+    from cursor_filter import CURSOR_FILTERS, make_cursor_filter
+    import pyautogui
+
+    screen_width, screen_height = pyautogui.size()
+    times, xs, ys = load_cursor_trace(path, screen_width, screen_height)
+    if len(times) < 10:
+        raise ValueError(f"{path} has too few frames with a hand for a cursor benchmark")
+    report = {"frames": len(times), "raw_jitter_px": jitter_rms(xs, ys)}
+    for name in CURSOR_FILTERS:
+        cursor_filter = make_cursor_filter(name)
+        out, display = [], []
+        for i, (t, x, y) in enumerate(zip(times, xs, ys)):
+            out.append(cursor_filter.update(x, y, t))
+            next_t = times[i + 1] if i + 1 < len(times) else t
+            for tick in np.arange(t, next_t, 1.0 / rate):
+                display.append(cursor_filter.predict(tick))
+        out = np.array(out)
+        display = np.array(display) if display else out
+        report[name] = {
+            "jitter_px": jitter_rms(out[:, 0], out[:, 1]),
+            "display_jitter_px": jitter_rms(display[:, 0], display[:, 1], window=max(5, rate // 6)),
+            "added_latency_ms": added_latency(times, xs, out[:, 0]) * 1000,
+        }
+    return report
+
+
+def load_wrist_trace(path):
+    """
+    Load the wrist trajectory of the first hand from a landmark recording.
+    :return: List of (timestamp, x, y) in frame heights, with None for frames without a hand.
+    """
+    trace = []
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            if not record["hands"]:
+                trace.append(None)
+                continue
+            width, height = record.get("size", [640, 480])
+            x, y, _ = record["hands"][0][0]
+            trace.append((record["t"], x * width / height, y))
+    return trace
+
+
+def evaluate_motion(path, expect=None):
+    """
+    Replay the wrist trajectory of a recording through the dynamic-gesture recognizer.
+    :param expect: Name of the motion performed throughout the recording (e.g. "SWIPE LEFT");
+        when given, the share of recognized motions that match it is reported as precision.
+    :return: Dict with the recognized motions, stroke counts and per-frame update latency.
+    """
+    from trajectory import MotionRecognizer
+
+    recognizer = MotionRecognizer()
+    motions = []
+    update_times, stroke_times = [], []
+    for sample in load_wrist_trace(path):
+        if sample is None:
+            recognizer.reset()
+            continue
+        strokes = recognizer.strokes
+        start = time.perf_counter()
+        motion = recognizer.update(*sample)
+        elapsed = time.perf_counter() - start
+        update_times.append(elapsed)
+        if recognizer.strokes != strokes:
+            stroke_times.append(elapsed)
+        if motion is not None:
+            motions.append(motion.name)
+    report = {
+        "frames": len(update_times),
+        "strokes": recognizer.strokes,
+        "recognized": {name: motions.count(name) for name in sorted(set(motions))},
+        "update_ms": summarize(update_times),
+        "match_ms": summarize(stroke_times),
+    }
+    if expect is not None:
+        report["precision"] = motions.count(expect) / len(motions) if motions else 0.0
+    return report
+
+
+def button_grid(width, height, columns=4, rows=3, fill=0.6):
+    """
+    Lay out a grid of button boxes over the screen, like the room list.
+    :param fill: Share of each grid cell covered by its button.
+    :return: List of (x0, y0, x1, y1, name) in screen pixels.
+    """
+    boxes = []
+    cell_width, cell_height = width / columns, height / rows
+    for row in range(rows):
+        for column in range(columns):
+            cx, cy = (column + 0.5) * cell_width, (row + 0.5) * cell_height
+            half_width, half_height = fill * cell_width / 2, fill * cell_height / 2
+            boxes.append((cx - half_width, cy - half_height, cx + half_width, cy + half_height, f"button {row}.{column}"))
+    return boxes
+
+
+def evaluate_dwell(path, width=1280, height=720, dwell_time=0.8, snap_radius=24, columns=4, rows=3):
+    """
+    Replay the fingertip trajectory of a recording through the in-app pointer's cursor filter,
+    target snapping and dwell-to-click over a grid of buttons.
+    Reports the selection throughput (dwell clicks per minute of recording) with and without
+    snapping, and the per-sample cost of snapping.
+    """
+    from cursor_filter import make_cursor_filter
+    from hover_index import HoverIndex
+    from pointer_assist import DwellClicker, TargetSnapper
+
+    times, xs, ys = load_cursor_trace(path, width, height)
+    if len(times) < 10:
+        raise ValueError(f"{path} has too few frames with a hand for a dwell benchmark")
+    index = HoverIndex()
+    index.rebuild(button_grid(width, height, columns, rows))
+    minutes = (times[-1] - times[0]) / 60
+    report = {"frames": len(times), "seconds": float(times[-1] - times[0]), "buttons": len(index.boxes)}
+    for name, radius in (("no_snap", 0), ("snap", snap_radius)):
+        cursor_filter = make_cursor_filter("one_euro")
+        snapper = TargetSnapper(index, radius) if radius else None
+        dwell = DwellClicker(dwell_time)
+        selected, update_times = [], []
+        for t, x, y in zip(times, xs, ys):
+            x, y = cursor_filter.update(x, y, t)
+            start = time.perf_counter()
+            target = snapper.update(x, y)[0] if snapper else index.hit(x, y)
+            update_times.append(time.perf_counter() - start)
+            if dwell.update(t, target, x, y)[1]:
+                selected.append(target)
+        report[name] = {
+            "selections": len(selected),
+            "targets_per_minute": len(selected) / minutes if minutes > 0 else 0.0,
+            "distinct_targets": len(set(selected)),
+            "snap_us": summarize([elapsed * 1000 for elapsed in update_times]),
+            "index_lookups_per_frame": snapper.lookups / len(times) if snapper else 1.0,
+        }
+    return report
+
+
+def run_benchmark(source, hand_model=None, threaded=False, roi=False, governor=None, preview="window"):
+    """
+    Run a GestureRecognizer over a frame source and return the StageTimer report.
+    :param source: Frame source with the cv2.VideoCapture interface.
+    :param hand_model: Optional Hands replacement (e.g. LandmarkReplay).
+    :param threaded: Benchmark the threaded CapturePipeline instead of the serial loop.
+    :param roi: Enable region-of-interest tracking and report its hit rate.
+    :param governor: Optional FrameGovernor; its idle/active counters are added to the report.
+    :param preview: Preview mode of the recognizer ("window", "debug" or None for headless).
+    """
+    from gestures import GestureRecognizer
+
+    timer = StageTimer()
+    queue = Queue()
+    queue.cancel_join_thread()  # Nobody drains the queue during a benchmark
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    recognizer = GestureRecognizer(queue, source=source, hand_model=hand_model, timer=timer, threaded=threaded,
+                                   roi=roi, governor=governor, preview=preview)
+    pipeline = recognizer.run()
+    elapsed = time.perf_counter() - start
+    report = timer.report()
+    report["cpu_percent"] = (time.process_time() - cpu_start) / elapsed * 100 if elapsed > 0 else 0.0
+    if pipeline is not None:
+        # Stage timings cover inference only; end-to-end is capture -> render
+        counters = pipeline.counters()
+        report["fps"] = counters["rendered"] / elapsed if elapsed > 0 else 0.0
+        report["end_to_end"] = summarize(pipeline.latencies)
+        report["pipeline"] = counters
+    if recognizer.roi_tracker is not None:
+        report["roi"] = recognizer.roi_tracker.stats()
+    if governor is not None:
+        report["governor"] = governor.stats()
+    if isinstance(hand_model, LandmarkReplay):
+        report["hands_per_frame"] = hand_model.hands_per_frame()
+    return report
+
+
+def compare_preview_modes(make_source, hand_model_factory, threaded=False):
+    """
+    Run the same recording with each preview mode and report the FPS gain over the "window" mode.
+    :param make_source: Callable returning a fresh frame source for every run.
+    :param hand_model_factory: Callable returning a fresh hand model (or None for MediaPipe).
+    """
+    results = {}
+    for name, preview in (("window", "window"), ("debug", "debug"), ("headless", None)):
+        hand_model = hand_model_factory()
+        report = run_benchmark(make_source(hand_model), hand_model, threaded, preview=preview)
+        results[name] = {"fps": report["fps"], "end_to_end_p95_ms": report["end_to_end"]["p95"]}
+    baseline = results["window"]["fps"]
+    for stats in results.values():
+        stats["fps_gain_percent"] = (stats["fps"] / baseline - 1) * 100 if baseline else 0.0
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the gesture recognition loop.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--video", help="Replay a recorded video file")
+    group.add_argument("--landmarks", help="Replay a landmark recording (JSON lines)")
+    group.add_argument("--record", help="Record landmarks from the camera into this file")
+    group.add_argument("--camera", action="store_true", help="Benchmark the live camera")
+    group.add_argument("--classify", help="Batch-classify a landmark recording (JSON lines)")
+    group.add_argument("--cursor", help="Evaluate the cursor filters on a landmark recording")
+    group.add_argument("--motion", help="Evaluate swipe/flick/circle recognition on a landmark recording")
+    group.add_argument("--dwell", help="Evaluate dwell-to-click throughput on a landmark recording")
+    parser.add_argument("--expect", help="With --motion: the motion performed in the recording")
+    parser.add_argument("--dwell-time", type=float, default=0.8, help="With --dwell: seconds to rest on a button")
+    parser.add_argument("--frames", type=int, default=None, help="Maximum number of frames")
+    parser.add_argument("--fps", type=float, default=None, help="Pace replayed frames at this camera rate")
+    parser.add_argument("--threaded", action="store_true", help="Use the threaded capture pipeline")
+    parser.add_argument("--roi", action="store_true", help="Crop inference to the tracked hand")
+    parser.add_argument("--idle-after", type=float, default=None,
+                        help="Enable the frame governor: seconds without a hand before idling")
+    parser.add_argument("--preview", choices=["window", "debug", "none"], default="window",
+                        help="Preview mode of the recognizer (none = headless)")
+    parser.add_argument("--compare-preview", action="store_true",
+                        help="Replay the recording once per preview mode and report the FPS gain")
+    parser.add_argument("--two-hands", action="store_true",
+                        help="Mirror single-hand frames of a landmark recording to benchmark two hands")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+    if args.roi and args.landmarks:
+        parser.error("--roi needs real frames; it cannot be combined with --landmarks")
+    if args.two_hands and not args.landmarks:
+        parser.error("--two-hands needs a --landmarks recording")
+    if args.compare_preview and not (args.video or args.landmarks):
+        parser.error("--compare-preview needs a replayable --video or --landmarks recording")
+
+    if args.record:
+        count = record_landmarks(args.record, cv2.VideoCapture(0), args.frames)
+        print(f"Recorded {count} frames to {args.record}")
+        return
+
+    if args.classify:
+        print(json.dumps(evaluate_classifier(args.classify), indent=2))
+        return
+
+    if args.cursor:
+        print(json.dumps(evaluate_cursor_filters(args.cursor), indent=2))
+        return
+
+    if args.motion:
+        print(json.dumps(evaluate_motion(args.motion, args.expect), indent=2))
+        return
+
+    if args.dwell:
+        print(json.dumps(evaluate_dwell(args.dwell, dwell_time=args.dwell_time), indent=2))
+        return
+
+    def make_hand_model():
+        return LandmarkReplay(args.landmarks, args.two_hands) if args.landmarks else None
+
+    def make_source(hand_model):
+        if args.video:
+            source = FrameLimit(cv2.VideoCapture(args.video), args.frames)
+        elif args.landmarks:
+            source = BlankFrameSource(hand_model.width, hand_model.height, args.frames or len(hand_model))
+        else:
+            source = FrameLimit(cv2.VideoCapture(0), args.frames)
+        return PacedSource(source, args.fps) if args.fps else source
+
+    if args.compare_preview:
+        report = compare_preview_modes(make_source, make_hand_model, args.threaded)
+        print(json.dumps(report, indent=2))
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(report, f, indent=2)
+        return
+
+    hand_model = make_hand_model()
+    source = make_source(hand_model)
+    governor = FrameGovernor(idle_after=args.idle_after) if args.idle_after is not None else None
+    preview = None if args.preview == "none" else args.preview
+    report = run_benchmark(source, hand_model, args.threaded, args.roi, governor, preview)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
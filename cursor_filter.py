@@ -0,0 +1,235 @@
+"""
+Smoothing and sub-frame interpolation for the index-finger cursor.
+
+The camera delivers fingertip positions at ~30 Hz with noticeable jitter. The filters below
+smooth those samples and can predict the position between frames; CursorThread uses that
+prediction to move the pointer at display rate instead of once per camera frame.
+"""
+import math
+import threading
+import time
+
+
+class OneEuroFilter:
+    """
+    One Euro filter (Casiez et al.) on 2D positions: a low-pass filter whose cutoff rises
+    with speed, so slow movements are smoothed heavily and fast ones stay responsive.
+
+    Args:
+        min_cutoff (float): Cutoff frequency in Hz at zero speed; lower means smoother.
+        beta (float): How fast the cutoff grows with speed; higher means less lag.
+        d_cutoff (float): Cutoff frequency in Hz of the speed estimate.
+        max_extrapolation (float): Seconds predict() may extrapolate past the last sample.
+    """
+    def __init__(self, min_cutoff=1.0, beta=0.007, d_cutoff=1.0, max_extrapolation=0.05):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_extrapolation = max_extrapolation
+        self.reset()
+
+    def reset(self):
+        self.position = None
+        self.velocity = (0.0, 0.0)
+        self.last_time = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, x, y, t):
+        """
+        Add a raw sample taken at time t (seconds) and return the filtered position.
+        A sample that is not newer than the previous one restarts the filter at that sample.
+        """
+        if self.position is None or t <= self.last_time:
+            self.reset()
+            self.position = (x, y)
+            self.last_time = t
+            return self.position
+
+        dt = t - self.last_time
+        raw_vx = (x - self.position[0]) / dt
+        raw_vy = (y - self.position[1]) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        vx = self.velocity[0] + a_d * (raw_vx - self.velocity[0])
+        vy = self.velocity[1] + a_d * (raw_vy - self.velocity[1])
+
+        cutoff = self.min_cutoff + self.beta * math.hypot(vx, vy)
+        a = self._alpha(cutoff, dt)
+        self.position = (self.position[0] + a * (x - self.position[0]),
+                         self.position[1] + a * (y - self.position[1]))
+        self.velocity = (vx, vy)
+        self.last_time = t
+        return self.position
+
+    def predict(self, t):
+        """Return the position extrapolated to time t from the filtered position and speed."""
+        if self.position is None:
+            return None
+        dt = min(max(t - self.last_time, 0.0), self.max_extrapolation)
+        return (self.position[0] + self.velocity[0] * dt, self.position[1] + self.velocity[1] * dt)
+
+
+class KalmanFilter:
+    """
+    Constant-velocity Kalman filter on 2D positions, one independent [position, velocity]
+    state per axis.
+
+    Args:
+        process_noise (float): Acceleration noise (px/s^2)^2; higher follows motion more closely.
+        measurement_noise (float): Variance (px^2) of the fingertip measurements.
+        max_extrapolation (float): Seconds predict() may extrapolate past the last sample.
+    """
+    def __init__(self, process_noise=5e5, measurement_noise=25.0, max_extrapolation=0.05):
+        self.q = process_noise
+        self.r = measurement_noise
+        self.max_extrapolation = max_extrapolation
+        self.reset()
+
+    def reset(self):
+        self.axes = None  # Per axis: [position, velocity, p00, p01, p11]
+        self.last_time = None
+
+    def _step(self, axis, z, dt):
+        pos, vel, p00, p01, p11 = axis
+        # Predict
+        pos += vel * dt
+        p00 += dt * (2 * p01 + dt * p11) + self.q * dt ** 4 / 4
+        p01 += dt * p11 + self.q * dt ** 3 / 2
+        p11 += self.q * dt ** 2
+        # Update with the measured position
+        s = p00 + self.r
+        k0, k1 = p00 / s, p01 / s
+        innovation = z - pos
+        pos += k0 * innovation
+        vel += k1 * innovation
+        p11 -= k1 * p01
+        p01 -= k0 * p01
+        p00 -= k0 * p00
+        return [pos, vel, p00, p01, p11]
+
+    def update(self, x, y, t):
+        """
+        Add a raw sample taken at time t (seconds) and return the filtered position.
+        A sample that is not newer than the previous one restarts the filter at that sample.
+        """
+        if self.axes is None or t <= self.last_time:
+            self.axes = [[x, 0.0, self.r, 0.0, 1e6], [y, 0.0, self.r, 0.0, 1e6]]
+            self.last_time = t
+            return (x, y)
+        dt = t - self.last_time
+        self.axes = [self._step(self.axes[0], x, dt), self._step(self.axes[1], y, dt)]
+        self.last_time = t
+        return (self.axes[0][0], self.axes[1][0])
+
+    def predict(self, t):
+        """Return the position extrapolated to time t with the estimated velocity."""
+        if self.axes is None:
+            return None
+        dt = min(max(t - self.last_time, 0.0), self.max_extrapolation)
+        return tuple(axis[0] + axis[1] * dt for axis in self.axes)
+
+
+class PassThroughFilter:
+    """No smoothing; the cursor follows the raw samples."""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.position = None
+
+    def update(self, x, y, t):
+        self.position = (x, y)
+        return self.position
+
+    def predict(self, t):
+        return self.position
+
+
+CURSOR_FILTERS = {
+    "none": PassThroughFilter,
+    "one_euro": OneEuroFilter,
+    "kalman": KalmanFilter,
+}
+
+
+def make_cursor_filter(name, **params):
+    """
+    Create a cursor filter by name ("none", "one_euro" or "kalman").
+    :param params: Keyword arguments passed to the filter class.
+    """
+    if name not in CURSOR_FILTERS:
+        raise ValueError(f"Unknown cursor filter '{name}', expected one of {sorted(CURSOR_FILTERS)}")
+    return CURSOR_FILTERS[name](**params)
+
+
+class CursorThread:
+    """
+    Drive the pointer at display rate from filtered camera-rate samples.
+
+    Args:
+        move: Callable(x, y) that moves the pointer.
+        cursor_filter: Filter with update() and predict() (see make_cursor_filter()).
+        rate (float): Pointer updates per second.
+        clamp: Optional callable(x, y) -> (x, y) applied to every position (e.g. window bounds).
+    """
+    def __init__(self, move, cursor_filter, rate=120, clamp=None):
+        self.move = move
+        self.filter = cursor_filter
+        self.interval = 1.0 / rate
+        self.clamp = clamp
+        self.lock = threading.Lock()
+        self.active = threading.Event()
+        self.stop_event = threading.Event()
+        self.last_position = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def push(self, x, y, t=None):
+        """Add a fingertip sample (screen pixels) and start driving the pointer."""
+        t = time.perf_counter() if t is None else t
+        with self.lock:
+            self.filter.update(x, y, t)
+        self.active.set()
+
+    def release(self):
+        """Stop driving the pointer until the next sample (e.g. when pointing ends)."""
+        self.active.clear()
+        with self.lock:
+            self.filter.reset()
+            self.last_position = None
+
+    def stop(self):
+        self.stop_event.set()
+        self.active.set()
+        self.thread.join()
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        while not self.stop_event.is_set():
+            if not self.active.is_set():
+                self.active.wait()
+                next_tick = time.perf_counter()
+                continue
+            moved = None
+            with self.lock:
+                position = self.filter.predict(time.perf_counter())
+                if position is not None:
+                    x, y = int(round(position[0])), int(round(position[1]))
+                    if self.clamp:
+                        x, y = self.clamp(x, y)
+                    if (x, y) != self.last_position:
+                        self.last_position = moved = (x, y)
+            if moved is not None:
+                self.move(*moved)  # Outside the lock, so push() never waits for the OS
+            next_tick += self.interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()  # Fell behind; do not try to catch up
@@ -0,0 +1,74 @@
+"""
+Rate-limited debug preview of the recognizer's camera feed.
+
+Drawing the landmark overlay and pumping the OpenCV window on every frame costs time the
+recognizer does not need. PreviewThread keeps a copy of the latest frame only when a new
+preview frame is due, and draws and shows it on its own thread at a capped rate.
+
+This only works on Linux and Windows: on macOS, OpenCV's HighGUI (Cocoa) must be driven from
+the main thread, so the recognizer refuses the "debug" preview there (use "window" instead).
+"""
+import sys
+import threading
+import time
+
+WINDOW_NAME = "Gesture Recognition"
+THREADED_PREVIEW_SUPPORTED = sys.platform != "darwin"
+
+
+class PreviewThread:
+    """
+    Args:
+        draw: Callable(frame, markers) that draws the overlay onto a frame.
+        fps (float): Maximum preview frames per second.
+    """
+    def __init__(self, draw, fps=10):
+        self.draw = draw
+        self.interval = 1.0 / fps
+        self.next_frame = 0.0
+        self.latest = None
+        self.condition = threading.Condition()
+        self.stop_requested = False  # Set when the user presses the spacebar in the preview
+        self.closed = False
+        self.shown = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def submit(self, frame, markers):
+        """
+        Offer a processed frame to the preview; it is copied only when a preview frame is due.
+        :return: False once the user asked to stop recognition.
+        """
+        now = time.perf_counter()
+        if now >= self.next_frame:
+            self.next_frame = now + self.interval
+            with self.condition:
+                self.latest = (frame.copy(), list(markers))
+                self.condition.notify()
+        return not self.stop_requested
+
+    def stop(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+
+    def _run(self):
+        import cv2
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.latest is not None or self.closed)
+                if self.closed:
+                    break
+                frame, markers = self.latest
+                self.latest = None
+            self.draw(frame, markers)
+            cv2.imshow(WINDOW_NAME, frame)
+            self.shown += 1
+            if cv2.waitKey(1) & 0xFF == ord(' '):
+                self.stop_requested = True
+        if self.shown:
+            cv2.destroyWindow(WINDOW_NAME)
@@ -0,0 +1,92 @@
+"""
+Per-room device state, decoupled from the Tk widgets that display it.
+
+Every device is a small __slots__ record stored in a DeviceStore under (room, device).
+Views subscribe to the devices they display and are told which fields changed, so only
+the affected widgets are updated and state survives independently of any screen.
+"""
+from collections import defaultdict
+
+
+class DeviceState:
+    """Base class of the device records; subclasses list their fields in __slots__."""
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for field in self.__slots__:
+            setattr(self, field, values.get(field, self.DEFAULTS[field]))
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.as_dict().items())
+        return f"{type(self).__name__}({fields})"
+
+
+class LightState(DeviceState):
+    __slots__ = ("on", "color", "brightness")
+    DEFAULTS = {"on": False, "color": "white", "brightness": 0}
+
+
+class ThermostatState(DeviceState):
+    __slots__ = ("temperature", "mode", "fan")
+    DEFAULTS = {"temperature": 22, "mode": None, "fan": "low"}
+
+
+class MediaState(DeviceState):
+    """State of a TV or music system."""
+    __slots__ = ("on", "volume")
+    DEFAULTS = {"on": False, "volume": 50}
+
+
+class ApplianceState(DeviceState):
+    __slots__ = ("on",)
+    DEFAULTS = {"on": False}
+
+
+class DeviceStore:
+    """
+    Device records keyed by (room, device) with change notifications.
+
+    Subscribers are called as callback(state, changed) where changed is the tuple of field
+    names whose value actually changed.
+    """
+    def __init__(self):
+        self.devices = {}
+        self.subscribers = defaultdict(list)
+
+    def add(self, room, device, state):
+        """Register a device unless it already exists; return the stored record."""
+        return self.devices.setdefault((room, device), state)
+
+    def get(self, room, device):
+        return self.devices[(room, device)]
+
+    def subscribe(self, room, device, callback):
+        self.subscribers[(room, device)].append(callback)
+
+    def unsubscribe(self, room, device, callback):
+        self.subscribers[(room, device)].remove(callback)
+
+    def unsubscribe_all(self):
+        """Drop every subscriber, e.g. when the views that subscribed have been destroyed."""
+        self.subscribers.clear()
+
+    def update(self, room, device, **changes):
+        """
+        Change fields of a device and notify its subscribers.
+        :return: Tuple of the field names that changed (empty if nothing changed).
+        """
+        state = self.devices[(room, device)]
+        changed = tuple(field for field, value in changes.items() if getattr(state, field) != value)
+        if not changed:
+            return changed
+        for field in changed:
+            setattr(state, field, changes[field])
+        for callback in list(self.subscribers[(room, device)]):
+            callback(state, changed)
+        return changed
+
+    def rooms(self):
+        return sorted({room for room, _ in self.devices})
@@ -0,0 +1,225 @@
+"""
+Structured, non-blocking event log for the recognizer and the GUI.
+
+Modules log through the standard logging module (logging.getLogger(__name__)) and pass
+structured fields with extra={...}. configure_logging() installs a QueueHandler on the root
+logger, so the hot path only enqueues the record; a QueueListener thread formats it and
+writes it to stderr and, optionally, to a fixed-size binary ring buffer file that keeps the
+most recent records for post-mortem debugging (`python event_log.py dump <file>`).
+
+Per-frame messages are logged with extra=SAMPLED; SamplingFilter lets at most one
+of them per logger and message through per interval and reports how many were dropped.
+"""
+import argparse
+import json
+import logging
+import mmap
+import queue
+import struct
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else was passed through extra= and is a field
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "sampled"}
+
+SAMPLED = {"sampled": True}  # extra= of per-frame records that SamplingFilter rate-limits
+
+RING_MAGIC = b"EVTRING1"
+RING_HEADER = struct.Struct("<8sIIQ")  # magic, capacity, slot size, records written
+RING_SLOT_HEADER = struct.Struct("<dBxH")  # created timestamp, level, payload length
+
+
+def record_fields(record):
+    """Return the structured fields passed to a log call with extra=."""
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Format records as one line of key=value text, or as JSON lines.
+
+    Args:
+        json_lines (bool): Emit JSON objects instead of text.
+    """
+    def __init__(self, json_lines=False):
+        super().__init__()
+        self.json_lines = json_lines
+
+    def format(self, record):
+        fields = record_fields(record)
+        if self.json_lines:
+            entry = {"t": record.created, "level": record.levelname, "logger": record.name,
+                     "msg": record.getMessage()}
+            entry.update(fields)
+            if record.exc_info:
+                entry["exc"] = self.formatException(record.exc_info)
+            return json.dumps(entry, default=str)
+
+        timestamp = time.strftime("%H:%M:%S", time.localtime(record.created))
+        line = f"{timestamp}.{int(record.msecs):03d} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limit records logged with extra={"sampled": True}; other records always pass.
+
+    Args:
+        interval (float): Seconds between two emitted records of the same logger and message.
+    """
+    def __init__(self, interval=1.0):
+        super().__init__()
+        self.interval = interval
+        self.last_emitted = {}
+        self.suppressed = {}
+
+    def filter(self, record):
+        if not getattr(record, "sampled", False):
+            return True
+        key = (record.name, record.msg)
+        now = record.created
+        if now - self.last_emitted.get(key, float("-inf")) < self.interval:
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return False
+        self.last_emitted[key] = now
+        dropped = self.suppressed.pop(key, 0)
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Write records into a memory-mapped file of fixed-size slots, overwriting the oldest.
+
+    Every slot holds the timestamp, the level and the formatted record (truncated to the slot),
+    so the file always contains the most recent `capacity` records, even after a crash.
+
+    Args:
+        path (str): Ring buffer file; created or resized as needed.
+        capacity (int): Number of slots.
+        slot_size (int): Bytes per slot, including its 12-byte header.
+    """
+    def __init__(self, path, capacity=4096, slot_size=256):
+        super().__init__()
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self.payload_size = slot_size - RING_SLOT_HEADER.size
+        size = RING_HEADER.size + capacity * slot_size
+        with open(path, "a+b") as f:
+            f.truncate(size)
+            self.map = mmap.mmap(f.fileno(), size)
+        self.written = 0
+        self.map[:RING_HEADER.size] = RING_HEADER.pack(RING_MAGIC, capacity, slot_size, 0)
+
+    def emit(self, record):
+        try:
+            payload = self.format(record).encode("utf-8")[:self.payload_size]
+            offset = RING_HEADER.size + (self.written % self.capacity) * self.slot_size
+            RING_SLOT_HEADER.pack_into(self.map, offset, record.created, record.levelno, len(payload))
+            start = offset + RING_SLOT_HEADER.size
+            self.map[start:start + len(payload)] = payload
+            self.written += 1
+            RING_HEADER.pack_into(self.map, 0, RING_MAGIC, self.capacity, self.slot_size, self.written)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.map.flush()
+        self.map.close()
+        super().close()
+
+
+def read_ring_buffer(path):
+    """
+    Read the records of a ring buffer file, oldest first.
+    :return: List of (timestamp, level name, text) tuples.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, capacity, slot_size, written = RING_HEADER.unpack_from(data, 0)
+    if magic != RING_MAGIC:
+        raise ValueError(f"{path} is not an event ring buffer")
+    records = []
+    for index in range(max(0, written - capacity), written):
+        offset = RING_HEADER.size + (index % capacity) * slot_size
+        created, level, length = RING_SLOT_HEADER.unpack_from(data, offset)
+        start = offset + RING_SLOT_HEADER.size
+        text = data[start:start + length].decode("utf-8", errors="replace")
+        records.append((created, logging.getLevelName(level), text))
+    return records
+
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def configure_logging(level="INFO", json_lines=False, sample_interval=1.0, ring_buffer=None,
+                      ring_capacity=4096):
+    """
+    Route every log record of this process through a queue to a background writer thread.
+
+    Safe to call again (e.g. in a forked recognizer process): previous handlers are replaced.
+    :param level: Root log level name or number.
+    :param json_lines: Write JSON lines to stderr instead of key=value text.
+    :param sample_interval: Seconds between two emitted records of the same sampled message.
+    :param ring_buffer: Optional path of a binary ring buffer file that keeps the latest records.
+    :param ring_capacity: Number of records the ring buffer keeps.
+    :return: The running QueueListener.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+
+        formatter = StructuredFormatter(json_lines)
+        handlers = [logging.StreamHandler()]
+        if ring_buffer:
+            handlers.append(RingBufferHandler(ring_buffer, ring_capacity))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        records = queue.SimpleQueue()
+        queue_handler = QueueHandler(records)
+        queue_handler.addFilter(SamplingFilter(sample_interval))
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+
+        _listener = QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+
+def shutdown_logging():
+    """Flush the queued records and stop the writer thread."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect an event ring buffer file.")
+    parser.add_argument("command", choices=["dump"])
+    parser.add_argument("path")
+    args = parser.parse_args()
+    for created, level, text in read_ring_buffer(args.path):
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created))
+        print(f"{timestamp} {level:<7} {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Adaptive frame-rate governor for the gesture recognizer.
+
+While a hand is in view every camera frame is processed at full resolution. Once no hand has
+been seen for a while the governor switches to an idle presence-detection mode: frames are
+downscaled before inference and processed at a low rate. The first detection switches back
+to full rate and resolution.
+"""
+import time
+
+ACTIVE = "active"
+IDLE = "idle"
+
+
+class FrameGovernor:
+    """
+    Args:
+        idle_after (float): Seconds without a hand before switching to idle mode.
+        idle_fps (float): Frames processed per second in idle mode.
+        idle_scale (float): Factor applied to the frame width and height in idle mode.
+    """
+    def __init__(self, idle_after=2.0, idle_fps=5, idle_scale=0.5):
+        self.idle_after = idle_after
+        self.idle_interval = 1.0 / idle_fps
+        self.idle_scale = idle_scale
+        self.mode = ACTIVE
+        self.last_hand_time = time.perf_counter()
+        self.next_idle_frame = 0.0
+        self.active_frames = 0
+        self.idle_frames = 0
+        self.wake_ups = 0  # Idle -> active transitions
+
+    def throttle(self):
+        """Block until the next frame should be captured; returns immediately in active mode."""
+        if self.mode != IDLE:
+            return
+        now = time.perf_counter()
+        if self.next_idle_frame > now:
+            time.sleep(self.next_idle_frame - now)
+            now = self.next_idle_frame
+        self.next_idle_frame = now + self.idle_interval
+
+    def prepare(self, frame):
+        """Return the frame to run inference on: downscaled in idle mode, unchanged otherwise."""
+        if self.mode != IDLE:
+            self.active_frames += 1
+            return frame
+        import cv2
+        self.idle_frames += 1
+        return cv2.resize(frame, None, fx=self.idle_scale, fy=self.idle_scale, interpolation=cv2.INTER_AREA)
+
+    def observe(self, hand_present, now=None):
+        """
+        Update the mode with the outcome of the last inference.
+        :param hand_present: Whether the hand model found a hand in the frame.
+        """
+        now = time.perf_counter() if now is None else now
+        if hand_present:
+            self.last_hand_time = now
+            if self.mode == IDLE:
+                self.mode = ACTIVE
+                self.wake_ups += 1
+        elif self.mode == ACTIVE and now - self.last_hand_time >= self.idle_after:
+            self.mode = IDLE
+            self.next_idle_frame = now + self.idle_interval
+
+    def stats(self):
+        """Return the current mode and the active / idle frame counters."""
+        frames = self.active_frames + self.idle_frames
+        return {
+            "mode": self.mode,
+            "active_frames": self.active_frames,
+            "idle_frames": self.idle_frames,
+            "wake_ups": self.wake_ups,
+            "idle_ratio": self.idle_frames / frames if frames else 0.0,
+        }
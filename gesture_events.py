@@ -0,0 +1,151 @@
+"""
+Edge-triggered gesture events.
+
+The recognizer classifies every camera frame, but the GUI only cares about changes:
+GestureStateMachine smooths the per-frame labels with N-of-M voting and hysteresis and
+emits PRESS / HOLD / RELEASE events, so the queue carries a handful of events per second.
+PinchZoomTracker does the same for the two-handed pinch-zoom gesture.
+"""
+import time
+from collections import Counter, deque, namedtuple
+
+PRESS = "PRESS"
+HOLD = "HOLD"
+RELEASE = "RELEASE"
+MOTION = "MOTION"  # Discrete dynamic gesture (swipe, flick, circle); see trajectory.py
+ZOOM = "ZOOM"
+PINCH_ZOOM = "PINCH ZOOM"
+
+# kind is PRESS, HOLD, RELEASE or MOTION; duration is the seconds the gesture has been held
+# (for MOTION, the duration of the stroke)
+GestureEvent = namedtuple("GestureEvent", ["kind", "gesture", "duration"])
+# kind is PRESS, ZOOM or RELEASE; scale is the distance between the hands relative to the PRESS
+ZoomEvent = namedtuple("ZoomEvent", ["kind", "gesture", "scale"])
+
+
+class GestureStateMachine:
+    """
+    Turn per-frame gesture labels into stable PRESS / HOLD / RELEASE events.
+
+    Args:
+        window (int): Number of recent frames (M) that vote on the active gesture.
+        enter_votes (int): Votes (N of M) a gesture needs before it is pressed.
+        exit_votes (int): Votes the active gesture must keep to stay pressed; lower than
+            enter_votes so a gesture flickering for a frame or two is not released.
+        hold_time (float): Seconds after which a pressed gesture emits a single HOLD event.
+        ignored (tuple): Labels that never become active, such as "UNKNOWN GESTURE".
+    """
+    def __init__(self, window=5, enter_votes=4, exit_votes=2, hold_time=0.8, ignored=("UNKNOWN GESTURE",)):
+        self.votes = deque(maxlen=window)
+        self.counts = Counter()
+        self.enter_votes = enter_votes
+        self.exit_votes = exit_votes
+        self.hold_time = hold_time
+        self.ignored = set(ignored)
+        self.active = None
+        self.pressed_at = 0.0
+        self.held = False
+
+    def update(self, label, now=None):
+        """
+        Feed the label of one frame.
+        :param label: Gesture detected in the frame, or None when no hand is visible.
+        :param now: Timestamp of the frame (defaults to time.time()).
+        :return: List of GestureEvent produced by this frame (usually empty).
+        """
+        now = time.time() if now is None else now
+        if len(self.votes) == self.votes.maxlen:
+            self.counts[self.votes[0]] -= 1
+        self.votes.append(label)
+        self.counts[label] += 1
+
+        events = []
+        if self.active is not None and self.counts[self.active] < self.exit_votes:
+            events.append(self._release(now))
+
+        # Only the label that just received a vote can have crossed the threshold
+        if (label is not None and label not in self.ignored and label != self.active
+                and self.counts[label] >= self.enter_votes):
+            if self.active is not None:
+                events.append(self._release(now))
+            self.active = label
+            self.pressed_at = now
+            self.held = False
+            events.append(GestureEvent(PRESS, label, 0.0))
+
+        if self.active is not None and not self.held and now - self.pressed_at >= self.hold_time:
+            self.held = True
+            events.append(GestureEvent(HOLD, self.active, now - self.pressed_at))
+        return events
+
+    def reset(self, now=None):
+        """Forget the vote history and release the active gesture, if any."""
+        now = time.time() if now is None else now
+        events = [self._release(now)] if self.active is not None else []
+        self.votes.clear()
+        self.counts.clear()
+        return events
+
+    def _release(self, now):
+        event = GestureEvent(RELEASE, self.active, now - self.pressed_at)
+        self.active = None
+        return event
+
+
+class PinchZoomTracker:
+    """
+    Two-handed pinch-zoom: both hands pinch (thumb and index fingertips touching), then move
+    apart to zoom in or together to zoom out.
+
+    Args:
+        enter_frames (int): Consecutive frames with both hands pinching before the zoom starts.
+        exit_frames (int): Consecutive frames without it before the zoom ends.
+        min_change (float): Relative scale change needed before another ZOOM event is emitted.
+    """
+    def __init__(self, enter_frames=3, exit_frames=3, min_change=0.03):
+        self.enter_frames = enter_frames
+        self.exit_frames = exit_frames
+        self.min_change = min_change
+        self.active = False
+        self.streak = 0  # Consecutive frames contradicting the current state
+        self.base_distance = None
+        self.last_scale = 1.0
+
+    def update(self, distance):
+        """
+        Feed one frame.
+        :param distance: Distance between the two pinch points, or None unless both hands pinch.
+        :return: List of ZoomEvent produced by this frame (usually empty).
+        """
+        pinching = distance is not None and distance > 0
+        if pinching != self.active:
+            self.streak += 1
+        else:
+            self.streak = 0
+
+        if not self.active:
+            if pinching and self.streak >= self.enter_frames:
+                self.active = True
+                self.streak = 0
+                self.base_distance = distance
+                self.last_scale = 1.0
+                return [ZoomEvent(PRESS, PINCH_ZOOM, 1.0)]
+            return []
+
+        if not pinching:
+            if self.streak >= self.exit_frames:
+                return self.reset()
+            return []
+        scale = distance / self.base_distance
+        if abs(scale - self.last_scale) >= self.min_change * self.last_scale:
+            self.last_scale = scale
+            return [ZoomEvent(ZOOM, PINCH_ZOOM, scale)]
+        return []
+
+    def reset(self):
+        """End the zoom, if active."""
+        events = [ZoomEvent(RELEASE, PINCH_ZOOM, self.last_scale)] if self.active else []
+        self.active = False
+        self.streak = 0
+        self.base_distance = None
+        return events
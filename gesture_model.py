@@ -0,0 +1,373 @@
+"""
+Learned static-gesture classifiers on hand landmark features.
+
+The rule cascade in gestures.py is order-dependent: the thumb rules match almost any hand, so
+later gestures such as GOOD GESTURE are effectively unreachable. This module classifies hands
+with a small model trained on labeled samples instead:
+
+    landmark_features()   normalized features: translated to the wrist, rotated so the
+                          wrist -> middle-finger knuckle axis points up, scaled by its length
+                          and mirrored for left hands, so they do not depend on where the
+                          hand is, how large it appears or how it is tilted
+    KnnClassifier         k-nearest neighbours over the training samples
+    MlpClassifier         one-hidden-layer perceptron trained with NumPy
+
+Both predict a hand in well under a millisecond. GestureRecognizer(classifier=path) loads a
+model saved by `train`; classifier="rules" (the default) keeps the rule cascade.
+
+    python gesture_model.py record --label "PEACE SIGN" samples.jsonl   # capture labeled hands
+    python gesture_model.py train samples.jsonl --kind mlp --out gestures.npz
+    python gesture_model.py evaluate samples.jsonl --kind knn           # holdout accuracy and latency
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+WRIST, MIDDLE_MCP = 0, 9
+FINGERTIPS = [4, 8, 12, 16, 20]
+FEATURE_SIZE = 20 * 2 + 4  # Normalized landmarks without the wrist, thumb tip to fingertip distances
+KINDS = ("knn", "mlp")
+
+
+def landmark_features(points, left=None):
+    """
+    Compute position, scale and rotation invariant features of one or many hands.
+    :param points: Array of shape (..., 21, 2) or (..., 21, 3) with normalized landmark coordinates.
+    :param left: Optional boolean array of shape (...); left hands are mirrored onto right hands.
+    :return: Float32 array of shape (..., FEATURE_SIZE).
+    """
+    points = np.asarray(points, dtype=np.float32)[..., :2]
+    centered = points - points[..., WRIST:WRIST + 1, :]
+    if left is not None:
+        centered = centered * np.where(np.asarray(left)[..., None, None], [-1.0, 1.0], [1.0, 1.0]).astype(np.float32)
+    axis = centered[..., MIDDLE_MCP, :]
+    length = np.maximum(np.hypot(axis[..., 0], axis[..., 1]), 1e-6)[..., None]
+    ux, uy = axis[..., 0:1] / length, axis[..., 1:2] / length
+    # Rotation taking the wrist -> knuckle direction to (0, -1), i.e. straight up in image coordinates
+    x, y = centered[..., 0], centered[..., 1]
+    normalized = np.stack([-uy * x + ux * y, -ux * x - uy * y], axis=-1) / length[..., None]
+    thumb = normalized[..., FINGERTIPS[0], :]
+    tips = normalized[..., FINGERTIPS[1:], :]
+    distances = np.linalg.norm(tips - thumb[..., None, :], axis=-1)
+    return np.concatenate([normalized[..., 1:, :].reshape(points.shape[:-2] + (40,)), distances], axis=-1)
+
+
+class KnnClassifier:
+    """
+    k-nearest neighbours with a majority vote.
+
+    Args:
+        k (int): Number of neighbours that vote.
+    """
+    kind = "knn"
+
+    def __init__(self, k=5):
+        self.k = k
+        self.labels = []
+        self.samples = None
+        self.sample_labels = None
+        self.sample_norms = None
+
+    def fit(self, features, labels, names):
+        """
+        :param features: Array of shape (samples, FEATURE_SIZE).
+        :param labels: Integer array of label indices into names.
+        :param names: Gesture names.
+        """
+        self.labels = list(names)
+        self.samples = np.asarray(features, dtype=np.float32)
+        self.sample_labels = np.asarray(labels, dtype=np.int64)
+        self.sample_norms = (self.samples ** 2).sum(axis=1)
+        return self
+
+    def predict_features(self, features):
+        features = np.asarray(features, dtype=np.float32).reshape(-1, self.samples.shape[1])
+        # Squared distances without materializing the (queries, samples, features) differences
+        distances = self.sample_norms[None, :] - 2.0 * features @ self.samples.T
+        k = min(self.k, len(self.samples))
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        votes = np.zeros((len(features), len(self.labels)), dtype=np.int64)
+        np.add.at(votes, (np.arange(len(features))[:, None], self.sample_labels[nearest]), 1)
+        return votes.argmax(axis=1)
+
+    def state(self):
+        return {"k": np.array(self.k), "samples": self.samples, "sample_labels": self.sample_labels}
+
+    def load_state(self, state):
+        self.k = int(state["k"])
+        self.samples = state["samples"]
+        self.sample_labels = state["sample_labels"]
+        self.sample_norms = (self.samples ** 2).sum(axis=1)
+
+
+class MlpClassifier:
+    """
+    Perceptron with one ReLU hidden layer and a softmax output, trained full-batch with Adam.
+
+    Args:
+        hidden (int): Hidden units.
+        epochs (int): Training iterations over the whole training set.
+        learning_rate (float): Adam step size.
+        weight_decay (float): L2 penalty on the weights.
+        seed (int): Seed of the weight initialization.
+    """
+    kind = "mlp"
+
+    def __init__(self, hidden=64, epochs=400, learning_rate=0.01, weight_decay=1e-4, seed=0):
+        self.hidden = hidden
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.weight_decay = weight_decay
+        self.seed = seed
+        self.labels = []
+        self.params = {}
+
+    def _forward(self, x):
+        p = self.params
+        hidden = np.maximum((x - p["mean"]) / p["scale"] @ p["w1"] + p["b1"], 0.0)
+        return hidden, hidden @ p["w2"] + p["b2"]
+
+    def fit(self, features, labels, names):
+        """Same arguments as KnnClassifier.fit()."""
+        self.labels = list(names)
+        x = np.asarray(features, dtype=np.float32)
+        y = np.asarray(labels, dtype=np.int64)
+        rng = np.random.default_rng(self.seed)
+        inputs, outputs = x.shape[1], len(self.labels)
+        self.params = {
+            "mean": x.mean(axis=0),
+            "scale": x.std(axis=0) + 1e-6,
+            "w1": (rng.standard_normal((inputs, self.hidden)) * np.sqrt(2.0 / inputs)).astype(np.float32),
+            "b1": np.zeros(self.hidden, dtype=np.float32),
+            "w2": (rng.standard_normal((self.hidden, outputs)) * np.sqrt(1.0 / self.hidden)).astype(np.float32),
+            "b2": np.zeros(outputs, dtype=np.float32),
+        }
+        trained = ("w1", "b1", "w2", "b2")
+        moments = {name: (np.zeros_like(self.params[name]), np.zeros_like(self.params[name])) for name in trained}
+        one_hot = np.eye(outputs, dtype=np.float32)[y]
+        standardized = (x - self.params["mean"]) / self.params["scale"]
+        beta1, beta2 = 0.9, 0.999
+        for step in range(1, self.epochs + 1):
+            hidden, logits = self._forward(x)
+            probabilities = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            d_logits = (probabilities - one_hot) / len(x)
+            d_hidden = (d_logits @ self.params["w2"].T) * (hidden > 0)
+            gradients = {
+                "w2": hidden.T @ d_logits + self.weight_decay * self.params["w2"],
+                "b2": d_logits.sum(axis=0),
+                "w1": standardized.T @ d_hidden + self.weight_decay * self.params["w1"],
+                "b1": d_hidden.sum(axis=0),
+            }
+            for name in trained:
+                m, v = moments[name]
+                m[:] = beta1 * m + (1 - beta1) * gradients[name]
+                v[:] = beta2 * v + (1 - beta2) * gradients[name] ** 2
+                m_hat = m / (1 - beta1 ** step)
+                v_hat = v / (1 - beta2 ** step)
+                self.params[name] -= (self.learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8)).astype(np.float32)
+        return self
+
+    def predict_features(self, features):
+        features = np.asarray(features, dtype=np.float32).reshape(-1, self.params["w1"].shape[0])
+        return self._forward(features)[1].argmax(axis=1)
+
+    def state(self):
+        return dict(self.params)
+
+    def load_state(self, state):
+        self.params = {name: state[name] for name in ("mean", "scale", "w1", "b1", "w2", "b2")}
+
+
+def make_classifier(kind, **options):
+    """Create an untrained classifier of the given kind ("knn" or "mlp")."""
+    if kind == "knn":
+        return KnnClassifier(**options)
+    if kind == "mlp":
+        return MlpClassifier(**options)
+    raise ValueError(f"Unknown classifier kind '{kind}', expected one of {', '.join(KINDS)}")
+
+
+class GestureModel:
+    """
+    A trained classifier and the names of the gestures it predicts.
+
+    Args:
+        classifier: KnnClassifier or MlpClassifier, fitted.
+    """
+    def __init__(self, classifier):
+        self.classifier = classifier
+        self.labels = classifier.labels
+
+    def predict(self, points, left=None):
+        """
+        Classify one or many hands.
+        :param points: Array of shape (hands, 21, 2) or (hands, 21, 3) with normalized landmarks.
+        :param left: Optional boolean array of shape (hands,) marking left hands.
+        :return: Integer array of indices into self.labels.
+        """
+        return self.classifier.predict_features(landmark_features(points, left))
+
+    def save(self, path):
+        np.savez_compressed(path, kind=np.array(self.classifier.kind), labels=np.array(self.labels),
+                            **self.classifier.state())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            classifier = make_classifier(str(data["kind"]))
+            classifier.labels = [str(label) for label in data["labels"]]
+            classifier.load_state({name: data[name] for name in data.files})
+        return cls(classifier)
+
+
+def load_samples(paths):
+    """
+    Load labeled hands recorded by record_samples().
+    :param paths: One or more JSON lines files.
+    :return: Tuple (points of shape (samples, 21, 3), left-hand flags, label names).
+    """
+    points, left, names = [], [], []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                sample = json.loads(line)
+                points.append(sample["hand"])
+                left.append(sample.get("handedness") == "Left")
+                names.append(sample["label"])
+    return np.array(points, dtype=np.float32).reshape(-1, 21, 3), np.array(left, dtype=bool), names
+
+
+def train(points, left, names, kind="knn", **options):
+    """
+    Fit a GestureModel on labeled hands.
+    :param names: Gesture name of every hand.
+    :param options: Classifier arguments (k, hidden, epochs...).
+    """
+    labels = sorted(set(names))
+    indices = np.array([labels.index(name) for name in names])
+    classifier = make_classifier(kind, **options).fit(landmark_features(points, left), indices, labels)
+    return GestureModel(classifier)
+
+
+def record_samples(path, label, source, frames=200):
+    """
+    Append hands seen by the camera to a JSON lines sample file, all with the same label.
+    :param label: Gesture name the user is showing.
+    :param source: Frame source with the cv2.VideoCapture interface.
+    :param frames: Number of frames with a hand to record.
+    :return: Number of samples written.
+    """
+    import cv2
+    from gestures import create_hand_model
+
+    hand_model = create_hand_model()
+    count = 0
+    with open(path, "a") as f:
+        while source.isOpened() and count < frames:
+            ret, frame = source.read()
+            if not ret:
+                break
+            frame = cv2.flip(frame, 1)
+            result = hand_model.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            for index, hand_landmarks in enumerate(result.multi_hand_landmarks or []):
+                handedness = result.multi_handedness[index].classification[0].label if result.multi_handedness else None
+                hand = [[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark]
+                f.write(json.dumps({"label": label, "handedness": handedness, "hand": hand}) + "\n")
+                count += 1
+            cv2.putText(frame, f"{label}: {count}/{frames}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            cv2.imshow("Recording", frame)
+            if cv2.waitKey(1) & 0xFF == ord(' '):
+                break
+    source.release()
+    cv2.destroyAllWindows()
+    return count
+
+
+def evaluate(points, left, names, kind="knn", test_fraction=0.25, seed=0, **options):
+    """
+    Train on a random split of the samples and measure accuracy and latency on the rest.
+    :param kind: "knn", "mlp", or "rules" for the rule cascade of gestures.py (nothing is trained).
+    :return: Dict with the accuracy, per-gesture recall, training time and per-hand latency.
+    """
+    order = np.random.default_rng(seed).permutation(len(names))
+    split = int(len(order) * (1 - test_fraction))
+    train_idx, test_idx = order[:split], order[split:]
+    test_names = [names[i] for i in test_idx]
+
+    train_seconds = 0.0
+    if kind == "rules":
+        from gestures import GESTURES, classify_batch
+
+        def predict(batch_points, batch_left):
+            return [GESTURES[code] for code in classify_batch(batch_points[..., :2])]
+    else:
+        start = time.perf_counter()
+        model = train(points[train_idx], left[train_idx], [names[i] for i in train_idx], kind, **options)
+        train_seconds = time.perf_counter() - start
+
+        def predict(batch_points, batch_left):
+            return [model.labels[index] for index in model.predict(batch_points, batch_left)]
+
+    start = time.perf_counter()
+    predicted = predict(points[test_idx], left[test_idx])
+    batch_seconds = time.perf_counter() - start
+    single = test_idx[:200]
+    start = time.perf_counter()
+    for i in single:
+        predict(points[i:i + 1], left[i:i + 1])
+    single_seconds = time.perf_counter() - start
+
+    count = max(len(test_names), 1)
+    recall = {}
+    for name in sorted(set(test_names)):
+        hits = [p == t for p, t in zip(predicted, test_names) if t == name]
+        recall[name] = sum(hits) / len(hits)
+    return {
+        "kind": kind,
+        "train_samples": len(train_idx),
+        "test_samples": len(test_idx),
+        "accuracy": sum(p == t for p, t in zip(predicted, test_names)) / count,
+        "recall": recall,
+        "train_seconds": train_seconds,
+        "batch_us_per_hand": batch_seconds / count * 1e6,
+        "single_us_per_hand": single_seconds / max(len(single), 1) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record, train and evaluate learned gesture classifiers.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="Record labeled hands from the camera")
+    record.add_argument("samples", help="JSON lines file to append to")
+    record.add_argument("--label", required=True, help="Gesture being shown, e.g. \"PEACE SIGN\"")
+    record.add_argument("--frames", type=int, default=200, help="Hands to record")
+    record.add_argument("--camera", type=int, default=0, help="Camera index")
+    fit = commands.add_parser("train", help="Train a model on sample files")
+    fit.add_argument("samples", nargs="+")
+    fit.add_argument("--kind", choices=KINDS, default="knn")
+    fit.add_argument("--out", default="gestures.npz", help="Model file to write")
+    check = commands.add_parser("evaluate", help="Holdout accuracy and latency on sample files")
+    check.add_argument("samples", nargs="+")
+    check.add_argument("--kind", choices=KINDS + ("rules",), default="knn")
+    check.add_argument("--test-fraction", type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        import cv2
+
+        count = record_samples(args.samples, args.label, cv2.VideoCapture(args.camera), args.frames)
+        print(f"Recorded {count} '{args.label}' samples to {args.samples}")
+    elif args.command == "train":
+        points, left, names = load_samples(args.samples)
+        train(points, left, names, args.kind).save(args.out)
+        print(f"Trained a {args.kind} model on {len(names)} samples ({len(set(names))} gestures) -> {args.out}")
+    else:
+        points, left, names = load_samples(args.samples)
+        print(json.dumps(evaluate(points, left, names, args.kind, args.test_fraction), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,89 @@
-import cv2
-import mediapipe as mp
+import logging
 import math
-import pyautogui
+import numpy as np
 import time
-from collections import deque
-from pynput.mouse import Controller
+from collections import defaultdict
 from multiprocessing import Queue
+from pipeline import CapturePipeline
+from gesture_events import GestureEvent, GestureStateMachine, PinchZoomTracker, MOTION, PRESS
+from cursor_filter import CursorThread, make_cursor_filter
+from roi_tracker import RoiTracker
+from debug_preview import THREADED_PREVIEW_SUPPORTED, PreviewThread
+from event_log import SAMPLED, configure_logging
+from metrics import REGISTRY, start_exporter
+from hand_channel import HandChannelWriter
+from gesture_model import GestureModel
+from trajectory import MotionRecognizer
 
-# Initialize MediaPipe Hand module
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
-mp_drawing = mp.solutions.drawing_utils
-mouse = Controller()
-
-# Start video capture
-cap = cv2.VideoCapture(0)
-
-screen_width, screen_height = pyautogui.size()  # Get screen resolution
-prev_x, prev_y = None, None
-prev_wrist_y = None
-wrist_y_history = deque(maxlen=10)  # Tracks the last 10 wrist vertical positions
-wrist_x_history = deque(maxlen=10)  # Tracks the last 10 wrist horizontal positions
-SCROLL_THRESHOLD = 5
-GESTURE_COOLDOWN_TIME = 0.5  # Cooldown time for repeated gestures
-gesture_cooldown = {}
-
-def detect_scroll_direction(history, axis="y"):
-    """Detect scroll direction based on wrist movement."""
-    if len(history) < 2:
-        return None
-    diffs = [history[i] - history[i - 1] for i in range(1, len(history))]
-    avg_diff = sum(diffs) / len(diffs)
-    if axis == "y":  # Vertical scrolling
-        if avg_diff > SCROLL_THRESHOLD:
-            return "DOWN"
-        elif avg_diff < -SCROLL_THRESHOLD:
-            return "UP"
-    elif axis == "x":  # Horizontal scrolling
-        if avg_diff > SCROLL_THRESHOLD:
-            return "RIGHT"
-        elif avg_diff < -SCROLL_THRESHOLD:
-            return "LEFT"
-    return None
+# MediaPipe, pyautogui and pynput are imported by GestureRecognizer.start(), so importing this
+# module stays cheap and does not touch the camera or the display.
+
+log = logging.getLogger("gestures")
+
+FRAMES = REGISTRY.counter("recognizer_frames_total", "Frames processed by the recognizer")
+FRAME_SECONDS = REGISTRY.histogram("recognizer_frame_seconds", "Processing time per frame")
+STAGE_SECONDS = REGISTRY.histogram("recognizer_stage_seconds",
+                                   "Time per recognition stage per frame (stage=process is hands.process)",
+                                   labels=("stage",))
+FPS = REGISTRY.gauge("recognizer_fps", "Frames processed per second over the last second")
+GESTURE_EVENTS = REGISTRY.counter("recognizer_gesture_events_total", "Gesture events sent to the GUI",
+                                  labels=("kind", "gesture"))
+QUEUE_DEPTH = REGISTRY.gauge("recognizer_queue_depth", "Gesture events waiting in the queue to the GUI")
+
+PREVIEW_MODES = ("window", "debug", None)
+INPUT_BACKENDS = ("os", "app")
+
+
+class NullTimer:
+    """Stage timer that records nothing; used when the loop is not being benchmarked."""
+    def start_frame(self):
+        pass
+
+    def mark(self, stage):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+class MetricsTimer:
+    """
+    Stage timer that records every frame into the recognizer metrics and forwards each call
+    to another timer (NullTimer, or benchmark.StageTimer while benchmarking).
+    """
+    def __init__(self, inner):
+        self.inner = inner
+        self.frame_start = self.last = self.window_start = time.perf_counter()
+        self.frame = defaultdict(float)
+        self.window_frames = 0
+        self.stage_histograms = {}
+
+    def start_frame(self):
+        self.frame_start = self.last = time.perf_counter()
+        self.frame.clear()
+        self.inner.start_frame()
+
+    def mark(self, stage):
+        """Charge the time since the previous mark to the given stage."""
+        now = time.perf_counter()
+        self.frame[stage] += now - self.last
+        self.last = now
+        self.inner.mark(stage)
+
+    def end_frame(self):
+        now = time.perf_counter()
+        for stage, elapsed in self.frame.items():
+            histogram = self.stage_histograms.get(stage)
+            if histogram is None:
+                histogram = self.stage_histograms[stage] = STAGE_SECONDS.labels(stage=stage)
+            histogram.observe(elapsed)
+        FRAME_SECONDS.observe(now - self.frame_start)
+        FRAMES.inc()
+        self.window_frames += 1
+        if now - self.window_start >= 1.0:
+            FPS.set(self.window_frames / (now - self.window_start))
+            self.window_start, self.window_frames = now, 0
+        self.inner.end_frame()
 
 def calculate_distance(point1, point2):
     """
@@ -135,9 +177,10 @@ def is_open(landmarks):
     
     return index_up and middle_up and ring_up and pinky_up
 
-def detect_gesture(landmarks):
+def detect_gesture_rules(landmarks):
     """
-    Detect gestures based on hand landmarks.
+    Detect gestures by evaluating the rule functions one after another.
+    Reference implementation of the cascade that GESTURE_TABLE encodes.
     :param landmarks: List of hand landmarks.
     :return: String indicating the gesture detected.
     """
@@ -159,141 +202,647 @@ def detect_gesture(landmarks):
         return "GOOD GESTURE"
     return "UNKNOWN GESTURE"
 
-def map_coordinates(x, y, frame_width, frame_height):
+# Gesture names; the classifier returns indices into this list
+GESTURES = ["UNKNOWN GESTURE", "INDEX POINTING UP", "PEACE SIGN", "THREE", "ROCK'N ROLL!!!",
+            "FOUR", "THUMBS UP", "THUMBS DOWN", "GOOD GESTURE"]
+GESTURE_CODES = {name: code for code, name in enumerate(GESTURES)}
+
+# (tip, pip, mcp) landmark indices of the index, middle, ring and pinky fingers
+FINGER_JOINTS = np.array([[8, 7, 6], [12, 11, 10], [16, 15, 14], [20, 19, 18]])
+
+# Bits of the per-hand state mask computed by hand_state_masks()
+INDEX_UP, MIDDLE_UP, RING_UP, PINKY_UP = 1, 2, 4, 8
+RING_CURLED, PINKY_CURLED = 16, 32  # Fingertip below its MCP joint
+THUMB_UP, THUMB_DOWN = 64, 128
+THUMB_INDEX_TOUCH = 256
+STATE_BITS = 9
+
+def landmarks_to_array(landmarks):
+    """
+    Convert MediaPipe landmarks to a NumPy array.
+    :param landmarks: List of 21 hand landmarks.
+    :return: Array of shape (21, 2) with the normalized x, y coordinates.
+    """
+    return np.array([(lm.x, lm.y) for lm in landmarks])
+
+def hand_state_masks(points):
+    """
+    Compute the finger states of one or many hands in a single vectorized pass.
+    :param points: Array of shape (..., 21, 2) with normalized landmark coordinates.
+    :return: Integer array of shape (...) with the state bits of every hand.
+    """
+    y = points[..., 1]
+    tips = y[..., FINGER_JOINTS[:, 0]]
+    pips = y[..., FINGER_JOINTS[:, 1]]
+    mcps = y[..., FINGER_JOINTS[:, 2]]
+    fingers_up = (tips < pips) & (pips < mcps)
+    masks = fingers_up.astype(np.int64) @ np.array([INDEX_UP, MIDDLE_UP, RING_UP, PINKY_UP])
+    masks |= (y[..., 16] > y[..., 14]) * RING_CURLED
+    masks |= (y[..., 20] > y[..., 18]) * PINKY_CURLED
+    masks |= (y[..., 4] < y[..., 3]) * THUMB_UP
+    masks |= (y[..., 4] > y[..., 3]) * THUMB_DOWN
+    thumb_index = points[..., 8, :] - points[..., 4, :]
+    masks |= (np.hypot(thumb_index[..., 0], thumb_index[..., 1]) < 0.05) * THUMB_INDEX_TOUCH
+    return masks
+
+def _resolve_mask(mask):
+    """Resolve one state mask with the same priority order as detect_gesture_rules."""
+    index, middle, ring, pinky = (bool(mask & bit) for bit in (INDEX_UP, MIDDLE_UP, RING_UP, PINKY_UP))
+    if index and not middle and not ring and not pinky:
+        return GESTURE_CODES["INDEX POINTING UP"]
+    if index and middle and mask & RING_CURLED and mask & PINKY_CURLED:
+        return GESTURE_CODES["PEACE SIGN"]
+    if index and middle and ring and mask & PINKY_CURLED:
+        return GESTURE_CODES["THREE"]
+    if index and pinky and not middle and not ring:
+        return GESTURE_CODES["ROCK'N ROLL!!!"]
+    if index and middle and ring and pinky:
+        return GESTURE_CODES["FOUR"]
+    if mask & THUMB_UP:
+        return GESTURE_CODES["THUMBS UP"]
+    if mask & THUMB_DOWN:
+        return GESTURE_CODES["THUMBS DOWN"]
+    if mask & THUMB_INDEX_TOUCH:
+        return GESTURE_CODES["GOOD GESTURE"]
+    return GESTURE_CODES["UNKNOWN GESTURE"]
+
+# Lookup table from every possible state mask to a gesture code
+GESTURE_TABLE = np.array([_resolve_mask(mask) for mask in range(1 << STATE_BITS)], dtype=np.uint8)
+
+def classify_batch(points):
+    """
+    Classify many hands (or frames) at once.
+    :param points: Array of shape (..., 21, 2) with normalized landmark coordinates.
+    :return: Array of gesture codes (indices into GESTURES) of shape (...).
+    """
+    return GESTURE_TABLE[hand_state_masks(points)]
+
+def detect_gesture(landmarks):
+    """
+    Detect gestures based on hand landmarks.
+    :param landmarks: List of hand landmarks.
+    :return: String indicating the gesture detected.
+    """
+    return GESTURES[GESTURE_TABLE[hand_state_masks(landmarks_to_array(landmarks))]]
+
+def create_hand_model(**options):
+    """
+    Create the MediaPipe Hands model used by the recognizer.
+    :param options: Keyword arguments overriding the default Hands settings.
+    """
+    import mediapipe as mp
+
+    settings = {"max_num_hands": 2, "min_detection_confidence": 0.7, "min_tracking_confidence": 0.7}
+    settings.update(options)
+    return mp.solutions.hands.Hands(**settings)
+
+def hand_keys(result):
+    """
+    Key every hand of a MediaPipe result by its handedness ("Left" / "Right"), so per-hand state
+    follows the hand even when MediaPipe reorders the hands between frames.
+    :return: List of unique keys, one per hand; "hand<index>" when the handedness is unknown.
+    """
+    multi_handedness = getattr(result, "multi_handedness", None)  # Absent from landmark replays
+    keys = []
+    for hand_index in range(len(result.multi_hand_landmarks)):
+        key = f"hand{hand_index}"
+        if multi_handedness:
+            key = multi_handedness[hand_index].classification[0].label
+            if key in keys:  # Both hands classified alike; tell them apart by position
+                key += str(hand_index)
+        keys.append(key)
+    return keys
+
+def pinch_distance(points, masks, frame_width, frame_height):
     """
-    Map the camera coordinates to screen coordinates.
+    Distance in pixels between the pinch points (midway between thumb and index fingertips)
+    of the first two hands, when both pinch.
+    :param points: Array of shape (hands, 21, 2) with normalized landmark coordinates.
+    :param masks: State masks of the hands (see hand_state_masks()).
+    :return: Distance as a float, or None unless two hands pinch.
     """
-    screen_x = int(x / frame_width * screen_width)
-    screen_y = int(y / frame_height * screen_height)
-    return screen_x, screen_y
+    if len(masks) < 2 or not (masks[0] & masks[1] & THUMB_INDEX_TOUCH):
+        return None
+    pinch = (points[:2, 4] + points[:2, 8]) / 2 * (frame_width, frame_height)
+    return float(np.hypot(*(pinch[0] - pinch[1])))
 
-def gesture_recognition(queue):
-    prev_x, prev_y = None, None
-    """Main loop for recognizing gestures and sending them to a queue."""
-    global prev_wrist_y
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            print("Failed to capture frame. Exiting.")
-            break
+def channel_hand(result, hand_index, landmarks, gesture):
+    """
+    Build the hand channel entry of one hand of a MediaPipe result.
+    :return: Tuple (handedness, confidence, gesture code, landmark array of shape (21, 3)).
+    """
+    handedness, confidence = None, 0.0
+    multi_handedness = getattr(result, "multi_handedness", None)  # Absent from landmark replays
+    if multi_handedness:
+        classification = multi_handedness[hand_index].classification[0]
+        handedness, confidence = classification.label, classification.score
+    points = np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+    return handedness, confidence, GESTURE_CODES[gesture], points
+
+def render_headless(frame, markers):
+    """Render step of headless mode: no drawing and no window I/O."""
+    return True
+
+
+class HandTrack:
+    """
+    Smoothed wrist velocity of one tracked hand; while the primary hand shows the peace sign it
+    is published as the scroll velocity that the GUI's KineticScroller follows.
+
+    Args:
+        smoothing (float): Weight of the newest finite-difference velocity in the moving average.
+    """
+    def __init__(self, smoothing=0.3):
+        self.smoothing = smoothing
+        self.last = None  # (t, x, y) of the previous wrist sample
+        self.velocity = (0.0, 0.0)  # Frame heights per second
+
+    def update(self, t, x, y):
+        """Add a wrist position (in frame heights) taken at time t and return the smoothed velocity."""
+        if self.last is not None and t > self.last[0]:
+            dt = t - self.last[0]
+            a = self.smoothing
+            self.velocity = (a * (x - self.last[1]) / dt + (1 - a) * self.velocity[0],
+                             a * (y - self.last[2]) / dt + (1 - a) * self.velocity[1])
+        self.last = (t, x, y)
+        return self.velocity
+
+
+class GestureRecognizer:
+    """
+    Camera -> hand landmarks -> gesture events loop, including cursor and scroll control.
+
+    Constructing a recognizer acquires nothing; the camera, the MediaPipe model, the pointer
+    controller and the helper threads are created by start(), in the process that runs the loop.
+
+    Args:
+        queue: Queue that receives GestureEvent and ZoomEvent tuples.
+        source: Frame source with the cv2.VideoCapture interface (defaults to camera 0).
+        hand_model: Object with a MediaPipe Hands compatible process() (defaults to create_hand_model()).
+        timer: Stage timer used by benchmark.py to record per-stage latency.
+        threaded (bool): Run capture, inference and rendering as a CapturePipeline instead of serially.
+        bounds: Shared multiprocessing.Array with the GUI window's (x1, y1, x2, y2); the cursor is
+            clamped to it.
+        cursor_filter (str): "one_euro", "kalman" or "none" to drive the pointer from a CursorThread,
+            or None to move it directly once per frame.
+        cursor_rate (float): Pointer updates per second of the CursorThread.
+        input_backend (str): "os" to move the OS pointer, or "app" to only publish the (filtered)
+            cursor on the hand channel for the GUI's own pointer (see app_pointer.py).
+        roi (bool): Crop the model input around the tracked hand with a RoiTracker.
+        governor: FrameGovernor that switches to a low-rate, low-resolution mode while no hand is seen.
+        preview: "window" to draw and show every frame, "debug" to show a copy of the latest frame
+            at preview_fps on a PreviewThread (Linux and Windows only), or None for headless mode without
+            drawing or window I/O.
+        preview_fps (float): Maximum frame rate of the "debug" preview.
+        stop: multiprocessing.Event that ends recognition when set (the spacebar only works with a preview).
+        hand_channel (str): Name of a hand_channel.HandChannel to publish landmarks and the cursor to.
+        motion (bool): Recognize swipes, flicks and circles of the primary hand's wrist and queue
+            them as MOTION events (not while it points or scrolls).
+        classifier: "rules" for the rule cascade (GESTURE_TABLE), or a gesture_model.GestureModel or the
+            path of one saved by `python gesture_model.py train`; gestures it predicts that are not in
+            GESTURES are reported as UNKNOWN GESTURE.
+    """
+    def __init__(self, queue, source=None, hand_model=None, timer=None, threaded=False, bounds=None,
+                 cursor_filter="one_euro", cursor_rate=120, roi=False, governor=None, preview="window",
+                 preview_fps=10, stop=None, hand_channel=None, motion=True, classifier="rules", input_backend="os"):
+        if preview not in PREVIEW_MODES:
+            raise ValueError(f"Unknown preview mode '{preview}', expected 'window', 'debug' or None")
+        if preview == "debug" and not THREADED_PREVIEW_SUPPORTED:
+            raise ValueError("The 'debug' preview shows frames from a worker thread, which OpenCV does not "
+                             "support on macOS; use preview='window'")
+        if input_backend not in INPUT_BACKENDS:
+            raise ValueError(f"Unknown input backend '{input_backend}', expected 'os' or 'app'")
+        if input_backend == "app" and hand_channel is None:
+            raise ValueError("The 'app' input backend publishes the cursor on the hand channel; pass hand_channel")
+        self.queue = queue
+        self.source = source
+        self.hand_model = hand_model
+        self.owns_hand_model = False  # Created by start(), so close() closes it
+        self.timer = MetricsTimer(timer if timer is not None else NullTimer())
+        self.threaded = threaded
+        self.window_bounds = bounds
+        self.cursor_filter = cursor_filter
+        self.cursor_rate = cursor_rate
+        self.input_backend = input_backend
+        self.roi_tracker = RoiTracker() if roi else None
+        self.frame_governor = governor
+        self.preview = preview
+        self.preview_fps = preview_fps
+        self.stop_event = stop
+        self.hand_channel_name = hand_channel
+        self.classifier = classifier
+
+        self.tracks = {}  # HandTrack per hand key (see hand_keys())
+        self.primary_key = None  # Hand that drives gestures, cursor and scrolling
+        self.gesture_events = GestureStateMachine()  # Turns per-frame labels into PRESS/HOLD/RELEASE events
+        self.zoom_events = PinchZoomTracker()  # Two-handed pinch-zoom
+        self.motion = MotionRecognizer() if motion else None  # Dynamic gestures of the primary hand
+
+        # Acquired by start()
+        self.mp_hands = None
+        self.mp_drawing = None
+        self.mouse = None
+        self.screen_width, self.screen_height = None, None
+        self.cursor_thread = None
+        self.cursor_smoother = None  # Camera-rate cursor filter of the "app" input backend
+        self.preview_thread = None
+        self.hand_channel = None
+        self.gesture_model = None
+        self.model_codes = None  # Gesture code of every label of the gesture model
+        self.pipeline = None
+        self.started = False
+
+    def start(self):
+        """Acquire the camera, the hand model, the pointer controller and the helper threads."""
+        if self.started:
+            return self
+        import cv2
+        import pyautogui
+
+        if self.hand_model is None or self.preview is not None:
+            import mediapipe as mp
+            self.mp_hands = mp.solutions.hands
+            self.mp_drawing = mp.solutions.drawing_utils
+        if self.hand_model is None:
+            self.hand_model = create_hand_model()
+            self.owns_hand_model = True
+        if self.source is None:
+            self.source = cv2.VideoCapture(0)
+        self.screen_width, self.screen_height = pyautogui.size()  # Get screen resolution
+        if self.input_backend == "os":
+            from pynput.mouse import Controller
+
+            self.mouse = Controller()
+            if self.cursor_filter is not None:
+                self.cursor_thread = CursorThread(self.move_pointer, make_cursor_filter(self.cursor_filter),
+                                                  self.cursor_rate, clamp=self.clamp_to_window).start()
+        elif self.cursor_filter is not None:
+            # The GUI draws its own pointer from the published position; no display-rate thread needed
+            self.cursor_smoother = make_cursor_filter(self.cursor_filter)
+        if self.preview == "debug":
+            self.preview_thread = PreviewThread(self.draw_overlay, self.preview_fps).start()
+        if self.hand_channel_name is not None:
+            self.hand_channel = HandChannelWriter(self.hand_channel_name)
+        if self.classifier != "rules":
+            model = self.classifier
+            self.gesture_model = model if isinstance(model, GestureModel) else GestureModel.load(model)
+            self.model_codes = np.array([GESTURE_CODES.get(label, 0) for label in self.gesture_model.labels],
+                                        dtype=np.uint8)
+        self.started = True
+        return self
+
+    def close(self):
+        """Release the camera and hand model and stop the preview and cursor threads."""
+        import cv2
+        if self.source is not None:
+            self.source.release()
+        if self.owns_hand_model:
+            self.hand_model.close()
+            self.hand_model = None
+            self.owns_hand_model = False
+        if self.preview_thread is not None:
+            self.preview_thread.stop()
+            self.preview_thread = None
+        elif self.preview == "window":
+            cv2.destroyAllWindows()
+        if self.cursor_thread is not None:
+            self.cursor_thread.stop()
+            self.cursor_thread = None
+        if self.hand_channel is not None:
+            self.hand_channel.close()
+            self.hand_channel = None
+        self.started = False
+
+    def stop_requested(self):
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def map_coordinates(self, x, y, frame_width, frame_height):
+        """
+        Map the camera coordinates to screen coordinates, clamped to the GUI window when its
+        bounds are known.
+        """
+        screen_x = int(x / frame_width * self.screen_width)
+        screen_y = int(y / frame_height * self.screen_height)
+        return self.clamp_to_window(screen_x, screen_y)
+
+    def clamp_to_window(self, screen_x, screen_y):
+        """Clamp screen coordinates to the GUI window bounds, if they are known."""
+        if self.window_bounds is not None:
+            x1, y1, x2, y2 = self.window_bounds[:]
+            if x2 > x1 and y2 > y1:  # All zeros until the GUI has published its geometry
+                screen_x = min(max(screen_x, x1), x2)
+                screen_y = min(max(screen_y, y1), y2)
+        return screen_x, screen_y
+
+    def move_pointer(self, x, y):
+        """Move the OS pointer without pyautogui's built-in pause."""
+        self.mouse.position = (x, y)
+
+    def release_cursor(self):
+        """Stop driving the cursor (pointing ended or the hand was lost)."""
+        if self.cursor_thread is not None:
+            self.cursor_thread.release()
+        if self.cursor_smoother is not None:
+            self.cursor_smoother.reset()
+
+    def run_inference(self, frame):
+        """
+        Flip a captured frame and run the hand landmark model on it.
+        :return: Tuple (flipped BGR frame, MediaPipe result).
+        """
+        import cv2
+        timer = self.timer
+        if self.frame_governor is not None:
+            # Downscaled while no hand is in view
+            frame = self.frame_governor.prepare(frame)
+            timer.mark("resize")
 
         # Flip the frame horizontally
         frame = cv2.flip(frame, 1)
-        frame_height, frame_width, _ = frame.shape 
-        
-        # Convert the frame to RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = hands.process(frame_rgb)
-
-        # Process hand landmarks
-        if result.multi_hand_landmarks:
-            for hand_landmarks in result.multi_hand_landmarks:
-                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                landmarks = hand_landmarks.landmark
-                gesture = detect_gesture(landmarks)
-                if(gesture != 0):
-                    queue.put(gesture)
-                    print(f"Gesture Detected: {gesture}")
-                # Get the tip of the index finger
-                x = int(landmarks[8].x * frame.shape[1])  # Convert normalized x to pixel
-                y = int(landmarks[8].y * frame.shape[0])  # Convert normalized y to pixel
-                
-                # Draw a circle to indicate the cursor
-                cv2.circle(frame, (x, y), 10, (255, 0, 0), -1)  
-                
-                if is_index_pointing_up(landmarks):
-                    # Get the tip of the index finger
-                    x = int(landmarks[8].x * frame_width)
-                    y = int(landmarks[8].y * frame_height)
-
-                    # Map coordinates to screen resolution
-                    screen_x, screen_y = map_coordinates(x, y, frame_width, frame_height)
-
-                    # Move the cursor to the mapped screen coordinates
-                    pyautogui.moveTo(screen_x, screen_y)
-
-                    # Draw a green circle to indicate active cursor control
-                    cv2.circle(frame, (x, y), 10, (0, 255, 0), -1)
-                else:
-                    # Draw a red circle to indicate inactive cursor control
-                    x = int(landmarks[8].x * frame_width)
-                    y = int(landmarks[8].y * frame_height)
-                    cv2.circle(frame, (x, y), 10, (0, 0, 255), -1)
-                
-                # Gesture detection for peace sign
-                if is_peace_sign(landmarks):
-                    print("Peace Sign Detected")
-                    
-                    # Track wrist positions for scrolling
-                    wrist_x = landmarks[0].x * frame_width
-                    wrist_y = landmarks[0].y * frame_height
-                    wrist_x_history.append(wrist_x)
-                    wrist_y_history.append(wrist_y)
-
-                    # Detect scroll directions
-                    vertical_scroll = detect_scroll_direction(wrist_y_history, axis="y")
-                    horizontal_scroll = detect_scroll_direction(wrist_x_history, axis="x")
-
-                    # Cooldown and scrolling actions
-                    current_time = time.time()
-                    if vertical_scroll == "UP" and ("SCROLL UP" not in gesture_cooldown or current_time - gesture_cooldown["SCROLL UP"] > GESTURE_COOLDOWN_TIME):
-                        mouse.scroll(0, 6)
-                        print("Scrolled UP")
-                        gesture_cooldown["SCROLL UP"] = current_time
-
-                    elif vertical_scroll == "DOWN" and ("SCROLL DOWN" not in gesture_cooldown or current_time - gesture_cooldown["SCROLL DOWN"] > GESTURE_COOLDOWN_TIME):
-                        mouse.scroll(0, -6)
-                        print("Scrolled DOWN")
-                        gesture_cooldown["SCROLL DOWN"] = current_time
-
-                    if horizontal_scroll == "RIGHT" and ("SCROLL RIGHT" not in gesture_cooldown or current_time - gesture_cooldown["SCROLL RIGHT"] > GESTURE_COOLDOWN_TIME):
-                        mouse.scroll(5, 0)
-                        print("Scrolled RIGHT")
-                        gesture_cooldown["SCROLL RIGHT"] = current_time
-
-                    elif horizontal_scroll == "LEFT" and ("SCROLL LEFT" not in gesture_cooldown or current_time - gesture_cooldown["SCROLL LEFT"] > GESTURE_COOLDOWN_TIME):
-                        mouse.scroll(-5, 0)
-                        print("Scrolled LEFT")
-                        gesture_cooldown["SCROLL LEFT"] = current_time
-                else:
-                    # Clear histories if peace sign is not detected
-                    wrist_x_history.clear()
-                    wrist_y_history.clear()                
-                                    
-                if prev_x is not None and prev_y is not None:
-                    # Calculate movement
-                    dx = x - prev_x
-                    dy = y - prev_y          
-                    # Determine gestures or actions
-                    if abs(dx) > 20 or abs(dy) > 20:
-                        if abs(dx) > abs(dy):  # Horizontal movement
-                            if dx > 0:
-                                print("Moving Right")
-                            else:
-                                print("Moving Left")
-                        else:  # Vertical movement
-                            if dy > 0:
-                                print("Moving Down")
-                            else:
-                                print("Moving Up")
-                
-                # Update previous coordinates
-                prev_x, prev_y = x, y
-                    
-        else:
-            prev_x, prev_y = None, None
-            
+        timer.mark("flip")
 
-        # Display the frame
+        if self.roi_tracker is not None:
+            # Convert and process only the region around the tracked hand
+            result = self.roi_tracker.process(self.hand_model, frame, timer)
+        else:
+            # Convert the frame to RGB
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            timer.mark("cvtColor")
+            result = self.hand_model.process(frame_rgb)
+            timer.mark("process")
+
+        if self.frame_governor is not None:
+            self.frame_governor.observe(bool(result.multi_hand_landmarks))
+        return frame, result
+
+    def publish_gesture(self, label):
+        """
+        Feed one frame's gesture label to the state machine and queue the resulting events.
+        :param label: Gesture of the tracked hand, or None when no hand is visible.
+        """
+        events = self.gesture_events.update(label)
+        for event in events:
+            self.queue.put(event)
+            GESTURE_EVENTS.labels(kind=event.kind, gesture=event.gesture).inc()
+            if event.kind == PRESS:
+                log.info("Gesture detected", extra={"gesture": event.gesture})
+        if events:
+            try:
+                QUEUE_DEPTH.set(self.queue.qsize())
+            except NotImplementedError:  # multiprocessing.Queue.qsize() on macOS
+                pass
+
+    def publish_zoom(self, distance):
+        """
+        Feed one frame's distance between the two pinching hands to the pinch-zoom tracker and
+        queue the resulting ZoomEvents.
+        :param distance: See pinch_distance(); None when the hands are not both pinching.
+        """
+        for event in self.zoom_events.update(distance):
+            self.queue.put(event)
+            GESTURE_EVENTS.labels(kind=event.kind, gesture=event.gesture).inc()
+            if event.kind == PRESS:
+                log.info("Gesture detected", extra={"gesture": event.gesture})
+
+    def classify(self, points, masks, keys):
+        """
+        Classify the hands of one frame with the rule table or the learned gesture model.
+        :param points: Array of shape (hands, 21, 2) with normalized landmark coordinates.
+        :param masks: State masks of the hands (see hand_state_masks()).
+        :param keys: Hand keys (see hand_keys()); left hands are mirrored for the model.
+        :return: Array of gesture codes (indices into GESTURES).
+        """
+        if self.gesture_model is None:
+            return GESTURE_TABLE[masks]
+        left = np.array([key.startswith("Left") for key in keys])
+        return self.model_codes[self.gesture_model.predict(points, left)]
+
+    def publish_motion(self, motion):
+        """Queue a recognized dynamic gesture (trajectory.Motion) as a MOTION event."""
+        self.queue.put(GestureEvent(MOTION, motion.name, motion.duration))
+        GESTURE_EVENTS.labels(kind=MOTION, gesture=motion.name).inc()
+        log.info("Gesture detected", extra={"gesture": motion.name, "score": round(motion.score, 3)})
+
+    def track_motion(self, landmarks, gesture, frame_width, frame_height):
+        """Feed the primary hand's wrist to the motion recognizer, unless the hand points, scrolls or zooms."""
+        if gesture in ("INDEX POINTING UP", "PEACE SIGN") or self.zoom_events.active:
+            self.motion.reset()
+            return
+        # Positions in frame heights, so thresholds do not depend on the resolution
+        wrist = landmarks[0]
+        motion = self.motion.update(time.perf_counter(), wrist.x * frame_width / frame_height, wrist.y)
+        if motion is not None:
+            self.publish_motion(motion)
+
+    def handle_hands(self, result, frame_width, frame_height):
+        """
+        Detect gestures on every hand of a MediaPipe result and perform the cursor, scroll and
+        two-handed actions. The primary hand drives the gesture events, the cursor and the scroll
+        velocity published to the hand channel.
+        :return: List of (hand_landmarks, x, y, color) markers for draw_overlay().
+        """
+        timer = self.timer
+        markers = []
+        if not result.multi_hand_landmarks:
+            self.tracks.clear()
+            self.primary_key = None
+            if self.motion is not None:
+                self.motion.reset()
+            self.publish_zoom(None)
+            self.publish_gesture(None)
+            self.release_cursor()
+            if self.hand_channel is not None:
+                self.publish_hand_state([], None)
+            return markers
+
+        hands = result.multi_hand_landmarks
+        keys = hand_keys(result)
+        for key in list(self.tracks):
+            if key not in keys:
+                del self.tracks[key]  # Hand left the frame; a returning hand starts afresh
+        if self.primary_key not in keys:
+            self.primary_key = keys[0]
+            if self.motion is not None:
+                self.motion.reset()  # Another hand's trajectory
+
+        # Classify all hands in one vectorized pass (the pinch-zoom always uses the rule masks)
+        points = np.array([[(lm.x, lm.y) for lm in hand.landmark] for hand in hands])
+        masks = hand_state_masks(points)
+        codes = self.classify(points, masks, keys)
+        timer.mark("detect_gesture")
+
+        self.publish_zoom(pinch_distance(points, masks, frame_width, frame_height))
+        primary_index = keys.index(self.primary_key)
+        # While both hands zoom, their pinches are not single-hand gestures
+        self.publish_gesture(None if self.zoom_events.active else GESTURES[codes[primary_index]])
+
+        channel_hands = []
+        cursor = None
+        scroll = None
+        now = time.perf_counter()
+        for hand_index, hand_landmarks in enumerate(hands):
+            landmarks = hand_landmarks.landmark
+            gesture = GESTURES[codes[hand_index]]
+            track = self.tracks.get(keys[hand_index])
+            if track is None:
+                track = self.tracks[keys[hand_index]] = HandTrack()
+            primary = hand_index == primary_index
+            if self.hand_channel is not None:
+                channel_hands.append(channel_hand(result, hand_index, landmarks, gesture))
+
+            # Get the tip of the index finger
+            x = int(landmarks[8].x * frame_width)  # Convert normalized x to pixel
+            y = int(landmarks[8].y * frame_height)  # Convert normalized y to pixel
+
+            if gesture == "INDEX POINTING UP" and primary:
+                # Map coordinates to screen resolution
+                screen_x, screen_y = self.map_coordinates(x, y, frame_width, frame_height)
+
+                # Move the cursor to the mapped screen coordinates
+                if self.cursor_thread is not None:
+                    self.cursor_thread.push(screen_x, screen_y)  # Smoothed and interpolated at display rate
+                elif self.cursor_smoother is not None:
+                    screen_x, screen_y = self.clamp_to_window(*self.cursor_smoother.update(screen_x, screen_y, now))
+                elif self.input_backend == "os":
+                    self.move_pointer(screen_x, screen_y)
+                cursor = (screen_x, screen_y)
+                timer.mark("cursor")
+
+                # Green circle indicates active cursor control
+                markers.append((hand_landmarks, x, y, (0, 255, 0)))
+            else:
+                if primary:
+                    self.release_cursor()
+                # Red circle indicates inactive cursor control
+                markers.append((hand_landmarks, x, y, (0, 0, 255)))
+
+            if primary and self.motion is not None:
+                self.track_motion(landmarks, gesture, frame_width, frame_height)
+
+            # Wrist velocity in frame heights per second, so it does not depend on the resolution
+            velocity = track.update(now, landmarks[0].x * frame_width / frame_height, landmarks[0].y)
+            if gesture == "PEACE SIGN" and primary:
+                # The GUI scrolls its active canvas at a rate following this velocity
+                log.debug("Peace sign detected", extra=SAMPLED)
+                scroll = velocity
+            timer.mark("detect_gesture")
+        if self.hand_channel is not None:
+            self.publish_hand_state(channel_hands, cursor, scroll)
+        return markers
+
+    def publish_hand_state(self, hands, cursor, scroll=None):
+        """Publish this frame's hands, cursor and scroll velocity to the hand channel."""
+        if cursor is not None and self.cursor_thread is not None and self.cursor_thread.last_position is not None:
+            cursor = self.cursor_thread.last_position  # Smoothed position the pointer is at
+        self.hand_channel.publish(hands, cursor, scroll)
+
+    def draw_overlay(self, frame, markers):
+        """Draw the hand skeletons and cursor markers returned by handle_hands() onto the frame."""
+        import cv2
+        for hand_landmarks, x, y, color in markers:
+            self.mp_drawing.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+            cv2.circle(frame, (x, y), 10, color, -1)
+
+    def render_frame(self, frame, markers):
+        """
+        Draw the overlay and show the preview window.
+        :return: False when the user pressed the spacebar to stop recognition.
+        """
+        import cv2
+        self.draw_overlay(frame, markers)
         cv2.imshow('Gesture Recognition', frame)
 
         #  Exit the loop on spacebar press
-        if cv2.waitKey(1) & 0xFF == ord(' '):
-            break
-
-    cap.release()
-    cv2.destroyAllWindows()
+        return cv2.waitKey(1) & 0xFF != ord(' ')
+
+    def process_frame(self, frame):
+        """Run inference and the gesture actions on one captured frame; return (frame, markers)."""
+        frame, result = self.run_inference(frame)
+        frame_height, frame_width, _ = frame.shape
+        return frame, self.handle_hands(result, frame_width, frame_height)
+
+    def run(self):
+        """
+        Main loop for recognizing gestures and sending them to the queue; calls start() if needed
+        and close() when the source ends, the spacebar is pressed, the stop event is set or
+        processing a frame raises.
+        :return: The CapturePipeline in threaded mode (for its counters), otherwise None.
+        """
+        self.start()
+        throttle = self.frame_governor.throttle if self.frame_governor is not None else None
+        if self.threaded:
+            if self.preview == "window":
+                render = self.render_frame
+            elif self.preview == "debug":
+                render = self.preview_thread.submit
+            else:
+                render = render_headless
+
+            def render_item(item):
+                return render(*item) and not self.stop_requested()
+
+            self.pipeline = CapturePipeline(self.source, self.process_frame, render_item, self.timer, throttle)
+            try:
+                self.pipeline.run()
+            finally:
+                self.close()
+            return self.pipeline
+
+        try:
+            self.run_serial(throttle)
+        finally:
+            self.close()
+
+    def run_serial(self, throttle):
+        """Capture, process and show frames one after another on the calling thread."""
+        import cv2
+        timer = self.timer
+        while self.source.isOpened() and not self.stop_requested():
+            if throttle:
+                throttle()
+            timer.start_frame()
+            ret, frame = self.source.read()
+            timer.mark("capture")
+            if not ret:
+                log.warning("Failed to capture frame. Exiting.")
+                break
+
+            frame, markers = self.process_frame(frame)
+
+            keep_running = True
+            if self.preview == "window":
+                # Display the frame
+                self.draw_overlay(frame, markers)
+                timer.mark("drawing")
+                cv2.imshow('Gesture Recognition', frame)
+                keep_running = cv2.waitKey(1) & 0xFF != ord(' ')
+                timer.mark("imshow")
+            elif self.preview == "debug":
+                keep_running = self.preview_thread.submit(frame, markers)
+                timer.mark("drawing")
+            timer.end_frame()
+            if not keep_running:
+                break
+
+
+def gesture_recognition(queue, log_config=None, metrics_config=None, **options):
+    """
+    Create a GestureRecognizer and run it; target of the recognizer process started by ui.py.
+    :param queue: Queue that receives GestureEvent tuples.
+    :param log_config: configure_logging() arguments for this process (None keeps the current setup).
+    :param metrics_config: start_exporter() arguments (port, textfile...) to export the recognizer metrics.
+    :param options: GestureRecognizer arguments (source, threaded, bounds, roi, governor, preview, stop...).
+    :return: The CapturePipeline in threaded mode (for its counters), otherwise None.
+    """
+    if log_config is not None:
+        configure_logging(**log_config)
+    exporter = start_exporter(prefix="recognizer_", **metrics_config) if metrics_config else None
+    try:
+        return GestureRecognizer(queue, **options).run()
+    finally:
+        if exporter is not None:
+            exporter.stop()
 
 if __name__ == "__main__":
     queue = Queue()
-    gesture_recognition(queue)
\ No newline at end of file
+    gesture_recognition(queue, log_config={})
@@ -0,0 +1,175 @@
+"""
+Shared-memory channel carrying the latest hand state from the recognizer to the GUI.
+
+The gesture queue only carries discrete gesture events. This channel additionally publishes,
+every processed frame, the raw landmarks, handedness, confidence and gesture of each hand and
+the smoothed cursor position and scroll velocity into a multiprocessing.shared_memory ring buffer of fixed-layout
+float32 records, so consumers can read the current hand state without pickling or IPC calls.
+
+Memory layout (native byte order):
+    int64[2]                    header: records written (sequence of the newest record), capacity
+    int64[capacity]             sequence number of the record in every slot (-1 while being written)
+    float64[capacity]           time.time() of every record
+    float32[capacity, RECORD]   records
+
+Record layout (float32), MAX_HANDS hand blocks followed by the cursor and the scroll velocity:
+    hand block: present, handedness (0 left, 1 right, -1 unknown), confidence, gesture code
+                (index into gestures.GESTURES), then x, y, z of the 21 landmarks
+    cursor:     active, x, y (screen pixels, as driven by the recognizer)
+    scroll:     active, vx, vy (smoothed wrist velocity in frame heights per second while the
+                primary hand shows the scroll gesture)
+
+There is a single writer; a reader checks the slot's sequence number before and after copying
+a record and retries when the writer overwrote it in between.
+"""
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MAX_HANDS = 2
+LANDMARKS = 21
+HAND_FLOATS = 4 + LANDMARKS * 3
+CURSOR_OFFSET = MAX_HANDS * HAND_FLOATS
+SCROLL_OFFSET = CURSOR_OFFSET + 3
+RECORD_FLOATS = SCROLL_OFFSET + 3
+HANDEDNESS_CODES = {"Left": 0.0, "Right": 1.0}
+HANDEDNESS_NAMES = {0: "Left", 1: "Right"}
+
+HandRecord = namedtuple("HandRecord", ["handedness", "confidence", "gesture_code", "landmarks"])
+HandState = namedtuple("HandState", ["sequence", "timestamp", "hands", "cursor", "scroll"])
+
+
+def _views(buffer, capacity):
+    """Return (header, slot sequences, slot times, records) arrays over a channel buffer."""
+    header = np.ndarray((2,), dtype=np.int64, buffer=buffer)
+    offset = header.nbytes
+    sequences = np.ndarray((capacity,), dtype=np.int64, buffer=buffer, offset=offset)
+    offset += sequences.nbytes
+    times = np.ndarray((capacity,), dtype=np.float64, buffer=buffer, offset=offset)
+    offset += times.nbytes
+    records = np.ndarray((capacity, RECORD_FLOATS), dtype=np.float32, buffer=buffer, offset=offset)
+    return header, sequences, times, records
+
+
+def channel_size(capacity):
+    return 16 + capacity * (8 + 8 + RECORD_FLOATS * 4)
+
+
+class HandChannel:
+    """
+    Owner of the shared memory block; create it in the parent process and pass `name` to the
+    recognizer (HandChannelWriter) and to any reader (HandChannelReader).
+
+    Args:
+        capacity (int): Number of records kept in the ring buffer.
+    """
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(create=True, size=channel_size(capacity))
+        self.name = self.shm.name
+        header, sequences, _, _ = _views(self.shm.buf, capacity)
+        header[:] = (0, capacity)
+        sequences[:] = 0
+        del header, sequences  # Views must be released before the block can be closed
+
+    def close(self):
+        """Close and remove the shared memory block."""
+        self.shm.close()
+        self.shm.unlink()
+
+
+class _Attached:
+    """Attach to an existing channel by name."""
+    def __init__(self, name):
+        self.shm = shared_memory.SharedMemory(name=name)
+        capacity = int(np.ndarray((2,), dtype=np.int64, buffer=self.shm.buf)[1])
+        self.capacity = capacity
+        self.header, self.sequences, self.times, self.records = _views(self.shm.buf, capacity)
+
+    def close(self):
+        self.header = self.sequences = self.times = self.records = None
+        self.shm.close()
+
+
+class HandChannelWriter(_Attached):
+    """Publish one record per processed frame (used by the recognizer)."""
+    def publish(self, hands, cursor=None, scroll=None):
+        """
+        Write the newest hand state.
+        :param hands: List of (handedness, confidence, gesture_code, landmarks) per hand, where
+                      landmarks is an array of shape (21, 3); hands beyond MAX_HANDS are dropped.
+        :param cursor: (x, y) cursor position in screen pixels, or None when the cursor is inactive.
+        :param scroll: (vx, vy) scroll velocity in frame heights per second, or None when not scrolling.
+        :return: Sequence number of the record.
+        """
+        sequence = int(self.header[0]) + 1
+        slot = sequence % self.capacity
+        self.sequences[slot] = -1
+        record = self.records[slot]
+        record[:] = 0.0
+        for index, (handedness, confidence, gesture_code, landmarks) in enumerate(hands[:MAX_HANDS]):
+            block = record[index * HAND_FLOATS:(index + 1) * HAND_FLOATS]
+            block[0] = 1.0
+            block[1] = HANDEDNESS_CODES.get(handedness, -1.0)
+            block[2] = confidence
+            block[3] = gesture_code
+            block[4:] = np.asarray(landmarks, dtype=np.float32).reshape(-1)
+        if cursor is not None:
+            record[CURSOR_OFFSET:SCROLL_OFFSET] = (1.0, cursor[0], cursor[1])
+        if scroll is not None:
+            record[SCROLL_OFFSET:] = (1.0, scroll[0], scroll[1])
+        self.times[slot] = time.time()
+        self.sequences[slot] = sequence
+        self.header[0] = sequence
+        return sequence
+
+
+class HandChannelReader(_Attached):
+    """Read the newest hand state published by a HandChannelWriter."""
+    def latest_sequence(self):
+        return int(self.header[0])
+
+    def read(self, sequence=None, retries=3):
+        """
+        Copy a record out of the ring buffer.
+        :param sequence: Sequence number to read (defaults to the newest record).
+        :return: HandState, or None if nothing was published yet or the record was overwritten.
+        """
+        for _ in range(retries):
+            wanted = self.latest_sequence() if sequence is None else sequence
+            if wanted <= 0 or self.latest_sequence() - wanted >= self.capacity:
+                return None
+            slot = wanted % self.capacity
+            if self.sequences[slot] != wanted:
+                continue
+            record = self.records[slot].copy()
+            timestamp = float(self.times[slot])
+            if self.sequences[slot] == wanted:
+                return decode_record(wanted, timestamp, record)
+        return None
+
+    def latest_view(self):
+        """
+        Return (sequence, record view) of the newest record without copying. The view is
+        overwritten after `capacity` more frames; check latest_sequence() if that matters.
+        """
+        sequence = self.latest_sequence()
+        return sequence, self.records[sequence % self.capacity]
+
+
+def decode_record(sequence, timestamp, record):
+    """Turn a float32 record into a HandState."""
+    hands = []
+    for index in range(MAX_HANDS):
+        block = record[index * HAND_FLOATS:(index + 1) * HAND_FLOATS]
+        if block[0] < 0.5:
+            continue
+        hands.append(HandRecord(HANDEDNESS_NAMES.get(int(block[1]), "Unknown"), float(block[2]), int(block[3]),
+                                block[4:].reshape(LANDMARKS, 3)))
+    active, x, y = record[CURSOR_OFFSET:SCROLL_OFFSET]
+    cursor = (float(x), float(y)) if active > 0.5 else None
+    active, vx, vy = record[SCROLL_OFFSET:]
+    scroll = (float(vx), float(vy)) if active > 0.5 else None
+    return HandState(sequence, timestamp, hands, cursor, scroll)
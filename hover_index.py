@@ -0,0 +1,99 @@
+"""
+Spatial index of the controls the in-app gesture cursor can hover.
+
+Tk only sends <Enter>/<Leave> when the OS pointer moves, and winfo_containing() asks the window
+system on every call. With the cursor arriving at camera rate the GUI resolves the hovered
+control itself: HoverIndex keeps the screen bounding boxes of the visible buttons and sliders in
+a uniform grid of buckets, so a lookup only checks the few boxes overlapping the cursor's cell,
+whatever the number of controls on the screen. The boxes are collected once per layout change
+(screen switch, resize, scrolling) and the index is rebuilt lazily on the next lookup. A second
+index over the buttons alone answers nearest-box queries for pointer_assist.TargetSnapper.
+"""
+import math
+
+TARGET_CLASSES = ("Button", "Scale", "Checkbutton", "Radiobutton")
+
+
+def collect_targets(widget, classes=TARGET_CLASSES, clip=None):
+    """
+    Collect the visible parts of the controls below a widget.
+    Every box is clipped to its ancestors, so buttons scrolled out of a canvas are left out.
+    :param widget: Root of the widget tree to walk, e.g. the visible screen.
+    :param clip: (x0, y0, x1, y1) in screen pixels the boxes are clipped to (defaults to the widget).
+    :return: List of (x0, y0, x1, y1, widget) in screen pixels, parents before their children.
+    """
+    x0, y0 = widget.winfo_rootx(), widget.winfo_rooty()
+    box = (x0, y0, x0 + widget.winfo_width(), y0 + widget.winfo_height())
+    if clip is not None:
+        box = (max(box[0], clip[0]), max(box[1], clip[1]), min(box[2], clip[2]), min(box[3], clip[3]))
+    if box[0] >= box[2] or box[1] >= box[3]:
+        return []
+    targets = []
+    if widget.winfo_class() in classes:
+        targets.append(box + (widget,))
+    for child in widget.winfo_children():
+        if child.winfo_ismapped():
+            targets.extend(collect_targets(child, classes, box))
+    return targets
+
+
+class HoverIndex:
+    """
+    Uniform grid over axis-aligned boxes, for point lookups.
+
+    Args:
+        cell (int): Side of a grid cell in pixels; about the size of a small button keeps the
+            buckets short.
+    """
+    def __init__(self, cell=64):
+        self.cell = cell
+        self.boxes = []
+        self.cells = {}  # (column, row) -> indices into boxes, in insertion order
+        self.stale = True
+        self.rebuilds = 0
+
+    def invalidate(self):
+        """Mark the boxes as outdated (layout changed); the owner rebuilds before the next lookup."""
+        self.stale = True
+
+    def rebuild(self, boxes):
+        """
+        Replace the indexed boxes.
+        :param boxes: List of (x0, y0, x1, y1, target); later boxes win where boxes overlap.
+        """
+        self.boxes = boxes
+        self.cells = {}
+        cell = self.cell
+        for index, (x0, y0, x1, y1, _) in enumerate(boxes):
+            for column in range(math.floor(x0 / cell), math.floor((x1 - 1) / cell) + 1):
+                for row in range(math.floor(y0 / cell), math.floor((y1 - 1) / cell) + 1):
+                    self.cells.setdefault((column, row), []).append(index)
+        self.stale = False
+        self.rebuilds += 1
+
+    def hit(self, x, y):
+        """Return the target whose box contains (x, y), or None."""
+        found = None
+        for index in self.cells.get((math.floor(x / self.cell), math.floor(y / self.cell)), ()):
+            x0, y0, x1, y1, target = self.boxes[index]
+            if x0 <= x < x1 and y0 <= y < y1:
+                found = target
+        return found
+
+    def nearest(self, x, y, radius):
+        """
+        Return the box (x0, y0, x1, y1, target) closest to (x, y) within radius pixels, or None.
+        Only the cells overlapping the radius around the point are checked.
+        """
+        cell = self.cell
+        best, best_distance = None, radius * radius
+        for column in range(math.floor((x - radius) / cell), math.floor((x + radius) / cell) + 1):
+            for row in range(math.floor((y - radius) / cell), math.floor((y + radius) / cell) + 1):
+                for index in self.cells.get((column, row), ()):
+                    box = self.boxes[index]
+                    dx = max(box[0] - x, 0, x - box[2])
+                    dy = max(box[1] - y, 0, y - box[3])
+                    distance = dx * dx + dy * dy
+                    if distance <= best_distance:
+                        best, best_distance = box, distance
+        return best
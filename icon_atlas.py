@@ -0,0 +1,138 @@
+"""
+Pre-rendered icon atlas for fast GUI cold start.
+
+`python icon_atlas.py build` decodes and resizes every icon listed in icon_cache.ICON_SPECS
+once and packs the raw RGBA pixels into icons/icons.atlas. At startup the GUI memory-maps
+that file and slices icons out of it instead of decoding and resampling the originals.
+
+File layout:
+    8 bytes   magic b"ICNATLAS"
+    4 bytes   little-endian length of the JSON index
+    N bytes   JSON index {"entries": {key: [offset, width, height]}, "sources": {file: [mtime_ns, size]}}
+    ...       RGBA pixel data; offsets are relative to the start of this section
+"""
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+from PIL import Image
+
+from icon_cache import ICON_SPECS, load_icon
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"ICNATLAS"
+ATLAS_FILENAME = "icons.atlas"
+
+
+def atlas_key(filename, size):
+    return f"{filename}@{size[0]}x{size[1]}"
+
+
+def source_signature(path):
+    """Return [mtime_ns, size] of a source icon, used to detect stale atlas entries."""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def build_atlas(icons_folder, atlas_path=None, specs=ICON_SPECS):
+    """
+    Render the given icons into a single atlas file.
+    :param icons_folder: Folder containing the icon files.
+    :param atlas_path: Output file (defaults to icons.atlas inside icons_folder).
+    :param specs: List of (filename, (width, height)) to pre-render.
+    :return: Path of the written atlas.
+    """
+    atlas_path = atlas_path or os.path.join(icons_folder, ATLAS_FILENAME)
+    entries, sources, chunks = {}, {}, []
+    offset = 0
+    for filename, size in specs:
+        try:
+            pixels = load_icon(icons_folder, filename, size).convert("RGBA").tobytes()
+            sources[filename] = source_signature(os.path.join(icons_folder, filename))
+        except Exception as e:
+            log.warning("Skipping %s: %s", filename, e)
+            continue
+        entries[atlas_key(filename, size)] = [offset, size[0], size[1]]
+        chunks.append(pixels)
+        offset += len(pixels)
+
+    index = json.dumps({"entries": entries, "sources": sources}).encode("utf-8")
+    tmp_path = atlas_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(index)))
+        f.write(index)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, atlas_path)
+    return atlas_path
+
+
+class IconAtlas:
+    """
+    Read-only, memory-mapped view of an atlas written by build_atlas().
+
+    Args:
+        path (str): Atlas file.
+        icons_folder (str): Folder of the source icons; entries whose source changed since
+            the atlas was built are ignored so the caller falls back to the original file.
+    """
+    def __init__(self, path, icons_folder):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an icon atlas")
+        (index_length,) = struct.unpack_from("<I", self.map, len(MAGIC))
+        index_start = len(MAGIC) + 4
+        index = json.loads(self.map[index_start:index_start + index_length])
+        self.data_start = index_start + index_length
+        self.entries = index["entries"]
+
+        stale = set()
+        for filename, signature in index["sources"].items():
+            try:
+                if source_signature(os.path.join(icons_folder, filename)) != signature:
+                    stale.add(filename)
+            except OSError:
+                stale.add(filename)
+        if stale:
+            self.entries = {key: value for key, value in self.entries.items() if key.split("@")[0] not in stale}
+
+    @classmethod
+    def open_default(cls, icons_folder):
+        """Open icons.atlas inside icons_folder; return None if it is missing or unreadable."""
+        path = os.path.join(icons_folder, ATLAS_FILENAME)
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path, icons_folder)
+        except (OSError, ValueError) as e:
+            log.warning("Ignoring icon atlas: %s", e)
+            return None
+
+    def get_image(self, filename, size):
+        """Return the pre-rendered PIL image, or None if the atlas does not hold it."""
+        entry = self.entries.get(atlas_key(filename, size))
+        if entry is None:
+            return None
+        offset, width, height = entry
+        start = self.data_start + offset
+        pixels = memoryview(self.map)[start:start + width * height * 4]
+        return Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the pre-rendered icon atlas.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--icons", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons"))
+    parser.add_argument("--output", default=None, help="Atlas path (defaults to icons/icons.atlas)")
+    args = parser.parse_args()
+    path = build_atlas(args.icons, args.output)
+    print(f"Wrote {path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
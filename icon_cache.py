@@ -0,0 +1,106 @@
+"""
+Cache of resized icons shared by every SmartHouseGUI screen.
+
+Loading an icon means decoding the file from icons/ and running a LANCZOS resize, which
+used to happen on every page switch. IconCache keeps the resulting PhotoImage objects keyed
+by (filename, size) with an LRU bound, and reads from the pre-rendered atlas built by
+icon_atlas.py when one is available.
+"""
+import logging
+import os
+from collections import OrderedDict
+from PIL import Image, ImageTk
+
+log = logging.getLogger(__name__)
+
+ROOM_ICONS = [
+    "bedroom_icon.png", "kidsroom_icon.png", "livingroom_icon.png", "office_icon.png",
+    "kitchen_icon.png", "bathroom_icon.png", "dressingroom_icon.png", "garage_icon.png",
+]
+LIGHT_COLORS = ["white", "red", "orange", "yellow", "green", "blue", "purple", "pink"]
+FAN_ICONS = {
+    "low": "fan_on_low_icon.png",
+    "medium": "fan_on_medium_icon.png",
+    "high": "fan_on_high_icon.png",
+    "off": "fan_off_icon.png",
+}
+
+# Every (filename, size) the GUI displays, used for warm-up
+ICON_SPECS = (
+    [("house_icon.jpg", (150, 150)), ("clock_icon.png", (50, 50)), ("temperature_icon.png", (50, 50))]
+    + [(icon, (250, 250)) for icon in ROOM_ICONS]
+    + [("power_icon.png", (50, 50)), ("lights_off_icon.png", (300, 300))]
+    + [(f"lights_on_{color}_icon.png", (300, 300)) for color in LIGHT_COLORS]
+    + [("tv_icon.png", (200, 150)), ("music_icon.png", (200, 200))]
+    + [(icon, (185, 185)) for icon in FAN_ICONS.values()]
+)
+
+
+def load_icon(icons_folder, filename, size):
+    """
+    Open an icon and resize it.
+    :param icons_folder: Folder containing the icon files.
+    :param filename: Icon file name.
+    :param size: Tuple (width, height).
+    :return: Resized PIL image.
+    """
+    return Image.open(os.path.join(icons_folder, filename)).resize(size, Image.LANCZOS)
+
+
+class IconCache:
+    """
+    LRU cache of ImageTk.PhotoImage objects keyed by (filename, size).
+
+    Args:
+        icons_folder (str): Folder containing the icon files.
+        max_entries (int): Maximum number of cached icons; 0 disables caching.
+        atlas: Optional icon_atlas.IconAtlas consulted before decoding the original file.
+    """
+    def __init__(self, icons_folder, max_entries=64, atlas=None):
+        self.icons_folder = icons_folder
+        self.atlas = atlas
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, filename, size):
+        """
+        Return the PhotoImage for an icon at the given size, loading it on a miss.
+        Raises the underlying error (e.g. FileNotFoundError) if the icon cannot be loaded.
+        """
+        key = (filename, tuple(size))
+        photo = self.entries.get(key)
+        if photo is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return photo
+
+        self.misses += 1
+        image = self.atlas.get_image(filename, key[1]) if self.atlas else None
+        if image is None:
+            image = load_icon(self.icons_folder, filename, key[1])
+        photo = ImageTk.PhotoImage(image)
+        self.entries[key] = photo
+        # Widgets keep their own reference, so evicted icons stay valid while displayed
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return photo
+
+    def warm_up(self, specs=ICON_SPECS):
+        """Load the given (filename, size) icons ahead of time."""
+        for filename, size in specs:
+            try:
+                self.get(filename, size)
+            except Exception as e:
+                log.warning("Error pre-loading icon %s: %s", filename, e)
+
+    def stats(self):
+        """Return the hit/miss counters and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+        }
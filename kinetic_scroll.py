@@ -0,0 +1,120 @@
+"""
+Kinetic scrolling of the GUI's active canvas, driven by the recognizer's scroll velocity.
+
+While the user shows the peace sign the recognizer publishes the smoothed wrist velocity on the
+hand channel. KineticScroller follows it at a steady tick on its own thread: the scroll velocity
+eases towards the hand's (inertia), and once the gesture ends it keeps coasting and slows down
+exponentially (friction). Flings (e.g. from a swipe) add to the velocity the same way.
+
+Tk is not thread-safe, so the thread only accumulates the distance to scroll and wakes the Tk
+thread with a <<KineticScroll>> virtual event, which moves the canvas with yview_moveto /
+xview_moveto. Several ticks between two Tk iterations are coalesced into one move.
+"""
+import math
+import threading
+import time
+
+
+class KineticScroller:
+    """
+    Args:
+        read_velocity: Callable returning the hand's (vx, vy) in frame heights per second, or
+            None while the user is not scrolling.
+        notify: Callable run on the scroller thread when take() has something to apply
+            (typically generating a Tk virtual event).
+        rate (float): Ticks per second while scrolling.
+        idle_rate (float): Ticks per second while at rest (only polls read_velocity).
+        gain (float): Viewport lengths scrolled per frame height the hand moves.
+        inertia (float): Time constant in seconds with which the scroll velocity follows the hand.
+        friction (float): Decay rate per second of the velocity after the gesture ends.
+        dead_zone (float): Hand speeds below this (frame heights per second) count as still.
+        min_velocity (float): Velocity (viewports per second) below which scrolling stops.
+    """
+    def __init__(self, read_velocity, notify, rate=60, idle_rate=20, gain=1.5, inertia=0.08, friction=4.0,
+                 dead_zone=0.05, min_velocity=0.02):
+        self.read_velocity = read_velocity
+        self.notify = notify
+        self.interval = 1.0 / rate
+        self.idle_interval = 1.0 / idle_rate
+        self.gain = gain
+        self.inertia = inertia
+        self.friction = friction
+        self.dead_zone = dead_zone
+        self.min_velocity = min_velocity
+        self.velocity = [0.0, 0.0]  # Viewports per second
+        self.pending = [0.0, 0.0]  # Viewports scrolled since the last take()
+        self.notified = False
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake.set()
+        self.thread.join()
+
+    def fling(self, vx, vy):
+        """Add a velocity impulse in viewports per second; it coasts to a stop under friction."""
+        with self.lock:
+            self.velocity[0] += vx
+            self.velocity[1] += vy
+        self.wake.set()
+
+    def take(self):
+        """Return and reset the (dx, dy) in viewports accumulated since the last call (Tk thread)."""
+        with self.lock:
+            dx, dy = self.pending
+            self.pending = [0.0, 0.0]
+            self.notified = False
+        return dx, dy
+
+    def step(self, target, dt):
+        """
+        Advance the velocity by dt seconds and accumulate the distance scrolled.
+        :param target: Hand velocity (vx, vy) in frame heights per second, or None when released.
+        :return: True when something was accumulated and the Tk thread should be notified.
+        """
+        with self.lock:
+            velocity = self.velocity
+            if target is not None:
+                follow = 1.0 - math.exp(-dt / self.inertia)
+                for axis in (0, 1):
+                    hand = target[axis] if abs(target[axis]) > self.dead_zone else 0.0
+                    velocity[axis] += (self.gain * hand - velocity[axis]) * follow
+            else:
+                decay = math.exp(-self.friction * dt)
+                velocity[0] *= decay
+                velocity[1] *= decay
+            if math.hypot(*velocity) < self.min_velocity:
+                velocity[0] = velocity[1] = 0.0
+                return False
+            self.pending[0] += velocity[0] * dt
+            self.pending[1] += velocity[1] * dt
+            if self.notified:
+                return False  # The Tk thread has not taken the previous distance yet
+            self.notified = True
+            return True
+
+    def moving(self):
+        with self.lock:
+            return self.velocity[0] != 0.0 or self.velocity[1] != 0.0
+
+    def _run(self):
+        last = time.perf_counter()
+        active = False
+        while True:
+            self.wake.wait(self.interval if active else self.idle_interval)
+            self.wake.clear()
+            if self.stop_event.is_set():
+                break
+            now = time.perf_counter()
+            target = self.read_velocity()
+            if self.step(target, now - last):
+                self.notify()
+            active = target is not None or self.moving()
+            last = now
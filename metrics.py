@@ -0,0 +1,244 @@
+"""
+Counters, gauges and histograms with a Prometheus text-format exporter.
+
+Modules declare their metrics at import time on the process-wide REGISTRY and update them on
+the hot path (an update is a lock and an addition). start_exporter() makes them available to
+a monitoring system, either on a localhost HTTP endpoint (/metrics) or as a text file that is
+rewritten periodically (e.g. for node_exporter's textfile collector).
+"""
+import bisect
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in seconds, suited to per-frame stage times up to slow GUI handlers
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Counter:
+    """Monotonically increasing value; by convention its name ends in _total."""
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def samples(self, name, labels):
+        yield name, labels, self.value
+
+
+class Gauge:
+    """Value that can go up and down."""
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def samples(self, name, labels):
+        yield name, labels, self.value
+
+
+class Histogram:
+    """
+    Distribution of observed values in cumulative buckets.
+
+    Args:
+        buckets: Sorted upper bounds; +Inf is added automatically.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def samples(self, name, labels):
+        with self.lock:
+            counts, total = list(self.counts), self.sum
+        cumulative = 0
+        for bound, count in zip(self.bounds + (math.inf,), counts):
+            cumulative += count
+            yield name + "_bucket", labels + (("le", _format_value(bound)),), cumulative
+        yield name + "_sum", labels, total
+        yield name + "_count", labels, cumulative
+
+
+class MetricFamily:
+    """A metric with label names; labels(**values) returns the series for those values."""
+    def __init__(self, name, help_text, kind, label_names, factory):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self.factory = factory
+        self.children = {}
+        self.lock = threading.Lock()
+
+    def labels(self, **values):
+        key = tuple(str(values[name]) for name in self.label_names)
+        child = self.children.get(key)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(key, self.factory())
+        return child
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in list(self.children.items()):
+            for sample_name, labels, value in child.samples(self.name, tuple(zip(self.label_names, key))):
+                names = [name for name, _ in labels]
+                values = [value for _, value in labels]
+                lines.append(f"{sample_name}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named metrics of one process.
+
+    counter(), gauge() and histogram() return the series directly when the metric has no
+    labels, and a MetricFamily (see MetricFamily.labels()) otherwise.
+    """
+    def __init__(self):
+        self.families = {}
+
+    def _register(self, name, help_text, kind, labels, factory):
+        if name in self.families:
+            raise ValueError(f"Metric '{name}' is already registered")
+        family = MetricFamily(name, help_text, kind, labels, factory)
+        self.families[name] = family
+        return family if labels else family.labels()
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(name, help_text, "counter", labels, Counter)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._register(name, help_text, "gauge", labels, Gauge)
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(name, help_text, "histogram", labels, lambda: Histogram(buckets))
+
+    def render(self, prefix=""):
+        """Return the metrics whose name starts with prefix in the Prometheus text exposition format."""
+        lines = []
+        for family in list(self.families.values()):
+            if family.name.startswith(prefix):
+                lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path, prefix=""):
+        """Atomically write the metrics to a file."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render(prefix))
+        os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+class MetricsExporter:
+    """
+    Serve the metrics on http://host:port/metrics and/or rewrite a text file every interval.
+
+    Args:
+        registry (MetricsRegistry): Metrics to export.
+        port (int): HTTP port (None disables the endpoint).
+        host (str): Address to bind; localhost by default so the panel does not expose it.
+        textfile (str): File to rewrite (None disables it).
+        interval (float): Seconds between two text file writes.
+        prefix (str): Only export metrics whose name starts with this (e.g. the process's own).
+    """
+    def __init__(self, registry=REGISTRY, port=None, host="127.0.0.1", textfile=None, interval=5.0, prefix=""):
+        self.registry = registry
+        self.prefix = prefix
+        self.textfile = textfile
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.server = None
+        self.threads = []
+        if port is not None:
+            self.server = ThreadingHTTPServer((host, port), self._make_handler())
+            self.server.daemon_threads = True
+            self.threads.append(threading.Thread(target=self.server.serve_forever, daemon=True))
+        if textfile is not None:
+            self.threads.append(threading.Thread(target=self._write_loop, daemon=True))
+
+    def _make_handler(self):
+        registry, prefix = self.registry, self.prefix
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render(prefix).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes are not worth a log line
+
+        return Handler
+
+    def _write_loop(self):
+        while not self.stop_event.wait(self.interval):
+            self.registry.write_textfile(self.textfile, self.prefix)
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.textfile is not None:
+            self.registry.write_textfile(self.textfile, self.prefix)  # Final snapshot
+
+
+def start_exporter(port=None, textfile=None, **options):
+    """
+    Start exporting the process-wide REGISTRY.
+    :param port: Localhost HTTP port serving /metrics.
+    :param textfile: Prometheus text file rewritten periodically.
+    :param options: Other MetricsExporter arguments (host, interval, prefix).
+    :return: The running MetricsExporter.
+    """
+    return MetricsExporter(REGISTRY, port=port, textfile=textfile, **options).start()
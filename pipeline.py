@@ -0,0 +1,159 @@
+"""
+Threaded capture -> inference -> render pipeline for the gesture recognizer.
+
+The capture thread keeps only the newest frame, so a slow inference step never works on
+stale frames; the render stage likewise only shows the newest processed frame.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+from metrics import REGISTRY
+
+log = logging.getLogger(__name__)
+
+LATENCY_SECONDS = REGISTRY.histogram("recognizer_latency_seconds",
+                                     "Capture-to-render latency of the threaded pipeline")
+LATENCY_SAMPLES = 10000  # Capture-to-render latencies kept for benchmark reports; the histogram sees all
+DROPPED_FRAMES = REGISTRY.counter("recognizer_dropped_frames_total",
+                                  "Frames replaced by a newer one before inference or rendering")
+
+
+class LatestFrameBuffer:
+    """Bounded drop-oldest ring buffer; get() always returns the newest item."""
+    def __init__(self, capacity=1):
+        self.items = deque(maxlen=capacity)
+        self.condition = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, item):
+        with self.condition:
+            if len(self.items) == self.items.maxlen:
+                self.dropped += 1  # The oldest item is overwritten
+                DROPPED_FRAMES.inc()
+            self.items.append(item)
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        """
+        Return the newest item and discard older ones.
+        :param timeout: Seconds to wait for an item (None waits until one arrives or the buffer closes).
+        :return: The newest item, or None on timeout or when the buffer is closed and empty.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.items or self.closed, timeout)
+            if not self.items:
+                return None
+            item = self.items.pop()
+            if self.items:
+                self.dropped += len(self.items)
+                DROPPED_FRAMES.inc(len(self.items))
+            self.items.clear()
+            return item
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def is_drained(self):
+        with self.condition:
+            return self.closed and not self.items
+
+
+class CapturePipeline:
+    """
+    Run capture and inference on worker threads and rendering on the calling thread.
+
+    Args:
+        source: Frame source with the cv2.VideoCapture interface; the caller releases it.
+        infer: Callable taking a captured frame and returning the item to render.
+        render: Callable taking an inferred item; returns False to stop the pipeline.
+        timer: Optional stage timer; start_frame/end_frame wrap each inference step.
+        throttle: Optional callable the capture thread calls before every read (e.g. to idle).
+    """
+    def __init__(self, source, infer, render, timer=None, throttle=None):
+        self.source = source
+        self.infer = infer
+        self.render = render
+        self.timer = timer
+        self.throttle = throttle
+        self.frames = LatestFrameBuffer()
+        self.results = LatestFrameBuffer()
+        self.stop_event = threading.Event()
+        self.captured = 0
+        self.processed = 0
+        self.rendered = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)  # Seconds from capture to render, newest frames
+        self.error = None  # Exception that stopped the inference thread
+
+    def _capture_loop(self):
+        while not self.stop_event.is_set() and self.source.isOpened():
+            if self.throttle:
+                self.throttle()
+            ret, frame = self.source.read()
+            if not ret:
+                log.warning("Failed to capture frame. Exiting.")
+                break
+            self.frames.put((time.perf_counter(), frame))
+            self.captured += 1
+        self.frames.close()
+
+    def _inference_loop(self):
+        try:
+            while True:
+                item = self.frames.get()
+                if item is None:
+                    break
+                captured_at, frame = item
+                if self.timer:
+                    self.timer.start_frame()
+                output = self.infer(frame)
+                if self.timer:
+                    self.timer.end_frame()
+                self.processed += 1
+                self.results.put((captured_at, output))
+        except Exception as e:
+            self.error = e  # Re-raised by run() on the calling thread
+        finally:
+            # Always let run() drain and return, and stop the capture thread
+            self.stop_event.set()
+            self.results.close()
+
+    def run(self):
+        """Start the worker threads and render until the source ends or render() returns False."""
+        capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        inference_thread = threading.Thread(target=self._inference_loop, daemon=True)
+        capture_thread.start()
+        inference_thread.start()
+
+        while not self.results.is_drained():
+            item = self.results.get(timeout=0.1)
+            if item is None:
+                continue
+            captured_at, output = item
+            keep_running = self.render(output)
+            self.rendered += 1
+            latency = time.perf_counter() - captured_at
+            self.latencies.append(latency)
+            LATENCY_SECONDS.observe(latency)
+            if not keep_running:
+                break
+
+        self.stop_event.set()
+        capture_thread.join()
+        inference_thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def counters(self):
+        """Return frame counters, including frames dropped before inference and before rendering."""
+        return {
+            "captured": self.captured,
+            "processed": self.processed,
+            "rendered": self.rendered,
+            "dropped_before_inference": self.frames.dropped,
+            "dropped_before_render": self.results.dropped,
+        }
@@ -0,0 +1,112 @@
+"""
+Selection aids for the in-app gesture cursor: target snapping and dwell-to-click.
+
+Clicking with the "FOUR" gesture changes the hand shape, which moves the fingertip and with it
+the cursor just as the click happens. Two aids make selection independent of that:
+
+TargetSnapper pulls the pointer to the centre of the nearest button within a radius, so small
+tremors of the hand no longer move the pointer off a target. It keeps the current target while
+the raw cursor stays inside it and only queries the grid index when the cursor leaves it, with
+some hysteresis between neighbouring buttons; each cursor sample costs a bounding-box check or
+one lookup of the cells around the cursor.
+
+DwellClicker clicks a target once the pointer has rested on it for the dwell time, and reports
+the progress in between so the GUI can draw it as a ring around the pointer. After a click
+the hand has to move away before the next dwell starts, so a click that swaps the screen
+does not go on to click whatever appears under the resting pointer.
+
+Both are independent of Tk, so benchmark.py can replay recorded hand trajectories through them
+and measure the selection throughput.
+"""
+import math
+
+
+def box_distance(box, x, y):
+    """Distance in pixels from (x, y) to the nearest point of a box (0 inside)."""
+    x0, y0, x1, y1 = box[:4]
+    dx = max(x0 - x, 0, x - x1)
+    dy = max(y0 - y, 0, y - y1)
+    return math.hypot(dx, dy)
+
+
+class TargetSnapper:
+    """
+    Args:
+        index: hover_index.HoverIndex over the boxes that attract the pointer (buttons only;
+            sliders need the raw position).
+        radius (float): Cursors within this many pixels of a box snap to its centre.
+        margin (float): Another box must be this much closer than the current one to take over.
+    """
+    def __init__(self, index, radius=24, margin=8):
+        self.index = index
+        self.radius = radius
+        self.margin = margin
+        self.box = None  # (x0, y0, x1, y1, target) the pointer is snapped to
+        self.lookups = 0  # Index queries, i.e. samples that left the current target
+
+    def reset(self):
+        """Drop the current target, e.g. when the index was rebuilt."""
+        self.box = None
+
+    def update(self, x, y):
+        """
+        Feed a raw cursor sample.
+        :return: Tuple (target or None, x, y) with the position the pointer is drawn and clicks at.
+        """
+        box = self.box
+        if box is not None and box[0] <= x < box[2] and box[1] <= y < box[3]:
+            return box[4], (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+        self.lookups += 1
+        nearest = self.index.nearest(x, y, self.radius)
+        if box is not None:
+            distance = box_distance(box, x, y)
+            if distance <= self.radius and (nearest is None or box_distance(nearest, x, y) > distance - self.margin):
+                nearest = box
+        self.box = nearest
+        if nearest is None:
+            return None, x, y
+        return nearest[4], (nearest[0] + nearest[2]) / 2, (nearest[1] + nearest[3]) / 2
+
+
+class DwellClicker:
+    """
+    Args:
+        dwell_time (float): Seconds the pointer has to rest on a target before it is clicked.
+        rearm_distance (float): Pixels the cursor has to move away from a click (or the cursor
+            has to be lost) before dwelling starts again.
+    """
+    def __init__(self, dwell_time=0.8, rearm_distance=30):
+        self.dwell_time = dwell_time
+        self.rearm_distance = rearm_distance
+        self.target = None
+        self.since = 0.0
+        self.clicked_at = None  # Cursor position of the last click until the cursor moves away
+        self.selections = 0
+
+    def reset(self):
+        self.target = None
+        self.clicked_at = None
+
+    def update(self, t, target, x=0.0, y=0.0):
+        """
+        Feed the target under the pointer at time t (call it on cursor samples and on a timer
+        while a target is hovered).
+        :param x, y: Raw cursor position, which decides when a click is re-armed.
+        :return: Tuple (progress in [0, 1], clicked): clicked is True once per dwell on a target.
+        """
+        if self.clicked_at is not None:
+            if target is not None and math.hypot(x - self.clicked_at[0], y - self.clicked_at[1]) < self.rearm_distance:
+                return 0.0, False
+            self.clicked_at = None
+            self.target = None
+        if target is not self.target:
+            self.target = target
+            self.since = t
+        if target is None:
+            return 0.0, False
+        progress = (t - self.since) / self.dwell_time
+        if progress < 1.0:
+            return progress, False
+        self.clicked_at = (x, y)
+        self.selections += 1
+        return 1.0, True
@@ -0,0 +1,105 @@
+"""
+Region-of-interest tracking for the hand landmark model.
+
+Once a hand has been found, RoiTracker converts and feeds only a padded square around the
+previous landmarks to MediaPipe (downsampled when the hand is large), and maps the resulting
+landmarks back to full-frame coordinates. It falls back to the full frame when the hand is
+lost, and periodically re-checks the full frame so a hand entering elsewhere is not missed.
+"""
+
+
+class RoiTracker:
+    """
+    Args:
+        padding (float): Margin added on every side of the hand box, as a fraction of its size.
+        max_side (int): Crops larger than this many pixels are downsampled to it before inference.
+        min_side (int): Smallest crop, in pixels.
+        refresh_interval (int): Run a full-frame pass every this many frames (0 disables it).
+    """
+    def __init__(self, padding=0.5, max_side=256, min_side=96, refresh_interval=30):
+        self.padding = padding
+        self.max_side = max_side
+        self.min_side = min_side
+        self.refresh_interval = refresh_interval
+        self.roi = None  # (x0, y0, x1, y1) in frame pixels
+        self.roi_frame_size = None  # (width, height) of the frame the ROI was computed on
+        self.frames_since_full = 0
+        self.hits = 0  # Frames where the hand was found inside the ROI
+        self.fallbacks = 0  # Frames where the ROI lost the hand and the full frame was processed
+        self.full_frames = 0  # Frames processed at full size (acquisition, fallback or refresh)
+
+    def process(self, hand_model, frame, timer):
+        """
+        Run the hand model on the ROI of a BGR frame, or on the full frame when there is none.
+        :return: MediaPipe result with landmarks normalized to the full frame.
+        """
+        import cv2
+        frame_height, frame_width = frame.shape[:2]
+        refresh_due = self.refresh_interval and self.frames_since_full >= self.refresh_interval
+        if self.roi_frame_size != (frame_width, frame_height):
+            self.roi = None  # The frame was resized (e.g. by the FrameGovernor)
+        if self.roi is not None and not refresh_due:
+            x0, y0, x1, y1 = self.roi
+            crop = frame[y0:y1, x0:x1]
+            side = max(x1 - x0, y1 - y0)
+            if side > self.max_side:
+                scale = self.max_side / side
+                crop = cv2.resize(crop, (max(1, int((x1 - x0) * scale)), max(1, int((y1 - y0) * scale))),
+                                  interpolation=cv2.INTER_AREA)
+            crop_rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+            timer.mark("cvtColor")
+            result = hand_model.process(crop_rgb)
+            timer.mark("process")
+            self.frames_since_full += 1
+            if result.multi_hand_landmarks:
+                self.hits += 1
+                self._to_frame_coordinates(result, frame_width, frame_height)
+                self._update_roi(result, frame_width, frame_height)
+                return result
+            self.fallbacks += 1
+            self.roi = None
+
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        timer.mark("cvtColor")
+        result = hand_model.process(frame_rgb)
+        timer.mark("process")
+        self.full_frames += 1
+        self.frames_since_full = 0
+        self._update_roi(result, frame_width, frame_height)
+        return result
+
+    def _to_frame_coordinates(self, result, frame_width, frame_height):
+        """Map landmarks normalized to the crop back to normalized full-frame coordinates."""
+        x0, y0, x1, y1 = self.roi
+        crop_width, crop_height = x1 - x0, y1 - y0
+        for hand_landmarks in result.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = (x0 + lm.x * crop_width) / frame_width
+                lm.y = (y0 + lm.y * crop_height) / frame_height
+                lm.z = lm.z * crop_width / frame_width  # z uses the same scale as x
+
+    def _update_roi(self, result, frame_width, frame_height):
+        """Set the ROI to a padded square around all detected hands, or clear it."""
+        if not result.multi_hand_landmarks:
+            self.roi = None
+            return
+        xs = [lm.x * frame_width for hand in result.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y * frame_height for hand in result.multi_hand_landmarks for lm in hand.landmark]
+        side = max(max(xs) - min(xs), max(ys) - min(ys)) * (1 + 2 * self.padding)
+        side = min(max(side, self.min_side), frame_width, frame_height)
+        center_x = (max(xs) + min(xs)) / 2
+        center_y = (max(ys) + min(ys)) / 2
+        x0 = int(min(max(center_x - side / 2, 0), frame_width - side))
+        y0 = int(min(max(center_y - side / 2, 0), frame_height - side))
+        self.roi = (x0, y0, x0 + int(side), y0 + int(side))
+        self.roi_frame_size = (frame_width, frame_height)
+
+    def stats(self):
+        """Return the ROI hit rate and the fallback / full-frame counters."""
+        attempts = self.hits + self.fallbacks
+        return {
+            "roi_hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "full_frames": self.full_frames,
+            "roi_hit_rate": self.hits / attempts if attempts else 0.0,
+        }
@@ -0,0 +1,72 @@
+import math
+import random
+
+import pytest
+
+from cursor_filter import KalmanFilter, OneEuroFilter, make_cursor_filter
+
+
+def jitter(filter_, samples=300, rate=30, noise=5.0, seed=0):
+    """Feed a resting fingertip with Gaussian noise; return the RMS error of the filtered output."""
+    rng = random.Random(seed)
+    errors = []
+    for i in range(samples):
+        x, y = filter_.update(500 + rng.gauss(0, noise), 300 + rng.gauss(0, noise), i / rate)
+        if i >= samples // 2:
+            errors.append((x - 500) ** 2 + (y - 300) ** 2)
+    return math.sqrt(sum(errors) / len(errors))
+
+
+@pytest.mark.parametrize("filter_class", [OneEuroFilter, KalmanFilter])
+def test_first_sample_passes_through(filter_class):
+    filter_ = filter_class()
+    assert filter_.predict(0.0) is None
+    assert filter_.update(10, 20, 0.0) == (10, 20)
+
+
+@pytest.mark.parametrize("filter_class", [OneEuroFilter, KalmanFilter])
+def test_smooths_jitter_at_rest(filter_class):
+    assert jitter(filter_class()) < 0.75 * jitter(make_cursor_filter("none"))
+
+
+@pytest.mark.parametrize("filter_class", [OneEuroFilter, KalmanFilter])
+def test_follows_constant_motion(filter_class):
+    filter_ = filter_class()
+    for i in range(60):
+        x, y = filter_.update(10.0 * i, 0.0, i / 30)
+    assert abs(x - 590) < 30
+    # predict() extrapolates along the motion, but no further than max_extrapolation
+    ahead = filter_.predict(59 / 30 + 1.0)
+    assert ahead[0] > x
+    assert ahead == filter_.predict(59 / 30 + filter_.max_extrapolation)
+
+
+@pytest.mark.parametrize("filter_class", [OneEuroFilter, KalmanFilter])
+def test_reset_forgets_position(filter_class):
+    filter_ = filter_class()
+    filter_.update(10, 20, 0.0)
+    filter_.reset()
+    assert filter_.predict(1.0) is None
+    assert filter_.update(50, 60, 1.0) == (50, 60)
+
+
+def test_one_euro_lags_less_when_fast():
+    slow, fast = OneEuroFilter(beta=0.05), OneEuroFilter(beta=0.05)
+    for i in range(10):
+        slow_x = slow.update(1.0 * i, 0, i / 30)[0]
+        fast_x = fast.update(50.0 * i, 0, i / 30)[0]
+    assert (9 * 50.0 - fast_x) / 50.0 < (9 * 1.0 - slow_x) / 1.0
+
+
+def test_unknown_filter_name():
+    with pytest.raises(ValueError):
+        make_cursor_filter("median")
+
+@pytest.mark.parametrize("filter_class", [OneEuroFilter, KalmanFilter])
+def test_non_increasing_timestamp_restarts(filter_class):
+    filter_ = filter_class()
+    for i in range(10):
+        filter_.update(10.0 * i, 0.0, i / 30)
+    assert filter_.update(200, 100, 9 / 30) == (200, 100)
+    # Restarted: no velocity is left to extrapolate with
+    assert filter_.predict(9 / 30 + 0.05) == (200, 100)
@@ -0,0 +1,94 @@
+import pytest
+
+from device_state import ApplianceState, DeviceStore, LightState, MediaState, ThermostatState
+
+
+def make_store():
+    store = DeviceStore()
+    store.add("Kitchen", "Light", LightState())
+    store.add("Living Room", "TV", MediaState(on=True))
+    return store
+
+
+def test_records_use_defaults_and_slots():
+    light = LightState(brightness=40)
+    assert light.as_dict() == {"on": False, "color": "white", "brightness": 40}
+    assert ThermostatState().temperature == 22
+    with pytest.raises(AttributeError):
+        light.unknown = 1
+
+
+def test_add_keeps_existing_record():
+    store = make_store()
+    light = store.get("Kitchen", "Light")
+    assert store.add("Kitchen", "Light", LightState(on=True)) is light
+    assert not store.get("Kitchen", "Light").on
+
+
+def test_update_returns_changed_fields_and_notifies():
+    store = make_store()
+    calls = []
+    store.subscribe("Kitchen", "Light", lambda state, changed: calls.append((state.as_dict(), changed)))
+    assert store.update("Kitchen", "Light", on=True, color="white", brightness=70) == ("on", "brightness")
+    assert calls == [({"on": True, "color": "white", "brightness": 70}, ("on", "brightness"))]
+
+
+def test_update_without_changes_does_not_notify():
+    store = make_store()
+    calls = []
+    store.subscribe("Living Room", "TV", lambda state, changed: calls.append(changed))
+    assert store.update("Living Room", "TV", on=True, volume=50) == ()
+    assert calls == []
+
+
+def test_subscribers_only_hear_their_device():
+    store = make_store()
+    calls = []
+    store.subscribe("Kitchen", "Light", lambda state, changed: calls.append(changed))
+    store.update("Living Room", "TV", volume=10)
+    assert calls == []
+
+
+def test_unsubscribe():
+    store = make_store()
+    calls = []
+
+    def callback(state, changed):
+        calls.append(changed)
+
+    store.subscribe("Kitchen", "Light", callback)
+    store.unsubscribe("Kitchen", "Light", callback)
+    store.update("Kitchen", "Light", on=True)
+    assert calls == []
+
+
+def test_unsubscribe_all():
+    store = make_store()
+    calls = []
+    store.subscribe("Kitchen", "Light", lambda state, changed: calls.append(changed))
+    store.subscribe("Living Room", "TV", lambda state, changed: calls.append(changed))
+    store.unsubscribe_all()
+    store.update("Kitchen", "Light", on=True)
+    store.update("Living Room", "TV", volume=10)
+    assert calls == []
+    assert store.get("Living Room", "TV").volume == 10  # State outlives the views
+
+
+def test_callback_may_unsubscribe_itself():
+    store = make_store()
+    calls = []
+
+    def once(state, changed):
+        calls.append(changed)
+        store.unsubscribe("Kitchen", "Light", once)
+
+    store.subscribe("Kitchen", "Light", once)
+    store.update("Kitchen", "Light", on=True)
+    store.update("Kitchen", "Light", on=False)
+    assert calls == [("on",)]
+
+
+def test_rooms_are_sorted_and_unique():
+    store = make_store()
+    store.add("Kitchen", "Fridge", ApplianceState())
+    assert store.rooms() == ["Kitchen", "Living Room"]
@@ -0,0 +1,107 @@
+import json
+import logging
+
+import pytest
+
+from event_log import (SAMPLED, RingBufferHandler, SamplingFilter, StructuredFormatter, configure_logging,
+                       read_ring_buffer, record_fields, shutdown_logging)
+
+
+def make_record(msg="Frame processed", created=0.0, level=logging.INFO, **fields):
+    record = logging.makeLogRecord({"name": "gestures", "msg": msg, "levelno": level,
+                                    "levelname": logging.getLevelName(level), **fields})
+    record.created = created
+    return record
+
+
+@pytest.fixture
+def root_logger():
+    """Restore the root logger after a test reconfigures it."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    shutdown_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_record_fields_are_the_extra_values():
+    assert record_fields(make_record(gesture="FIST", fps=30)) == {"gesture": "FIST", "fps": 30}
+    assert record_fields(make_record(**SAMPLED)) == {}
+
+
+def test_text_format():
+    line = StructuredFormatter().format(make_record(gesture="FIST"))
+    assert line.endswith("INFO    gestures: Frame processed gesture=FIST")
+
+
+def test_json_format():
+    entry = json.loads(StructuredFormatter(json_lines=True).format(make_record(created=12.5, fps=30)))
+    assert entry == {"t": 12.5, "level": "INFO", "logger": "gestures", "msg": "Frame processed", "fps": 30}
+
+
+def test_sampling_filter_rate_limits_sampled_records():
+    sampling = SamplingFilter(interval=1.0)
+    passed = [sampling.filter(make_record(created=t, **SAMPLED)) for t in (0.0, 0.3, 0.6, 1.1)]
+    assert passed == [True, False, False, True]
+    record = make_record(created=2.5, **SAMPLED)
+    assert sampling.filter(record) and not hasattr(record, "suppressed")
+
+
+def test_sampling_filter_reports_suppressed_count():
+    sampling = SamplingFilter(interval=1.0)
+    for t in (0.0, 0.3, 0.6):
+        sampling.filter(make_record(created=t, **SAMPLED))
+    record = make_record(created=1.5, **SAMPLED)
+    assert sampling.filter(record)
+    assert record.suppressed == 2
+
+
+def test_sampling_filter_passes_other_records():
+    sampling = SamplingFilter(interval=1.0)
+    assert all(sampling.filter(make_record(created=0.0)) for _ in range(3))
+    assert sampling.filter(make_record("Other message", created=0.0, **SAMPLED))
+
+
+def test_ring_buffer_keeps_latest_records(tmp_path):
+    path = tmp_path / "events.ring"
+    handler = RingBufferHandler(str(path), capacity=3, slot_size=64)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for i in range(5):
+        handler.emit(make_record(f"event {i}", created=float(i), level=logging.WARNING))
+    handler.close()
+    assert read_ring_buffer(str(path)) == [(2.0, "WARNING", "event 2"), (3.0, "WARNING", "event 3"),
+                                           (4.0, "WARNING", "event 4")]
+
+
+def test_ring_buffer_truncates_long_records(tmp_path):
+    path = tmp_path / "events.ring"
+    handler = RingBufferHandler(str(path), capacity=2, slot_size=32)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.emit(make_record("x" * 100))
+    handler.close()
+    assert read_ring_buffer(str(path))[0][2] == "x" * (32 - 12)
+
+
+def test_read_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        read_ring_buffer(str(path))
+
+
+def test_configure_logging_writes_through_queue(root_logger, tmp_path):
+    path = tmp_path / "gui.ring"
+    configure_logging("DEBUG", ring_buffer=str(path), ring_capacity=8)
+    log = logging.getLogger("ui")
+    log.info("Screen shown", extra={"screen": "home"})
+    for _ in range(5):
+        log.debug("Value adjusted", extra=SAMPLED)
+    shutdown_logging()  # Flushes the queue
+    texts = [text for _, _, text in read_ring_buffer(str(path))]
+    assert len(texts) == 2
+    assert texts[0].endswith("ui: Screen shown screen=home")
+    assert texts[1].endswith("ui: Value adjusted")
@@ -0,0 +1,66 @@
+from gesture_events import HOLD, PINCH_ZOOM, PRESS, RELEASE, ZOOM, GestureStateMachine, PinchZoomTracker
+
+
+def feed(machine, labels, start=0.0, step=0.1):
+    events = []
+    for i, label in enumerate(labels):
+        events.extend(machine.update(label, start + i * step))
+    return events
+
+
+def test_press_needs_n_of_m_votes():
+    machine = GestureStateMachine(window=5, enter_votes=4, exit_votes=2, hold_time=10)
+    assert feed(machine, ["FIST", "FIST", "FIST"]) == []
+    events = machine.update("FIST", 0.3)
+    assert [(e.kind, e.gesture) for e in events] == [(PRESS, "FIST")]
+
+
+def test_single_frame_flicker_does_not_release():
+    machine = GestureStateMachine(window=5, enter_votes=4, exit_votes=2, hold_time=10)
+    feed(machine, ["FIST"] * 4)
+    assert feed(machine, ["OPEN", "FIST", "OPEN"], start=0.4) == []
+    assert machine.active == "FIST"
+
+
+def test_release_when_votes_drop_below_exit():
+    machine = GestureStateMachine(window=5, enter_votes=4, exit_votes=2, hold_time=10)
+    feed(machine, ["FIST"] * 5)
+    events = feed(machine, [None] * 4, start=0.5)
+    assert [(e.kind, e.gesture) for e in events] == [(RELEASE, "FIST")]
+    assert machine.active is None
+
+
+def test_switching_gesture_releases_then_presses():
+    machine = GestureStateMachine(window=5, enter_votes=4, exit_votes=1, hold_time=10)
+    feed(machine, ["FIST"] * 5)
+    events = feed(machine, ["OPEN"] * 4, start=0.5)
+    assert [(e.kind, e.gesture) for e in events] == [(RELEASE, "FIST"), (PRESS, "OPEN")]
+
+
+def test_hold_is_emitted_once():
+    machine = GestureStateMachine(window=5, enter_votes=4, exit_votes=2, hold_time=0.5)
+    events = feed(machine, ["FIST"] * 12)
+    assert [e.kind for e in events] == [PRESS, HOLD]
+
+
+def test_ignored_labels_never_press():
+    machine = GestureStateMachine()
+    assert feed(machine, ["UNKNOWN GESTURE"] * 10) == []
+
+
+def test_reset_releases_active_gesture():
+    machine = GestureStateMachine(hold_time=10)
+    feed(machine, ["FIST"] * 5)
+    assert [e.kind for e in machine.reset(1.0)] == [RELEASE]
+    assert machine.reset(1.0) == []
+
+
+def test_pinch_zoom_press_zoom_release():
+    tracker = PinchZoomTracker(enter_frames=3, exit_frames=3, min_change=0.03)
+    assert tracker.update(100) == [] and tracker.update(100) == []
+    assert tracker.update(100) == [(PRESS, PINCH_ZOOM, 1.0)]
+    assert tracker.update(101) == []  # Below min_change
+    events = tracker.update(150)
+    assert events[0].kind == ZOOM and abs(events[0].scale - 1.5) < 1e-9
+    assert tracker.update(None) == [] and tracker.update(None) == []
+    assert tracker.update(None) == [(RELEASE, PINCH_ZOOM, 1.5)]
@@ -0,0 +1,107 @@
+import json
+
+import numpy as np
+import pytest
+
+from gesture_model import (FEATURE_SIZE, GestureModel, KnnClassifier, MlpClassifier, evaluate, landmark_features,
+                           load_samples, make_classifier, train)
+
+NAMES = ["FIST", "OPEN HAND", "PEACE SIGN"]
+
+
+PROTOTYPES = np.random.default_rng(42).uniform(-0.2, 0.2, (len(NAMES), 21, 3)).astype(np.float32)
+PROTOTYPES[:, 0] = 0.0  # Wrist
+PROTOTYPES[:, 9, :2] = (0.0, -0.15)  # Middle-finger knuckle above the wrist
+
+
+def make_hands(count, seed=0, noise=0.01):
+    """Jittered copies of one prototype hand per gesture, centred in the image."""
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(len(NAMES), size=count)
+    points = PROTOTYPES[labels] + rng.normal(0, noise, (count, 21, 3)).astype(np.float32)
+    points[..., :2] += 0.5
+    return points, np.zeros(count, dtype=bool), [NAMES[label] for label in labels]
+
+
+def rotate(points, angle, scale=1.0, shift=(0.0, 0.0)):
+    c, s = np.cos(angle), np.sin(angle)
+    xy = points[..., :2] @ np.array([[c, s], [-s, c]], dtype=np.float32) * scale + np.array(shift, dtype=np.float32)
+    return np.concatenate([xy, points[..., 2:]], axis=-1)
+
+
+def test_features_shape():
+    points, left, _ = make_hands(7)
+    assert landmark_features(points).shape == (7, FEATURE_SIZE)
+    assert landmark_features(points[0]).shape == (FEATURE_SIZE,)
+    assert landmark_features(points).dtype == np.float32
+
+
+def test_features_are_invariant():
+    points, _, _ = make_hands(5)
+    features = landmark_features(points)
+    moved = rotate(points, 0.7, scale=1.8, shift=(0.3, -0.1))
+    np.testing.assert_allclose(landmark_features(moved), features, atol=1e-4)
+
+
+def test_left_hands_are_mirrored():
+    points, _, _ = make_hands(5)
+    mirrored = points.copy()
+    mirrored[..., 0] = 1.0 - mirrored[..., 0]
+    left = np.ones(5, dtype=bool)
+    np.testing.assert_allclose(landmark_features(mirrored, left), landmark_features(points), atol=1e-5)
+
+
+@pytest.mark.parametrize("kind", ["knn", "mlp"])
+def test_classifiers_separate_gestures(kind):
+    points, left, names = make_hands(300)
+    test_points, test_left, test_names = make_hands(100, seed=1)
+    test_points = rotate(test_points, -0.4, scale=0.7)
+    model = train(points, left, names, kind, **({"epochs": 150} if kind == "mlp" else {}))
+    assert model.labels == NAMES
+    predicted = [model.labels[index] for index in model.predict(test_points, test_left)]
+    assert predicted == test_names
+
+
+def test_knn_majority_vote():
+    classifier = KnnClassifier(k=3).fit([[0.0], [0.1], [0.2], [5.0]], [0, 0, 1, 1], ["A", "B"])
+    assert list(classifier.predict_features([[0.05], [4.0]])) == [0, 1]
+
+
+def test_make_classifier():
+    assert isinstance(make_classifier("knn", k=3), KnnClassifier)
+    assert make_classifier("mlp", hidden=8).hidden == 8
+    with pytest.raises(ValueError):
+        make_classifier("svm")
+
+
+@pytest.mark.parametrize("kind", ["knn", "mlp"])
+def test_save_load_round_trip(tmp_path, kind):
+    points, left, names = make_hands(120)
+    model = train(points, left, names, kind, **({"epochs": 50} if kind == "mlp" else {}))
+    path = tmp_path / "gestures.npz"
+    model.save(str(path))
+    loaded = GestureModel.load(str(path))
+    assert type(loaded.classifier) is type(model.classifier)
+    assert loaded.labels == model.labels
+    np.testing.assert_array_equal(loaded.predict(points, left), model.predict(points, left))
+
+
+def test_load_samples(tmp_path):
+    path = tmp_path / "samples.jsonl"
+    hand = np.arange(63, dtype=float).reshape(21, 3).tolist()
+    path.write_text("\n".join(json.dumps(sample) for sample in [
+        {"label": "FIST", "handedness": "Left", "hand": hand},
+        {"label": "OPEN HAND", "handedness": None, "hand": hand},
+    ]) + "\n")
+    points, left, names = load_samples([str(path)])
+    assert points.shape == (2, 21, 3)
+    assert list(left) == [True, False]
+    assert names == ["FIST", "OPEN HAND"]
+
+
+def test_evaluate_reports_accuracy():
+    points, left, names = make_hands(200)
+    report = evaluate(points, left, names, "knn", test_fraction=0.25)
+    assert (report["train_samples"], report["test_samples"]) == (150, 50)
+    assert report["accuracy"] == 1.0
+    assert set(report["recall"]) <= set(NAMES)
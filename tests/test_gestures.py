@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from gestures import GESTURES, classify_batch, detect_gesture, detect_gesture_rules
+
+
+def as_landmarks(points):
+    return [SimpleNamespace(x=float(x), y=float(y)) for x, y in points]
+
+
+def random_hands(count, levels=None, seed=0):
+    """
+    Random hands of shape (count, 21, 2). With `levels`, coordinates are drawn from that many
+    evenly spaced values, so many landmarks tie and the strict comparisons are exercised.
+    """
+    rng = np.random.default_rng(seed)
+    if levels is None:
+        return rng.random((count, 21, 2))
+    return rng.integers(0, levels, (count, 21, 2)) / (levels - 1)
+
+
+def check_agreement(hands):
+    batch = classify_batch(hands)
+    for points, code in zip(hands, batch):
+        expected = detect_gesture_rules(as_landmarks(points))
+        assert GESTURES[code] == expected
+        assert detect_gesture(as_landmarks(points)) == expected
+
+
+def test_table_matches_rules_on_random_hands():
+    check_agreement(random_hands(3000))
+
+
+@pytest.mark.parametrize("levels", [2, 3, 5])
+def test_table_matches_rules_with_ties(levels):
+    check_agreement(random_hands(3000, levels, seed=levels))
+
+
+def test_table_matches_rules_on_edge_cases():
+    flat = np.full((21, 2), 0.5)  # Every comparison ties
+    touching = flat.copy()
+    touching[8] = (0.52, 0.5)  # Index tip 0.02 from the thumb tip
+    apart = flat.copy()
+    apart[8] = (0.6, 0.5)
+    check_agreement(np.stack([flat, touching, apart]))
+
+
+def test_batch_shape():
+    hands = random_hands(12).reshape(3, 4, 21, 2)
+    assert classify_batch(hands).shape == (3, 4)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from hand_channel import HandChannel, HandChannelReader, HandChannelWriter
+
+
+@pytest.fixture
+def channel():
+    owner = HandChannel(capacity=4)
+    writer = HandChannelWriter(owner.name)
+    reader = HandChannelReader(owner.name)
+    yield writer, reader
+    reader.close()
+    writer.close()
+    owner.close()
+
+
+def landmarks(offset):
+    return np.arange(63, dtype=np.float32).reshape(21, 3) / 100 + offset
+
+
+def test_empty_channel(channel):
+    _, reader = channel
+    assert reader.latest_sequence() == 0
+    assert reader.read() is None
+
+
+def test_round_trip(channel):
+    writer, reader = channel
+    hands = [("Left", 0.9, 2, landmarks(0.0)), ("Right", 0.8, 5, landmarks(0.5))]
+    sequence = writer.publish(hands, cursor=(640, 360), scroll=(0.1, -0.4))
+    state = reader.read()
+    assert state.sequence == sequence == 1
+    assert [(h.handedness, h.gesture_code) for h in state.hands] == [("Left", 2), ("Right", 5)]
+    assert state.hands[0].confidence == pytest.approx(0.9)
+    np.testing.assert_allclose(state.hands[1].landmarks, landmarks(0.5), rtol=1e-6)
+    assert state.cursor == (640, 360)
+    assert state.scroll == pytest.approx((0.1, -0.4))
+
+
+def test_inactive_cursor_and_scroll(channel):
+    writer, reader = channel
+    writer.publish([("Unknown", 0.5, 0, landmarks(0.0))])
+    state = reader.read()
+    assert state.cursor is None and state.scroll is None
+    assert state.hands[0].handedness == "Unknown"
+
+
+def test_extra_hands_are_dropped(channel):
+    writer, reader = channel
+    writer.publish([("Left", 1.0, 0, landmarks(0.0))] * 3)
+    assert len(reader.read().hands) == 2
+
+
+def test_reads_older_records_until_overwritten(channel):
+    writer, reader = channel
+    for i in range(6):
+        writer.publish([], cursor=(i, i))
+    assert reader.latest_sequence() == 6
+    assert reader.read(5).cursor == (4, 4)
+    assert reader.read(3).cursor == (2, 2)
+    assert reader.read(2) is None  # Capacity 4: slot reused by sequence 6
+    assert reader.read(7) is None  # Not written yet
+
+
+def test_record_being_written_is_not_returned(channel):
+    writer, reader = channel
+    writer.publish([], cursor=(1, 1))
+    reader.sequences[1 % reader.capacity] = -1  # As during publish()
+    assert reader.read(1) is None
@@ -0,0 +1,79 @@
+import random
+
+from hover_index import HoverIndex
+
+
+def grid_boxes(columns=10, rows=8, width=90, height=50, pitch_x=100, pitch_y=60):
+    return [(c * pitch_x, r * pitch_y, c * pitch_x + width, r * pitch_y + height, (c, r))
+            for r in range(rows) for c in range(columns)]
+
+
+def brute_hit(boxes, x, y):
+    found = None
+    for x0, y0, x1, y1, target in boxes:
+        if x0 <= x < x1 and y0 <= y < y1:
+            found = target
+    return found
+
+
+def test_hit_inside_gap_and_outside():
+    index = HoverIndex(cell=64)
+    index.rebuild(grid_boxes())
+    assert index.hit(105, 65) == (1, 1)
+    assert index.hit(95, 10) is None  # Gap between buttons
+    assert index.hit(-5, -5) is None
+    assert index.hit(90, 10) is None  # Right edge is exclusive
+
+
+def test_later_boxes_win_where_boxes_overlap():
+    index = HoverIndex()
+    index.rebuild(grid_boxes() + [(100, 60, 150, 80, "over")])
+    assert index.hit(105, 65) == "over"
+    assert index.hit(160, 65) == (1, 1)
+
+
+def test_hit_matches_brute_force():
+    boxes = grid_boxes()
+    index = HoverIndex(cell=37)
+    index.rebuild(boxes)
+    rng = random.Random(0)
+    for _ in range(2000):
+        x, y = rng.uniform(-50, 1050), rng.uniform(-50, 500)
+        assert index.hit(x, y) == brute_hit(boxes, x, y)
+
+
+def test_nearest_within_radius():
+    index = HoverIndex()
+    index.rebuild(grid_boxes())
+    assert index.nearest(105, 65, 24)[4] == (1, 1)  # Inside
+    assert index.nearest(95, 20, 24)[4] in ((0, 0), (1, 0))  # Gap: 5 px from both
+    assert index.nearest(193, 20, 24)[4] == (1, 0)  # 3 px right of (1, 0), 7 px left of (2, 0)
+    assert index.nearest(-30, -30, 24) is None
+    assert index.nearest(-10, 10, 24)[4] == (0, 0)
+
+
+def test_nearest_matches_brute_force():
+    boxes = grid_boxes(pitch_x=150, pitch_y=100)
+    index = HoverIndex(cell=50)
+    index.rebuild(boxes)
+    rng = random.Random(1)
+    for _ in range(2000):
+        x, y = rng.uniform(-50, 1550), rng.uniform(-50, 850)
+        distances = [max(b[0] - x, 0, x - b[2]) ** 2 + max(b[1] - y, 0, y - b[3]) ** 2 for b in boxes]
+        found = index.nearest(x, y, 30)
+        if min(distances) > 30 ** 2:
+            assert found is None
+        else:
+            assert found is not None
+            assert max(found[0] - x, 0, x - found[2]) ** 2 + max(found[1] - y, 0, y - found[3]) ** 2 == min(distances)
+
+
+def test_rebuild_replaces_boxes_and_clears_stale():
+    index = HoverIndex()
+    assert index.stale
+    index.rebuild(grid_boxes())
+    assert not index.stale and index.rebuilds == 1
+    index.invalidate()
+    assert index.stale
+    index.rebuild([(0, 0, 10, 10, "only")])
+    assert index.hit(105, 65) is None and index.hit(5, 5) == "only"
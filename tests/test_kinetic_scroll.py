@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+from kinetic_scroll import KineticScroller
+
+DT = 1 / 60
+
+
+def make_scroller(**options):
+    return KineticScroller(lambda: None, lambda: None, **options)
+
+
+def run(scroller, target, seconds):
+    for _ in range(round(seconds / DT)):
+        scroller.step(target, DT)
+        scroller.notified = False  # As if the Tk thread took the distance every tick
+    return scroller.take()
+
+
+def test_velocity_follows_the_hand():
+    scroller = make_scroller(gain=1.5, inertia=0.08)
+    run(scroller, (0.0, 0.4), 1.0)
+    assert scroller.velocity[1] == pytest.approx(0.6, rel=1e-3)
+    assert scroller.velocity[0] == 0.0
+    dx, dy = run(scroller, (0.0, 0.4), 1.0)
+    assert dy == pytest.approx(0.6, rel=1e-3)
+
+
+def test_hand_within_dead_zone_is_still():
+    scroller = make_scroller(dead_zone=0.05)
+    assert not scroller.step((0.04, -0.04), DT)
+    assert run(scroller, (0.04, -0.04), 0.5) == (0.0, 0.0)
+    assert not scroller.moving()
+
+
+def test_release_coasts_and_stops():
+    scroller = make_scroller(friction=4.0)
+    run(scroller, (0.0, 0.4), 1.0)
+    scroller.step(None, 0.25)
+    assert scroller.velocity[1] == pytest.approx(0.6 * 0.3679, rel=1e-3)  # exp(-friction * 0.25)
+    run(scroller, None, 2.0)
+    assert not scroller.moving()
+
+
+def test_fling_travels_velocity_over_friction():
+    scroller = make_scroller(friction=4.0, min_velocity=1e-6)
+    scroller.fling(2.0, -1.0)
+    assert scroller.moving()
+    dx, dy = run(scroller, None, 5.0)
+    assert dx == pytest.approx(2.0 / 4.0, rel=0.05)
+    assert dy == pytest.approx(-1.0 / 4.0, rel=0.05)
+
+
+def test_notifies_once_until_taken():
+    scroller = make_scroller()
+    scroller.fling(0.0, 1.0)
+    assert scroller.step(None, DT)
+    assert not scroller.step(None, DT)  # Coalesced with the pending distance
+    dx, dy = scroller.take()
+    assert dy > 0
+    assert scroller.take() == (0.0, 0.0)
+    assert scroller.step(None, DT)
+
+
+def test_thread_notifies_and_stops():
+    notified = threading.Event()
+    scroller = KineticScroller(lambda: (0.0, 1.0), notified.set, rate=200, idle_rate=200).start()
+    try:
+        assert notified.wait(timeout=2)
+    finally:
+        scroller.stop()
+    assert not scroller.thread.is_alive()
+    assert scroller.take()[1] > 0
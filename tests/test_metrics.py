@@ -0,0 +1,95 @@
+import math
+import urllib.request
+
+import pytest
+
+from metrics import CONTENT_TYPE, MetricsExporter, MetricsRegistry, _format_value
+
+
+def test_format_value():
+    assert _format_value(3) == "3.0"
+    assert _format_value(0.25) == "0.25"
+    assert _format_value(math.inf) == "+Inf"
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    frames = registry.counter("recognizer_frames_total", "Frames processed")
+    fps = registry.gauge("recognizer_fps", "Frames per second")
+    frames.inc()
+    frames.inc(2)
+    fps.set(29.5)
+    assert registry.render() == (
+        "# HELP recognizer_frames_total Frames processed\n"
+        "# TYPE recognizer_frames_total counter\n"
+        "recognizer_frames_total 3.0\n"
+        "# HELP recognizer_fps Frames per second\n"
+        "# TYPE recognizer_fps gauge\n"
+        "recognizer_fps 29.5\n")
+
+
+def test_labelled_series_are_escaped():
+    registry = MetricsRegistry()
+    gestures = registry.counter("recognizer_gestures_total", "Gestures", labels=("gesture",))
+    gestures.labels(gesture="FIST").inc()
+    gestures.labels(gesture='say "hi"\n').inc()
+    assert gestures.labels(gesture="FIST") is gestures.labels(gesture="FIST")
+    lines = registry.render().splitlines()
+    assert 'recognizer_gestures_total{gesture="FIST"} 1.0' in lines
+    assert 'recognizer_gestures_total{gesture="say \\"hi\\"\\n"} 1.0' in lines
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("gui_handler_seconds", "Handler time", buckets=(0.01, 0.1))
+    for value in (0.005, 0.01, 0.05, 2.0):
+        latency.observe(value)
+    assert registry.render().splitlines()[2:] == [
+        'gui_handler_seconds_bucket{le="0.01"} 2.0',
+        'gui_handler_seconds_bucket{le="0.1"} 3.0',
+        'gui_handler_seconds_bucket{le="+Inf"} 4.0',
+        "gui_handler_seconds_sum 2.065",
+        "gui_handler_seconds_count 4.0",
+    ]
+
+
+def test_duplicate_name_is_rejected():
+    registry = MetricsRegistry()
+    registry.counter("gui_clicks_total", "Clicks")
+    with pytest.raises(ValueError):
+        registry.gauge("gui_clicks_total", "Clicks")
+
+
+def test_render_filters_by_prefix():
+    registry = MetricsRegistry()
+    registry.counter("gui_clicks_total", "Clicks")
+    registry.counter("recognizer_frames_total", "Frames")
+    text = registry.render("gui_")
+    assert "gui_clicks_total 0.0" in text
+    assert "recognizer" not in text
+
+
+def test_write_textfile(tmp_path):
+    registry = MetricsRegistry()
+    registry.gauge("gui_screens", "Screens").set(4)
+    path = tmp_path / "gui.prom"
+    registry.write_textfile(str(path))
+    assert path.read_text() == registry.render()
+    assert not (tmp_path / "gui.prom.tmp").exists()
+
+
+def test_exporter_serves_metrics(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("gui_clicks_total", "Clicks").inc()
+    registry.counter("recognizer_frames_total", "Frames")
+    textfile = tmp_path / "gui.prom"
+    exporter = MetricsExporter(registry, port=0, textfile=str(textfile), interval=60, prefix="gui_").start()
+    try:
+        host, port = exporter.server.server_address
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            body = response.read().decode("utf-8")
+    finally:
+        exporter.stop()
+    assert body == registry.render("gui_")
+    assert textfile.read_text() == body  # Final snapshot written on stop()
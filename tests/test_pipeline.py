@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+
+import pipeline
+from pipeline import CapturePipeline, LatestFrameBuffer
+
+
+class FakeSource:
+    """Frame source yielding the integers 0..count-1, like cv2.VideoCapture."""
+    def __init__(self, count):
+        self.count = count
+        self.next = 0
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.next >= self.count:
+            return False, None
+        self.next += 1
+        return True, self.next - 1
+
+
+def test_buffer_returns_newest_and_counts_dropped():
+    buffer = LatestFrameBuffer(capacity=2)
+    for item in range(4):
+        buffer.put(item)
+    assert buffer.get(timeout=0) == 3
+    assert buffer.dropped == 3  # Two overwritten by put(), one discarded by get()
+    assert buffer.get(timeout=0) is None
+
+
+def test_buffer_close_wakes_waiting_reader():
+    buffer = LatestFrameBuffer()
+    results = []
+    reader = threading.Thread(target=lambda: results.append(buffer.get()))
+    reader.start()
+    buffer.close()
+    reader.join(timeout=1)
+    assert not reader.is_alive()
+    assert results == [None]
+
+
+def test_buffer_drained_only_when_closed_and_empty():
+    buffer = LatestFrameBuffer()
+    buffer.put("frame")
+    assert not buffer.is_drained()
+    buffer.close()
+    assert not buffer.is_drained()
+    assert buffer.get() == "frame"
+    assert buffer.is_drained()
+
+
+def test_pipeline_renders_until_source_ends():
+    rendered = []
+    run = CapturePipeline(FakeSource(20), lambda frame: frame * 10, lambda item: rendered.append(item) or True)
+    run.run()
+    counters = run.counters()
+    assert counters["captured"] == 20
+    assert rendered == sorted(rendered) and rendered[-1] == 190  # In order, newest frame last
+    assert counters["rendered"] == len(rendered) == len(run.latencies)
+    assert counters["captured"] == counters["processed"] + counters["dropped_before_inference"]
+    assert counters["processed"] == counters["rendered"] + counters["dropped_before_render"]
+
+
+def test_pipeline_stops_when_render_returns_false():
+    run = CapturePipeline(FakeSource(10 ** 6), lambda frame: frame, lambda item: False)
+    run.run()
+    assert run.rendered == 1
+    assert run.captured < 10 ** 6
+
+
+def test_pipeline_reraises_inference_error():
+    def infer(frame):
+        if frame >= 3:  # Frame 3 itself may be dropped before inference
+            raise ValueError("bad frame")
+        return frame
+
+    run = CapturePipeline(FakeSource(10 ** 6), infer, lambda item: True)
+    with pytest.raises(ValueError, match="bad frame"):
+        run.run()
+    assert run.processed <= 3  # Only frames 0-2 finish inference
+
+
+def test_pipeline_keeps_bounded_latencies(monkeypatch):
+    monkeypatch.setattr(pipeline, "LATENCY_SAMPLES", 5)
+    run = CapturePipeline(FakeSource(50), lambda frame: frame, lambda item: True)
+    assert run.latencies.maxlen == 5
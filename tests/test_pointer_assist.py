@@ -0,0 +1,85 @@
+from hover_index import HoverIndex
+from pointer_assist import DwellClicker, TargetSnapper, box_distance
+
+A = (0, 0, 100, 50, "A")
+B = (110, 0, 210, 50, "B")
+
+
+def make_snapper(radius=24, margin=8):
+    index = HoverIndex()
+    index.rebuild([A, B])
+    return TargetSnapper(index, radius, margin)
+
+
+def test_box_distance():
+    assert box_distance(A, 50, 25) == 0
+    assert box_distance(A, 103, 54) == 5
+
+
+def test_snaps_to_centre_within_radius():
+    snapper = make_snapper()
+    assert snapper.update(90, 40) == ("A", 50, 25)
+    assert snapper.update(50, 70) == ("A", 50, 25)  # 20 px below A
+    assert snapper.update(50, 80) == (None, 50, 80)  # Out of range: raw position
+
+
+def test_stays_on_target_without_lookups():
+    snapper = make_snapper()
+    snapper.update(50, 25)
+    lookups = snapper.lookups
+    for x in range(10, 90, 5):
+        assert snapper.update(x, 25)[0] == "A"
+    assert snapper.lookups == lookups
+
+
+def test_hysteresis_between_neighbours():
+    snapper = make_snapper()
+    snapper.update(50, 25)
+    assert snapper.update(105, 25)[0] == "A"  # Gap, equally close to both
+    assert snapper.update(108, 25)[0] == "A"  # B is closer, but not by the margin
+    assert snapper.update(112, 25)[0] == "B"  # Inside B
+    assert snapper.update(105, 25)[0] == "B"  # Back in the gap: B is kept
+
+
+def test_reset_drops_target():
+    snapper = make_snapper()
+    snapper.update(108, 25)
+    snapper.reset()
+    assert snapper.update(108, 25)[0] == "B"  # Nearest again, no hysteresis towards A
+
+
+def test_dwell_progress_and_click():
+    dwell = DwellClicker(dwell_time=0.5)
+    assert dwell.update(0.0, "A", 50, 25) == (0.0, False)
+    assert dwell.update(0.25, "A", 50, 25) == (0.5, False)
+    assert dwell.update(0.5, "A", 50, 25) == (1.0, True)
+    assert dwell.selections == 1
+
+
+def test_changing_target_restarts_dwell():
+    dwell = DwellClicker(dwell_time=0.5)
+    dwell.update(0.0, "A", 50, 25)
+    dwell.update(0.4, "B", 150, 25)
+    assert dwell.update(0.8, "B", 150, 25) == (0.8, False)
+
+
+def test_no_repeat_click_until_the_cursor_moves_away():
+    dwell = DwellClicker(dwell_time=0.5, rearm_distance=30)
+    dwell.update(0.0, "A", 50, 25)
+    assert dwell.update(0.5, "A", 50, 25)[1]
+    assert dwell.update(2.0, "A", 55, 25) == (0.0, False)
+    # The click swapped the screen: a new target under the resting cursor is not clicked either
+    assert dwell.update(3.0, "C", 55, 30) == (0.0, False)
+    # Moving away re-arms; the dwell starts from there
+    assert dwell.update(4.0, "C", 90, 25) == (0.0, False)
+    assert dwell.update(4.5, "C", 90, 25) == (1.0, True)
+    assert dwell.selections == 2
+
+
+def test_losing_the_cursor_rearms():
+    dwell = DwellClicker(dwell_time=0.5)
+    dwell.update(0.0, "A", 50, 25)
+    dwell.update(0.5, "A", 50, 25)
+    assert dwell.update(0.6, None) == (0.0, False)
+    dwell.update(0.7, "A", 50, 25)
+    assert dwell.update(1.2, "A", 50, 25) == (1.0, True)
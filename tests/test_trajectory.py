@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+
+from trajectory import MotionRecognizer, TrajectoryBuffer, dtw_distances, make_templates, resample
+
+RATE = 30
+
+
+def run(recognizer, path, t=0.0, rest=10):
+    """Feed a path of (x, y) positions at camera rate, resting at both ends; return the motions."""
+    samples = [path[0]] * rest + list(path) + [path[-1]] * rest
+    motions = []
+    for i, (x, y) in enumerate(samples):
+        motion = recognizer.update(t + i / RATE, x, y)
+        if motion is not None:
+            motions.append(motion)
+    return motions
+
+
+def line(start, end, seconds):
+    steps = max(int(seconds * RATE), 2)
+    return [(start[0] + (end[0] - start[0]) * i / steps, start[1] + (end[1] - start[1]) * i / steps)
+            for i in range(steps + 1)]
+
+
+def circle(centre, radius, seconds, direction=1):
+    steps = int(seconds * RATE)
+    return [(centre[0] + radius * math.cos(direction * 2 * math.pi * i / steps),
+             centre[1] + radius * math.sin(direction * 2 * math.pi * i / steps)) for i in range(steps + 1)]
+
+
+def test_swipes():
+    for name, end in (("SWIPE LEFT", (0.3, 0.5)), ("SWIPE RIGHT", (0.9, 0.5)),
+                      ("SWIPE UP", (0.6, 0.2)), ("SWIPE DOWN", (0.6, 0.8))):
+        motions = run(MotionRecognizer(), line((0.6, 0.5), end, 0.3))
+        assert [m.name for m in motions] == [name]
+
+
+def test_fast_swipe_is_a_flick():
+    motions = run(MotionRecognizer(), line((0.4, 0.5), (1.0, 0.5), 0.1))
+    assert [m.name for m in motions] == ["FLICK RIGHT"]
+
+
+def test_circles():
+    # y grows downwards, so increasing angles go clockwise on screen
+    assert [m.name for m in run(MotionRecognizer(), circle((0.6, 0.5), 0.2, 0.8))] == ["CIRCLE CW"]
+    assert [m.name for m in run(MotionRecognizer(), circle((0.6, 0.5), 0.2, 0.8, -1))] == ["CIRCLE CCW"]
+
+
+def test_resting_hand_is_not_a_stroke():
+    recognizer = MotionRecognizer()
+    rng = np.random.default_rng(0)
+    path = [(0.5 + dx, 0.5 + dy) for dx, dy in rng.normal(0, 0.002, (90, 2))]
+    assert run(recognizer, path) == []
+    assert recognizer.strokes == 0
+
+
+def test_short_stroke_is_ignored():
+    assert run(MotionRecognizer(), line((0.5, 0.5), (0.6, 0.5), 0.05)) == []
+
+
+def test_cooldown_suppresses_the_return_stroke():
+    recognizer = MotionRecognizer(cooldown=1.0)
+    path = line((0.6, 0.5), (0.3, 0.5), 0.3) + line((0.3, 0.5), (0.6, 0.5), 0.3)
+    assert [m.name for m in run(recognizer, path, rest=2)] == ["SWIPE LEFT"]
+
+
+def test_buffer_accumulates_turning_and_length():
+    buffer = TrajectoryBuffer(capacity=128)
+    for i, (x, y) in enumerate(circle((0.5, 0.5), 0.2, 1.0)):
+        buffer.push(i / RATE, x, y)
+    assert abs(buffer.turning - 2 * math.pi) < 0.5
+    assert abs(buffer.path_length - 2 * math.pi * 0.2) < 0.02
+    assert len(buffer.stroke()) == buffer.stroke_samples()
+
+
+def test_dtw_matches_own_template_exactly():
+    names, templates, _ = make_templates()
+    scores = dtw_distances(resample(np.array(line((0, 0), (1, 0), 1.0))), templates)
+    assert names[int(scores.argmin())] == "SWIPE RIGHT"
+    assert scores.min() < 1e-6
@@ -0,0 +1,244 @@
+"""
+Dynamic gestures (swipes, flicks and circles) recognized from the hand's trajectory.
+
+TrajectoryBuffer keeps the latest positions and timestamps of one point of the hand in a
+fixed-size NumPy ring buffer and updates the smoothed velocity, the curvature and the turning
+and path length of the current stroke incrementally, in constant time per sample.
+
+MotionRecognizer splits the trajectory into strokes (the hand speeds up, then slows down or
+stops) and matches each finished stroke once against $1-style templates: the stroke is
+resampled to a fixed number of equidistant points, centred and scaled, and compared with
+dynamic time warping. Matching costs the same for every stroke and strokes last many frames,
+so recognition stays O(1) amortized per frame.
+"""
+import math
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+RESAMPLE_POINTS = 32
+
+# name is e.g. "SWIPE LEFT", "FLICK UP" or "CIRCLE CW"; duration in seconds; score is the mean DTW distance
+Motion = namedtuple("Motion", ["name", "duration", "score"])
+
+
+def resample(points, n=RESAMPLE_POINTS):
+    """
+    Resample a path to n points equally spaced along its length, then centre it on its centroid
+    and scale its larger side to 1 (uniformly, so straight strokes stay straight).
+    :param points: Array of shape (samples, 2).
+    :return: Array of shape (n, 2).
+    """
+    steps = np.hypot(*np.diff(points, axis=0).T)
+    distance = np.concatenate([[0.0], np.cumsum(steps)])
+    targets = np.linspace(0.0, distance[-1], n)
+    path = np.stack([np.interp(targets, distance, points[:, 0]), np.interp(targets, distance, points[:, 1])], axis=1)
+    path -= path.mean(axis=0)
+    extent = np.ptp(path, axis=0).max()
+    return path / extent if extent > 0 else path
+
+
+@lru_cache(maxsize=4)
+def _band_diagonals(n, band):
+    """(i, j) cell indices of every anti-diagonal of an n x n DTW matrix, restricted to the band."""
+    diagonals = []
+    for diagonal in range(2, 2 * n + 1):
+        i = np.arange(max(1, diagonal - n), min(n, diagonal - 1) + 1)
+        j = diagonal - i
+        keep = np.abs(i - j) <= band
+        if keep.any():
+            diagonals.append((i[keep], j[keep]))
+    return diagonals
+
+
+def dtw_distances(path, templates, band=6):
+    """
+    Dynamic time warping distance between a path and every template at once.
+    :param path: Array of shape (n, 2).
+    :param templates: Array of shape (templates, n, 2).
+    :param band: Sakoe-Chiba band: points further apart in index than this are never aligned.
+    :return: Array of shape (templates,) with the mean point distance along the best alignment.
+    """
+    n = len(path)
+    cost = np.linalg.norm(templates[:, :, None, :] - path[None, None, :, :], axis=-1)  # (templates, n, n)
+    acc = np.full((len(templates), n + 1, n + 1), np.inf)
+    acc[:, 0, 0] = 0.0
+    # Cells on one anti-diagonal only depend on the two previous ones, so each diagonal is one vector step
+    for i, j in _band_diagonals(n, band):
+        best = np.minimum(np.minimum(acc[:, i - 1, j], acc[:, i - 1, j - 1]), acc[:, i, j - 1])
+        acc[:, i, j] = cost[:, i - 1, j - 1] + best
+    return acc[:, n, n] / n
+
+
+def make_templates(n=RESAMPLE_POINTS):
+    """
+    Build the stroke templates in image coordinates (y grows downwards).
+    :return: Tuple (names, array of shape (templates, n, 2), closed flags).
+    """
+    names, paths, closed = [], [], []
+    steps = np.linspace(0.0, 1.0, n)
+    for name, (dx, dy) in (("LEFT", (-1, 0)), ("RIGHT", (1, 0)), ("UP", (0, -1)), ("DOWN", (0, 1))):
+        names.append("SWIPE " + name)
+        paths.append(resample(np.stack([steps * dx, steps * dy], axis=1), n))
+        closed.append(False)
+    angles = np.linspace(0.0, 2 * math.pi, n)
+    for name, direction in (("CW", 1), ("CCW", -1)):  # Clockwise on screen, as y points down
+        for start in np.arange(8) * math.pi / 4:  # A circle may start anywhere on its perimeter
+            theta = start + direction * angles
+            names.append("CIRCLE " + name)
+            paths.append(resample(np.stack([np.cos(theta), np.sin(theta)], axis=1), n))
+            closed.append(True)
+    return names, np.array(paths), np.array(closed)
+
+
+class TrajectoryBuffer:
+    """
+    Fixed-size ring buffer of (t, x, y) samples with incrementally updated motion features.
+
+    Args:
+        capacity (int): Samples kept.
+        smoothing (float): Weight of the newest finite-difference velocity in the moving average.
+        min_step (float): Shorter steps do not update the heading, so jitter of a resting hand
+            does not add up to turning.
+    """
+    def __init__(self, capacity=64, smoothing=0.5, min_step=0.01):
+        self.capacity = capacity
+        self.smoothing = smoothing
+        self.min_step = min_step
+        self.samples = np.zeros((capacity, 3))
+        self.count = 0  # Samples pushed so far; the newest is at (count - 1) % capacity
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.velocity = (0.0, 0.0)
+        self.speed = 0.0
+        self.heading = None
+        self.curvature = 0.0  # Turning per unit of path length at the newest sample
+        self.reset_stroke()
+
+    def reset_stroke(self, lead=0):
+        """
+        Start accumulating the turning and path length of a new stroke.
+        :param lead: Samples before the newest one that belong to the stroke (the smoothed speed
+            crosses the start threshold a few samples after the movement began).
+        """
+        self.stroke_start = max(self.count - 1 - lead, 0)
+        self.turning = 0.0  # Signed sum of heading changes, in radians
+        self.path_length = 0.0
+        self.peak_speed = self.speed
+
+    def push(self, t, x, y):
+        """Add a sample and update the motion features in constant time."""
+        if self.count:
+            last_t, last_x, last_y = self.samples[(self.count - 1) % self.capacity]
+            dt = t - last_t
+            if dt <= 0:
+                return
+            dx, dy = x - last_x, y - last_y
+            a = self.smoothing
+            self.velocity = (a * dx / dt + (1 - a) * self.velocity[0], a * dy / dt + (1 - a) * self.velocity[1])
+            self.speed = math.hypot(*self.velocity)
+            self.peak_speed = max(self.peak_speed, self.speed)
+            step = math.hypot(dx, dy)
+            self.path_length += step
+            if step >= self.min_step:
+                heading = math.atan2(dy, dx)
+                if self.heading is not None:
+                    turn = (heading - self.heading + math.pi) % (2 * math.pi) - math.pi
+                    self.turning += turn
+                    self.curvature = turn / step
+                self.heading = heading
+        self.samples[self.count % self.capacity] = (t, x, y)
+        self.count += 1
+
+    def stroke(self):
+        """Return the samples of the current stroke, oldest first (at most `capacity` of them)."""
+        first = max(self.stroke_start, self.count - self.capacity)
+        return self.samples[np.arange(first, self.count) % self.capacity]
+
+    def stroke_samples(self):
+        return self.count - self.stroke_start
+
+
+class MotionRecognizer:
+    """
+    Segment a trajectory into strokes and recognize each finished stroke.
+
+    Positions are in frame heights (x scaled by the aspect ratio), so thresholds do not depend
+    on the camera resolution.
+
+    Args:
+        start_speed (float): Speed (frame heights per second) that starts a stroke.
+        stop_speed (float): Speed below which a stroke ends.
+        min_length (float): Shortest stroke path (frame heights) that is matched at all.
+        max_score (float): Largest mean DTW distance accepted as a match.
+        flick_speed (float): Swipes whose smoothed speed peaks above this are reported as flicks.
+        cooldown (float): Seconds after a recognized stroke during which no new stroke starts.
+        capacity (int): Samples kept by the TrajectoryBuffer; longer strokes are ended early.
+    """
+    def __init__(self, start_speed=0.8, stop_speed=0.4, min_length=0.25, max_score=0.2, flick_speed=2.5,
+                 cooldown=0.3, capacity=64):
+        self.start_speed = start_speed
+        self.stop_speed = stop_speed
+        self.min_length = min_length
+        self.max_score = max_score
+        self.flick_speed = flick_speed
+        self.cooldown = cooldown
+        self.buffer = TrajectoryBuffer(capacity)
+        self.names, self.templates, self.closed = make_templates()
+        self.in_stroke = False
+        self.quiet_until = 0.0
+        self.strokes = 0  # Strokes matched against the templates
+        self.recognized = 0
+
+    def reset(self):
+        """Forget the trajectory, e.g. when the hand is lost or another hand takes over."""
+        self.buffer.clear()
+        self.in_stroke = False
+
+    def update(self, t, x, y):
+        """
+        Feed one position.
+        :return: Motion when this sample finished a recognized stroke, otherwise None.
+        """
+        buffer = self.buffer
+        buffer.push(t, x, y)
+        if not self.in_stroke:
+            if buffer.speed >= self.start_speed and t >= self.quiet_until:
+                self.in_stroke = True
+                buffer.reset_stroke(lead=2)
+            return None
+        if buffer.speed > self.stop_speed and buffer.stroke_samples() < buffer.capacity:
+            return None
+        self.in_stroke = False
+        motion = self.match(buffer.stroke(), buffer.turning, buffer.peak_speed)
+        if motion is not None:
+            self.quiet_until = t + self.cooldown
+        return motion
+
+    def match(self, stroke, turning, peak_speed=0.0):
+        """
+        Match a finished stroke against the templates.
+        :param stroke: Array of (t, x, y) samples.
+        :param turning: Signed total heading change of the stroke; more than about one turn
+            means a circle, so only the circle templates are compared, otherwise only the swipes.
+        :param peak_speed: Highest smoothed speed of the stroke; tells flicks from swipes.
+        :return: Motion, or None when the stroke is too short or matches no template well enough.
+        """
+        points = stroke[:, 1:]
+        if len(stroke) < 3 or np.hypot(*np.diff(points, axis=0).T).sum() < self.min_length:
+            return None
+        self.strokes += 1
+        candidates = self.closed if abs(turning) > 1.5 * math.pi else ~self.closed
+        scores = dtw_distances(resample(points), self.templates[candidates])
+        best = int(scores.argmin())
+        if scores[best] > self.max_score:
+            return None
+        name = [name for name, keep in zip(self.names, candidates) if keep][best]
+        duration = float(stroke[-1, 0] - stroke[0, 0])
+        if name.startswith("SWIPE") and peak_speed >= self.flick_speed:
+            name = name.replace("SWIPE", "FLICK")
+        self.recognized += 1
+        return Motion(name, duration, float(scores[best]))
@@ -1,12 +1,40 @@
-from multiprocessing import Process, Queue
-import time  # Import time for debounce logic
+from multiprocessing import Array, Event, Process, Queue
+import logging
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
 import os
 import pyautogui
 from datetime import datetime
-from gestures import gesture_recognition  # Ensure gestures.py is in the same directory or adjust the import path
+from collections import deque
+from device_state import DeviceStore, LightState, ThermostatState, MediaState, ApplianceState
+from gesture_events import MOTION, PINCH_ZOOM, PRESS, RELEASE, ZOOM
+from icon_atlas import IconAtlas
+from icon_cache import IconCache, FAN_ICONS, LIGHT_COLORS, ROOM_ICONS
+from frame_governor import FrameGovernor
+from event_log import SAMPLED, configure_logging, shutdown_logging
+from metrics import REGISTRY, start_exporter
+from hand_channel import HandChannel, HandChannelReader
+from kinetic_scroll import KineticScroller
+from app_pointer import PointerBridge, invoke_at
+from hover_index import HoverIndex, collect_targets
+from pointer_assist import DwellClicker, TargetSnapper
+from gestures import gesture_recognition  # Cheap: the recognizer acquires the camera and model in its own process
+log = logging.getLogger("ui")
+
+GESTURE_EVENTS = REGISTRY.counter("gui_gesture_events_total", "Gesture events received by the GUI", labels=("kind",))
+HANDLER_SECONDS = REGISTRY.histogram("gui_gesture_handler_seconds", "Time spent handling one gesture event on the Tk thread")
+QUEUE_DEPTH = REGISTRY.gauge("gui_gesture_queue_depth", "Gesture events waiting in the queue from the recognizer")
+PENDING_GESTURES = REGISTRY.gauge("gui_pending_gestures", "Gesture events received but not yet handled by the Tk thread")
+HOVER_INDEX_REBUILDS = REGISTRY.counter("gui_hover_index_rebuilds_total", "Rebuilds of the hover index after layout changes")
+DWELL_CLICKS = REGISTRY.counter("gui_dwell_clicks_total", "Clicks made by resting the in-app pointer on a target")
+AFTER_LAG = REGISTRY.histogram("gui_after_lag_seconds", "How late Tk ran an after() callback (event loop responsiveness)")
+POINTER_SIZE = 24  # Side of the in-app pointer marker and its dwell progress ring, in pixels
+DWELL_TICK_MS = 30
+SNAP_CLASSES = ("Button", "Checkbutton", "Radiobutton")
+ROOMS = ["Bedroom", "Kids Room", "Living Room", "Office", "Kitchen", "Bathroom", "Dressing Room", "Garage"]
+
 class FeedbackPopUp:
     def __init__(self, parent, message, duration=2000):
         """
@@ -46,79 +74,354 @@ class FeedbackPopUp:
         self.popup.after(duration, self.popup.destroy)
 
 class SmartHouseGUI(tk.Tk):
-    def __init__(self):
+    def __init__(self, queue, warm_up_icons=True, use_atlas=True, window_bounds=None, hand_channel=None,
+                 input_backend="os", dwell_time=0.8, snap_radius=24):
+        """
+        Args:
+            queue: Queue receiving GestureEvent and ZoomEvent tuples from the recognizer process.
+            window_bounds: Shared multiprocessing.Array('i', 4) that receives the window's
+                (x1, y1, x2, y2) so the recognizer can keep the cursor inside the window.
+            hand_channel (str): Name of the hand_channel.HandChannel the recognizer publishes the
+                landmarks, cursor position and scroll velocity to (see read_hand_state()).
+            input_backend (str): "os" when the recognizer moves the OS pointer (clicks use pyautogui),
+                or "app" to draw an in-app pointer from the hand channel and hit-test and invoke
+                widgets directly (needs hand_channel).
+            dwell_time (float): With the "app" backend, seconds the pointer rests on a button before
+                it is clicked; None disables dwell-to-click.
+            snap_radius (int): With the "app" backend, the pointer snaps to the centre of buttons
+                within this many pixels of the cursor (0 disables snapping).
+            warm_up_icons (bool): Pre-load every icon once the first screen is shown.
+            use_atlas (bool): Read icons from icons/icons.atlas when it has been built.
+        """
         super().__init__()
         self.queue = queue
+        self.closing = False  # Set by on_close(); background threads stop notifying the Tk thread
+        self.window_bounds = window_bounds
+        self.hand_channel = HandChannelReader(hand_channel) if hand_channel else None
         # Base path to the 'icons' folder
         self.icons_folder = os.path.join(os.path.dirname(__file__), "icons")
+        atlas = IconAtlas.open_default(self.icons_folder) if use_atlas else None
+        self.icons = IconCache(self.icons_folder, atlas=atlas)  # Resized icons shared by all screens
         self.title("Smart House Home Page")
         self.geometry("1200x800")
         self.configure(bg="#f0f0f0")
+        # Keep the recognizer's cursor within the window. A root binding also fires for <Configure> of
+        # every child widget, so the handler filters on event.widget; add="+" keeps the other handlers.
+        self.bind("<Configure>", self.publish_window_bounds, add="+")
         self.last_page = None 
-        self.last_gesture = None  # Store the last gesture processed
-        self.last_gesture_time = 0  # Timestamp of the last gesture
+        self.active_gesture = None  # Gesture currently held by the user
         self.hovered_component = None  # Track the currently hovered component
+        self.zoom_base = None  # Value of the hovered slider when the pinch-zoom started
+        # Retained screens: built once, then shown and hidden on navigation
+        self.screens = {}
+        self.screen_callbacks = {}
+        self.current_screen = None
+        self.devices = DeviceStore()  # Device state of every room, independent of the widgets
+        self.widgets = {}  # Room name -> widgets of that room's control screen
+        self.room_canvases = {}
+        self.active_canvas = None  # Scrollable canvas of the visible screen
+        self.scroll_positions = {}  # (canvas, axis) -> unrounded view position of kinetic scrolling
+        self.hover_index = HoverIndex()  # Controls of the visible screen, for the in-app pointer
+        self.snap_index = HoverIndex()  # Buttons of the visible screen, which attract the in-app pointer
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
         # Initialize the welcome screen
         self.show_main_menu()
-        self.check_gestures()
-
-        # Lock mouse within the window
-        self.lock_mouse()
+        self.start_gesture_bridge()
+        self.bind("<<KineticScroll>>", self.apply_kinetic_scroll)
+        self.kinetic_scroll = KineticScroller(self.read_scroll_velocity, self.notify_kinetic_scroll).start()
+        self.pointer_bridge = None
+        self.gesture_cursor = None  # Cursor published by the recognizer, None while inactive
+        self.pointer_position = None  # Screen position of the in-app pointer (snapped to buttons)
+        self.pointer_widget = None  # Widget under the in-app pointer
+        self.snapper = TargetSnapper(self.snap_index, snap_radius) if snap_radius else None
+        self.dwell = DwellClicker(dwell_time) if dwell_time else None
+        self.dwell_timer = None
+        if input_backend == "app":
+            if self.hand_channel is None:
+                raise ValueError("The 'app' input backend reads the cursor from the hand channel")
+            size = POINTER_SIZE
+            self.pointer_marker = tk.Canvas(self, width=size, height=size, bg="#f0f0f0", highlightthickness=0)
+            self.pointer_marker.create_oval(size / 2 - 4, size / 2 - 4, size / 2 + 4, size / 2 + 4, fill="#ff5722",
+                                            outline="")
+            self.dwell_ring = self.pointer_marker.create_arc(2, 2, size - 2, size - 2, start=90, extent=0, style="arc",
+                                                             width=3, outline="#ff5722", state="hidden")
+            self.bind("<<GestureCursor>>", self.on_gesture_cursor)
+            # The toplevel sees <Configure>/<Destroy> of all its widgets: any of them moves the controls
+            self.bind("<Configure>", self.invalidate_hover_index, add="+")
+            self.bind("<Destroy>", self.invalidate_hover_index, add="+")
+            self.pointer_bridge = PointerBridge(self.hand_channel, self.notify_gesture_cursor).start()
+        if warm_up_icons:
+            self.after_idle(self.icons.warm_up)
+        self.measure_after_lag()
 
         # Ensure unlocking when the window is closed
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
-    def lock_mouse(self):
-        """Locks the mouse within the window bounds."""
-        self.update_idletasks()  # Ensure the window bounds are up-to-date
+    def publish_window_bounds(self, event):
+        """
+        Share the window bounds with the recognizer whenever the window is moved or resized.
+        The recognizer clamps the gesture cursor to them, so no periodic mouse polling is needed.
+        """
+        if event.widget is not self or self.window_bounds is None:
+            return
         x1 = self.winfo_rootx()
         y1 = self.winfo_rooty()
-        x2 = x1 + self.winfo_width()
-        y2 = y1 + self.winfo_height()
-
-        # Restrict the mouse within the bounds
-        current_mouse_x, current_mouse_y = pyautogui.position()
-        if current_mouse_x < x1:
-            current_mouse_x = x1
-        elif current_mouse_x > x2:
-            current_mouse_x = x2
-        if current_mouse_y < y1:
-            current_mouse_y = y1
-        elif current_mouse_y > y2:
-            current_mouse_y = y2
-
-        pyautogui.moveTo(current_mouse_x, current_mouse_y)
-        self.mouse_lock_id = self.after(50, self.lock_mouse)
+        self.window_bounds[:] = [x1, y1, x1 + self.winfo_width(), y1 + self.winfo_height()]
+
+    def measure_after_lag(self, interval_ms=1000, scheduled_at=None):
+        """Record how late Tk ran this after() callback, then schedule the next probe."""
+        now = time.perf_counter()
+        if scheduled_at is not None:
+            AFTER_LAG.observe(max(0.0, now - scheduled_at - interval_ms / 1000))
+        self.after(interval_ms, self.measure_after_lag, interval_ms, now)
 
     def on_close(self):
-        """Stops mouse lock and closes the application."""
-        if hasattr(self, 'mouse_lock_id'):
-            self.after_cancel(self.mouse_lock_id)
+        """Closes the application."""
+        self.closing = True
+        self.queue.put(None)  # Wake the gesture bridge so it can exit
+        self.kinetic_scroll.stop()
+        if self.pointer_bridge is not None:
+            self.pointer_bridge.stop()
+        if self.hand_channel is not None:
+            self.hand_channel.close()
+            self.hand_channel = None
         self.destroy()
 
-    def check_gestures(self):
-        """Poll for gestures from the queue and handle them."""
+    def read_hand_state(self):
+        """
+        Return the newest hand_channel.HandState (landmarks, handedness, confidence, gesture code
+        and cursor of every tracked hand), or None when there is no channel or no state yet.
+        """
+        if self.hand_channel is None:
+            return None
+        return self.hand_channel.read()
+
+    def notify_gesture_cursor(self):
+        """Wake the Tk thread to move the in-app pointer (runs on the pointer bridge thread)."""
         try:
-            while not self.queue.empty():
-                gesture = self.queue.get()
-                 # Ensure gesture_label exists before updating it
-                self.handle_gesture(gesture)
-        except Exception as e:
-            print(f"Error handling gestures: {e}")
-        self.after(100, self.check_gestures)  # Check for gestures every 100ms
+            self.event_generate("<<GestureCursor>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            pass  # The window has been destroyed
 
-    def handle_gesture(self, gesture):
-        current_time = time.time()  # Current time in seconds
+    def on_gesture_cursor(self, event):
+        self.move_app_pointer(self.pointer_bridge.take())
 
-        # Debounce logic: Process the gesture only if it's new or after cooldown
-        if gesture == self.last_gesture and (current_time - self.last_gesture_time) < 5:
-            print(f"Ignored duplicate gesture: {gesture}")
+    def move_app_pointer(self, cursor):
+        """
+        Move the in-app pointer, snapping it to a nearby button, and hover the widget under it.
+        :param cursor: (x, y) in screen pixels, or None to hide the pointer.
+        """
+        self.gesture_cursor = cursor
+        if cursor is None:
+            self.pointer_position = None
+            self.pointer_marker.place_forget()
+            self.set_pointer_widget(None)
+            self.update_dwell()
+            return
+        self.refresh_hover_index()
+        hit = self.hover_index.hit(*cursor)
+        if self.snapper is None or isinstance(hit, tk.Scale):
+            target, (x, y) = hit, cursor  # Sliders take the value under the raw position
+            if self.snapper is not None:
+                self.snapper.reset()
+        else:
+            target, x, y = self.snapper.update(*cursor)
+            if target is None:
+                target = hit
+        self.pointer_position = (x, y)
+        # Hit-testing goes through the index, so the marker may cover the hot spot
+        offset = POINTER_SIZE // 2
+        self.pointer_marker.place(x=round(x) - self.winfo_rootx() - offset, y=round(y) - self.winfo_rooty() - offset)
+        self.pointer_marker.lift()
+        self.set_pointer_widget(target)
+        self.update_dwell()
+
+    def invalidate_hover_index(self, event=None):
+        self.hover_index.invalidate()
+
+    def refresh_hover_index(self):
+        """Rebuild the hover and snapping indexes from the visible screen after a layout change."""
+        if not self.hover_index.stale:
             return
+        self.update_idletasks()  # Let pending geometry changes settle before measuring
+        targets = collect_targets(self.screens[self.current_screen])
+        self.hover_index.rebuild(targets)
+        self.snap_index.rebuild([box for box in targets if box[4].winfo_class() in SNAP_CLASSES])
+        if self.snapper is not None:
+            self.snapper.reset()
+        HOVER_INDEX_REBUILDS.inc()
+
+    def update_dwell(self):
+        """Advance dwell-to-click on the hovered button, draw its progress ring and click when it completes."""
+        if self.dwell is None:
+            return
+        if self.dwell_timer is not None:
+            self.after_cancel(self.dwell_timer)
+            self.dwell_timer = None
+        target = None if isinstance(self.pointer_widget, tk.Scale) else self.pointer_widget
+        x, y = self.gesture_cursor or (0, 0)
+        progress, clicked = self.dwell.update(time.perf_counter(), target, x, y)
+        if 0.0 < progress < 1.0:
+            self.pointer_marker.itemconfigure(self.dwell_ring, extent=-359.9 * progress, state="normal")
+            self.dwell_timer = self.after(DWELL_TICK_MS, self.on_dwell_timer)  # Progress while the pointer rests
+        else:
+            self.pointer_marker.itemconfigure(self.dwell_ring, state="hidden")
+        if clicked:
+            DWELL_CLICKS.inc()
+            self.click()
+
+    def on_dwell_timer(self):
+        self.dwell_timer = None
+        self.update_dwell()
 
-        self.last_gesture = gesture
-        self.last_gesture_time = current_time
+    def set_pointer_widget(self, widget):
+        """
+        Send <Leave> to the previously hovered widget and <Enter> to the new one (for the hover
+        colours), and make a hovered slider the target of thumbs up/down and pinch-zoom.
+        """
+        if widget is self.pointer_widget:
+            return
+        previous, self.pointer_widget = self.pointer_widget, widget
+        for target, sequence in ((previous, "<Leave>"), (widget, "<Enter>")):
+            if target is not None:
+                try:
+                    target.event_generate(sequence)
+                except tk.TclError:
+                    pass  # Destroyed since it was hovered
+        self.hovered_component = widget if isinstance(widget, tk.Scale) else None
+        # Blend the marker's corners into the hovered widget
+        try:
+            self.pointer_marker.config(bg=widget.cget("bg") if widget is not None else "#f0f0f0")
+        except tk.TclError:
+            pass  # Colour unknown on this platform (e.g. SystemButtonFace outside Windows)
+
+    def click(self):
+        """Click at the gesture cursor: invoke the widget under the in-app pointer, or click the OS pointer."""
+        if self.pointer_bridge is None:
+            pyautogui.click()  # Simulates a click
+        elif self.pointer_widget is None or not invoke_at(self.pointer_widget, *self.pointer_position):
+            log.debug("Nothing to click", extra={"cursor": self.pointer_position})
+            return
+        log.debug("Click Performed")
+
+    def read_scroll_velocity(self, max_age=0.2):
+        """
+        Return the scroll velocity the recognizer publishes while the peace sign is shown, or None
+        (runs on the kinetic scroller thread). States older than max_age seconds count as released.
+        """
+        channel = self.hand_channel
+        state = channel.read() if channel is not None else None
+        if state is None or time.time() - state.timestamp > max_age:
+            return None
+        return state.scroll
+
+    def notify_kinetic_scroll(self):
+        """Wake the Tk thread to apply the distance the kinetic scroller accumulated (scroller thread)."""
+        try:
+            self.event_generate("<<KineticScroll>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            pass  # The window has been destroyed
+
+    def apply_kinetic_scroll(self, event):
+        dx, dy = self.kinetic_scroll.take()
+        if self.active_canvas is not None:
+            self.scroll_canvas(self.active_canvas, dx, dy)
+            if self.gesture_cursor is not None:
+                # The content moved under the resting pointer
+                self.hover_index.invalidate()
+                self.move_app_pointer(self.gesture_cursor)
+
+    def scroll_canvas(self, canvas, dx, dy):
+        """
+        Scroll a canvas by dx, dy viewports with xview_moveto / yview_moveto. The unrounded position
+        is kept between calls, so slow scrolling advances by less than a pixel per tick.
+        """
+        for axis, delta, view, moveto, size in ((0, dx, canvas.xview, canvas.xview_moveto, canvas.winfo_width()),
+                                                (1, dy, canvas.yview, canvas.yview_moveto, canvas.winfo_height())):
+            if delta == 0.0:
+                continue
+            first, last = view()
+            span = last - first
+            if span >= 1.0:
+                continue  # Everything is visible
+            key = (str(canvas), axis)
+            position = self.scroll_positions.get(key)
+            if position is None or abs(position - first) > 1.5 * span / max(size, 1):
+                position = first  # Scrolled by other means (mouse wheel, scrollbar, new screen)
+            position = min(max(position + delta * span, 0.0), 1.0 - span)
+            moveto(position)
+            self.scroll_positions[key] = position
+
+    def start_gesture_bridge(self):
+        """
+        Deliver gestures from the recognizer process as they arrive instead of polling.
+
+        A daemon thread blocks on the queue and hands every gesture to the Tk thread
+        through the <<Gesture>> virtual event, so the GUI stays idle between gestures.
+        """
+        self.pending_gestures = deque()
+        self.bind("<<Gesture>>", self.on_gesture_event)
+        self.gesture_bridge = threading.Thread(target=self.gesture_bridge_loop, daemon=True)
+        self.gesture_bridge.start()
+
+    def gesture_bridge_loop(self):
+        """Block on the gesture queue and notify the Tk thread (runs on the bridge thread)."""
+        while True:
+            gesture = self.queue.get()
+            if gesture is None:
+                break
+            self.pending_gestures.append(gesture)
+            PENDING_GESTURES.set(len(self.pending_gestures))
+            try:
+                QUEUE_DEPTH.set(self.queue.qsize())
+            except NotImplementedError:  # multiprocessing.Queue.qsize() on macOS
+                pass
+            if not self.notify_gestures():
+                break  # The window has been destroyed
+
+    def notify_gestures(self, retry_interval=0.05):
+        """
+        Wake the Tk thread to handle the pending gestures (runs on the bridge thread).
+        Until mainloop() runs, Tkinter refuses events from other threads with a RuntimeError;
+        the gestures then stay pending and the notification is retried.
+        :return: False once the window is closing or destroyed.
+        """
+        while not self.closing:
+            try:
+                self.event_generate("<<Gesture>>", when="tail")
+                return True
+            except RuntimeError:
+                time.sleep(retry_interval)  # Main loop not running (yet)
+            except tk.TclError:
+                return False
+        return False
+
+    def on_gesture_event(self, event):
+        """Handle every gesture event queued by the bridge thread."""
+        while self.pending_gestures:
+            gesture_event = self.pending_gestures.popleft()
+            GESTURE_EVENTS.labels(kind=gesture_event.kind).inc()
+            start = time.perf_counter()
+            try:
+                if gesture_event.kind == PRESS:
+                    self.active_gesture = gesture_event.gesture
+                    self.handle_gesture(gesture_event.gesture)
+                elif gesture_event.kind == ZOOM:
+                    self.handle_zoom(gesture_event.scale)
+                elif gesture_event.kind == MOTION:
+                    self.handle_motion(gesture_event.gesture)
+                elif gesture_event.kind == RELEASE and gesture_event.gesture == self.active_gesture:
+                    self.active_gesture = None  # Stops continuous value adjustment
+                    self.zoom_base = None
+            except Exception:
+                log.exception("Error handling gestures", extra={"gesture": gesture_event.gesture})
+            HANDLER_SECONDS.observe(time.perf_counter() - start)
+        PENDING_GESTURES.set(0)
+
+    def handle_gesture(self, gesture):
         """Handle specific gestures and map them to UI actions."""
-        
+
         # Check for hovered component for volume adjustment
         if gesture in ["THUMBS UP", "THUMBS DOWN"] and self.hovered_component:
             current_volume = self.hovered_component.get()
@@ -126,36 +429,62 @@ class SmartHouseGUI(tk.Tk):
             if gesture == "THUMBS UP":
                 new_volume = min(current_volume + 1, 100)  # Increase volume
                 self.hovered_component.set(new_volume)
-                print(f"Volume increased to {new_volume}")
+                log.debug("Volume increased", extra={"volume": new_volume})
             elif gesture == "THUMBS DOWN":
                 new_volume = max(current_volume - 1, 0)  # Decrease volume
                 self.hovered_component.set(new_volume)
-                print(f"Volume decreased to {new_volume}")
+                log.debug("Volume decreased", extra={"volume": new_volume})
             return  # Skip further gesture processing if volume adjustment is handled
                
         if gesture == "INDEX POINTING UP":
-            print("Controller Mode Activated")
+            log.debug("Controller Mode Activated")
         elif gesture == "PEACE SIGN":
-            print("Scroll Triggered")
-            self.scroll_page()# Add specific UI scroll logic here if needed
+            log.debug("Scroll Triggered")  # The kinetic scroller follows the hand while it is shown
         elif gesture == "THREE":
-            print("Opening Room List...")
+            log.debug("Opening Room List...")
             self.open_room_list()
         elif gesture == "ROCK'N ROLL!!!":
-            print("Navigating to the previous page...")
+            log.debug("Navigating to the previous page...")
             self.show_main_menu()
         elif gesture == "FOUR":
-            print("Performing Click...")
-            pyautogui.click()  # Simulates a click
-            print("Click Performed")
+            self.click()
         elif gesture == "SCROLL UP":
             self.scroll_page(direction="up")
-            print("Scrolled Up")
+            log.debug("Scrolled Up")
         elif gesture == "SCROLL DOWN":
             self.scroll_page(direction="down")
-            print("Scrolled Down")
+            log.debug("Scrolled Down")
+        elif gesture == PINCH_ZOOM:
+            self.zoom_base = self.hovered_component.get() if self.hovered_component else None
+            log.debug("Pinch-zoom started", extra={"value": self.zoom_base})
+        else:
+            log.debug("Unhandled gesture", extra={"gesture": gesture})
+
+    def handle_motion(self, motion):
+        """Handle a swipe, flick or circle of the hand (see trajectory.py)."""
+        if motion in ("SWIPE UP", "FLICK UP"):
+            self.scroll_page(direction="up")
+        elif motion in ("SWIPE DOWN", "FLICK DOWN"):
+            self.scroll_page(direction="down")
+        elif motion == "SWIPE LEFT":
+            log.debug("Navigating to the previous page...")
+            self.show_main_menu()
         else:
-            print(f"Unhandled gesture: {gesture}")
+            log.debug("Unhandled gesture", extra={"gesture": motion})
+
+    def handle_zoom(self, scale):
+        """
+        Set the hovered slider from a two-handed pinch-zoom: spreading the hands to twice their
+        starting distance moves it up by its whole range, bringing them together moves it down.
+        :param scale: Distance between the hands relative to the start of the zoom.
+        """
+        if self.hovered_component is None or self.zoom_base is None:
+            return
+        low = float(self.hovered_component.cget("from"))
+        high = float(self.hovered_component.cget("to"))
+        value = self.zoom_base + (scale - 1.0) * (high - low)
+        self.hovered_component.set(min(max(value, min(low, high)), max(low, high)))
+        log.debug("Zoomed", extra={"scale": round(scale, 2), "value": self.hovered_component.get()})
 
     def adjust_volume(self, up):
         """Adjust volume up or down based on the gesture."""
@@ -164,7 +493,7 @@ class SmartHouseGUI(tk.Tk):
             current_volume = volume_control.get()
             new_volume = min(current_volume + 1, 100) if up else max(current_volume -1, 0)
             volume_control.set(new_volume)
-            print(f"Volume {'Increased' if up else 'Decreased'} to {new_volume}")
+            log.debug("Volume %s", "increased" if up else "decreased", extra={"volume": new_volume})
 
     def apply_hover_effect(self, button, hover_bg="#d9d9d9", hover_fg="#ffffff", normal_bg="#ffffff", normal_fg="#000000"):
         """Apply hover effect to a button, ensuring it returns to its default colors."""
@@ -177,20 +506,50 @@ class SmartHouseGUI(tk.Tk):
         button.bind("<Enter>", on_enter)
         button.bind("<Leave>", on_leave)
 
-    def scroll_page(self, direction="up"):
-        """Scroll the page up or down."""
-        scroll_amount = 100 if direction == "up" else -100
-        pyautogui.scroll(scroll_amount)
-        print(f"Scrolled {direction} by {scroll_amount}")
+    def scroll_page(self, direction="up", pages=0.8):
+        """Fling the active canvas up or down; it coasts about `pages` viewports and stops."""
+        speed = pages * self.kinetic_scroll.friction  # Under friction f, a fling at v travels v / f
+        self.kinetic_scroll.fling(0.0, -speed if direction == "up" else speed)
+        log.debug("Scrolled %s", direction, extra={"pages": pages})
+
+    def show_screen(self, name, build, on_show=None):
+        """
+        Switch to a retained screen, building it the first time it is shown.
+
+        Args:
+            name (str): Unique screen name.
+            build: Callable taking the screen frame and populating it with widgets.
+            on_show: Optional callable run every time the screen is shown (e.g. to rebind
+                the mouse wheel to the screen's canvas).
+        """
+        if name == self.current_screen:
+            return
+
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = tk.Frame(self, bg="#f0f0f0")
+            build(screen)
+            self.screens[name] = screen
+            if on_show:
+                self.screen_callbacks[name] = on_show
+
+        if self.current_screen is not None:
+            self.screens[self.current_screen].grid_remove()
+        screen.grid(row=0, column=0, sticky="nsew")
+        self.current_screen = name
+        self.active_canvas = None
+        self.hover_index.invalidate()
+        if name in self.screen_callbacks:
+            self.screen_callbacks[name]()
 
     def show_main_menu(self):
         """Display the main menu with a welcome message and a 'Menu' button."""
-        # Clear the existing window
-        for widget in self.winfo_children():
-            widget.destroy()
-            
+        self.show_screen("main menu", self.build_main_menu)
+
+    def build_main_menu(self, screen):
+        """Build the main menu screen."""
         # Create a canvas to draw the white rectangle and add the text and image
-        canvas = tk.Canvas(self, bg="#f0f0f0", width=700, height=200, highlightthickness=0)
+        canvas = tk.Canvas(screen, bg="#f0f0f0", width=700, height=200, highlightthickness=0)
         canvas.pack(pady=20)
 
         # Adjust the rectangle dimensions to fit the icon and text
@@ -198,15 +557,13 @@ class SmartHouseGUI(tk.Tk):
         canvas.create_rectangle(rect_x1, rect_y1, rect_x2, rect_y2, fill="white", outline="white")
 
         # Load the house icon
-        house_icon_path = os.path.join(self.icons_folder, "house_icon.jpg")
         try:
-            house_image = Image.open(house_icon_path).resize((150, 150), Image.LANCZOS)  # Adjust icon height for alignment
-            house_icon = ImageTk.PhotoImage(house_image)
+            house_icon = self.icons.get("house_icon.jpg", (150, 150))  # Adjust icon height for alignment
             # Align icon to the left of the text
             canvas.create_image(rect_x1 + 60, (rect_y1 + rect_y2) // 2, image=house_icon, anchor="center")
             canvas.house_icon = house_icon  # Keep a reference to avoid garbage collection
         except Exception as e:
-            print(f"Error loading house icon: {e}")
+            log.warning("Error loading house icon: %s", e)
 
         # Add the "Welcome" text
         canvas.create_text(
@@ -221,19 +578,17 @@ class SmartHouseGUI(tk.Tk):
         )
 
         # Time and Temperature Frame
-        info_frame = tk.Frame(self, bg="#f0f0f0")
+        info_frame = tk.Frame(screen, bg="#f0f0f0")
         info_frame.pack(pady=20)
 
         # Clock Icon and Time
-        clock_icon_path = os.path.join(self.icons_folder, "clock_icon.png")
         try:
-            clock_image = Image.open(clock_icon_path).resize((50, 50), Image.LANCZOS)
-            clock_icon = ImageTk.PhotoImage(clock_image)
+            clock_icon = self.icons.get("clock_icon.png", (50, 50))
             clock_label = tk.Label(info_frame, image=clock_icon, bg="#f0f0f0")
             clock_label.image = clock_icon
             clock_label.pack(side=tk.LEFT, padx=10)
         except Exception as e:
-            print(f"Error loading clock icon: {e}")
+            log.warning("Error loading clock icon: %s", e)
 
         self.time_label = tk.Label(
             info_frame, text="", font=("Helvetica", 20), bg="#f0f0f0", fg="#333333"
@@ -242,15 +597,13 @@ class SmartHouseGUI(tk.Tk):
         self.update_time()
 
         # Temperature Icon and Value
-        temp_icon_path = os.path.join(self.icons_folder, "temperature_icon.png")
         try:
-            temp_image = Image.open(temp_icon_path).resize((50, 50), Image.LANCZOS)
-            temp_icon = ImageTk.PhotoImage(temp_image)
+            temp_icon = self.icons.get("temperature_icon.png", (50, 50))
             temp_label = tk.Label(info_frame, image=temp_icon, bg="#f0f0f0")
             temp_label.image = temp_icon
             temp_label.pack(side=tk.LEFT, padx=10)
         except Exception as e:
-            print(f"Error loading temperature icon: {e}")
+            log.warning("Error loading temperature icon: %s", e)
 
         temperature_label = tk.Label(
             info_frame, text="22.5°C", font=("Helvetica", 20), bg="#f0f0f0", fg="#333333"
@@ -259,7 +612,7 @@ class SmartHouseGUI(tk.Tk):
 
         # Menu Button
         menu_button = tk.Button(
-            self, text="Rooms", font=("Helvetica", 30, "bold"),
+            screen, text="Rooms", font=("Helvetica", 30, "bold"),
             bg="#5c3a92", fg="#ffffff", width=15, height=3,
             command=self.open_room_list
         )
@@ -275,12 +628,12 @@ class SmartHouseGUI(tk.Tk):
 
     def open_room_list(self):
         """Display the room list view with horizontal scrolling."""
-        # Clear the existing window
-        for widget in self.winfo_children():
-            widget.destroy()
-        
+        self.show_screen("room list", self.build_room_list, self.bind_room_list_scrolling)
+
+    def build_room_list(self, screen):
+        """Build the room list screen."""
         # Create a header frame for the Go Back button and title
-        header_frame = tk.Frame(self, bg="#5c3a92")  # Purple background
+        header_frame = tk.Frame(screen, bg="#5c3a92")  # Purple background
         header_frame.pack(fill=tk.X, pady=10)
 
         # Go Back Button with left arrow symbol
@@ -300,7 +653,7 @@ class SmartHouseGUI(tk.Tk):
         title_label.pack(side=tk.LEFT, padx=10)
 
         # Create a scrollable canvas for the room list
-        container = tk.Frame(self, bg="#5c3a92")
+        container = tk.Frame(screen, bg="#5c3a92")
         container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         # Canvas for horizontal scrolling
@@ -327,20 +680,16 @@ class SmartHouseGUI(tk.Tk):
             lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
         )
 
-        # Bind mouse wheel to scroll horizontally
+        self.room_list_canvas = canvas
+
+    def bind_room_list_scrolling(self):
+        """Bind the mouse wheel to scroll the room list horizontally."""
+        canvas = self.room_list_canvas
+        self.active_canvas = canvas
         canvas.bind_all("<Shift-MouseWheel>", lambda e: canvas.xview_scroll(-1 * (e.delta // 120), "units"))
 
     def add_room_widgets(self, parent):
-        rooms = [
-            ("Bedroom", "bedroom_icon.png"),
-            ("Kids Room", "kidsroom_icon.png"),
-            ("Living Room", "livingroom_icon.png"),
-            ("Office", "office_icon.png"),
-            ("Kitchen", "kitchen_icon.png"),
-            ("Bathroom", "bathroom_icon.png"),
-            ("Dressing Room", "dressingroom_icon.png"),
-            ("Garage", "garage_icon.png")
-        ]
+        rooms = list(zip(ROOMS, ROOM_ICONS))
 
         # Set layout as 2 rows and 4 columns
         columns = 4
@@ -349,11 +698,9 @@ class SmartHouseGUI(tk.Tk):
             col = i % columns
 
             try:
-                icon_path = os.path.join(self.icons_folder, icon_file)
-                room_image = Image.open(icon_path).resize((250, 250), Image.LANCZOS)
-                room_icon = ImageTk.PhotoImage(room_image)
+                room_icon = self.icons.get(icon_file, (250, 250))
             except Exception as e:
-                print(f"Error loading icon for {room_name}: {e}")
+                log.warning("Error loading icon for %s: %s", room_name, e)
                 room_icon = None
 
             btn = tk.Button(
@@ -367,12 +714,17 @@ class SmartHouseGUI(tk.Tk):
 
     def on_room_click(self, room_name):
         """Handle room button clicks and display room controls in the main window."""
-        # Clear the existing window content
-        for widget in self.winfo_children():
-            widget.destroy()
+        name = f"room:{room_name}"
+        self.show_screen(
+            name,
+            lambda screen: self.build_room_controls(screen, name, room_name),
+            lambda: self.bind_room_scrolling(name),
+        )
 
+    def build_room_controls(self, screen, name, room_name):
+        """Build the control screen of one room; its widgets subscribe to the room's devices."""
         # Header for navigation
-        header_frame = tk.Frame(self, bg="#5c3a92")
+        header_frame = tk.Frame(screen, bg="#5c3a92")
         header_frame.pack(fill=tk.X, pady=10)
 
         # Back button
@@ -392,7 +744,7 @@ class SmartHouseGUI(tk.Tk):
         title_label.pack(side=tk.LEFT, padx=10)
 
         # Scrollable content area for room controls
-        content_frame = tk.Frame(self, bg="#f0f0f0")
+        content_frame = tk.Frame(screen, bg="#f0f0f0")
         content_frame.pack(fill=tk.BOTH, expand=True)
 
         canvas = tk.Canvas(content_frame, bg="#f0f0f0")
@@ -404,11 +756,6 @@ class SmartHouseGUI(tk.Tk):
             lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
         )
 
-        # Bind mouse wheel to scroll vertically
-        canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(-1 * (e.delta // 120), "units"))
-        canvas.bind_all("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))  # Linux scroll up
-        canvas.bind_all("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))   # Linux scroll down
-
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
 
@@ -416,47 +763,57 @@ class SmartHouseGUI(tk.Tk):
         scrollbar.pack(side="right", fill="y")
 
         # Add common controls for the room
-        self.add_thermostat_controls(scrollable_frame)
-        self.add_lights_controls(scrollable_frame)
+        self.add_thermostat_controls(scrollable_frame, room_name)
+        self.add_lights_controls(scrollable_frame, room_name)
 
         # Add specific controls for each room
         if room_name == "Living Room":
-            self.add_tv_controls(scrollable_frame)
-            self.add_music_controls(scrollable_frame)
+            self.add_tv_controls(scrollable_frame, room_name)
+            self.add_music_controls(scrollable_frame, room_name)
         elif room_name == "Kitchen":
-            self.add_appliance_controls(scrollable_frame, "Air Fryer", ["On/Off"])
-            self.add_appliance_controls(scrollable_frame, "Coffee Machine", ["On/Off"])
+            self.add_appliance_controls(scrollable_frame, "Air Fryer", ["On/Off"], room_name)
+            self.add_appliance_controls(scrollable_frame, "Coffee Machine", ["On/Off"], room_name)
         elif room_name == "Bedroom":
-            self.add_appliance_controls(scrollable_frame, "Curtains", ["On/Off"])
+            self.add_appliance_controls(scrollable_frame, "Curtains", ["On/Off"], room_name)
         elif room_name == "Garage":
-            self.add_appliance_controls(scrollable_frame , "Garage Door", ["On/Off"])
+            self.add_appliance_controls(scrollable_frame , "Garage Door", ["On/Off"], room_name)
         # Add other room-specific controls similarly
 
-    def add_lights_controls(self, window):
+        self.room_canvases[name] = canvas
+
+    def bind_room_scrolling(self, name):
+        """Bind the mouse wheel to scroll a room screen vertically."""
+        canvas = self.room_canvases[name]
+        self.active_canvas = canvas
+        canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(-1 * (e.delta // 120), "units"))
+        canvas.bind_all("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))  # Linux scroll up
+        canvas.bind_all("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))   # Linux scroll down
+
+    def room_widgets(self, room):
+        """Return the dictionary holding the widgets of a room's control screen."""
+        return self.widgets.setdefault(room, {})
+
+    def add_lights_controls(self, window, room):
         """Add light controls with power button, light bulb icon, color buttons, and brightness slider."""
         frame = tk.LabelFrame(window, text="Lights", font=("Helvetica", 16), bg="#f0f0f0", fg="#000000")
         frame.pack(pady=10, fill="x")
 
         # Initial state of the light
-        self.light_on = False
-        self.current_color = "white"
-        self.brightness = 0  # Default brightness at 0 when off
+        self.devices.add(room, "lights", LightState())
 
         # Load icons
         try:
-            power_icon_path = os.path.join(self.icons_folder, "power_icon.png")
-            lights_off_icon_path = os.path.join(self.icons_folder, "lights_off_icon.png")
-            self.power_icon = ImageTk.PhotoImage(Image.open(power_icon_path).resize((50, 50), Image.LANCZOS))
-            self.lights_off_icon = ImageTk.PhotoImage(Image.open(lights_off_icon_path).resize((300, 300), Image.LANCZOS))
+            self.power_icon = self.icons.get("power_icon.png", (50, 50))
+            self.lights_off_icon = self.icons.get("lights_off_icon.png", (300, 300))
             self.lights_on_icons = {
-                color: ImageTk.PhotoImage(Image.open(os.path.join(self.icons_folder, f"lights_on_{color}_icon.png")).resize((300, 300), Image.LANCZOS))
-                for color in ["white", "red", "orange", "yellow", "green", "blue", "purple", "pink"]
+                color: self.icons.get(f"lights_on_{color}_icon.png", (300, 300))
+                for color in LIGHT_COLORS
             }
         except Exception as e:
-            print(f"Error loading icons: {e}")
+            log.warning("Error loading icons: %s", e)
             return
 
-        self.lights_on_icon = self.lights_on_icons["white"]  # Default icon
+        widgets = self.room_widgets(room)
 
         # Create a container frame for the layout
         layout_frame = tk.Frame(frame, bg="#f0f0f0")
@@ -467,20 +824,17 @@ class SmartHouseGUI(tk.Tk):
         left_frame.grid(row=0, column=0, sticky="n")
 
         # Power button
-        self.power_button = tk.Button(
+        widgets["power_button"] = tk.Button(
             left_frame, image=self.power_icon, bg="green", borderwidth=0, width=80, height=80,
-            activebackground="gray", command=self.toggle_light
+            activebackground="gray", command=lambda: self.toggle_light(room)
         )
-        self.power_button.pack(pady=10)  # Add vertical spacing for alignment
-
-        # Apply hover effect to the power button
-        self.apply_hover_effect(self.power_button, hover_bg="lightgreen", normal_bg="green")
+        widgets["power_button"].pack(pady=10)  # Add vertical spacing for alignment
 
         # Color buttons (below the power button)
         for color, icon in self.lights_on_icons.items():
             color_button = tk.Button(
                 left_frame, bg=color, borderwidth=2, relief="raised", width=10, height=2,
-                command=lambda c=color: self.change_bulb_color(c)
+                command=lambda c=color: self.change_bulb_color(room, c)
             )
             color_button.pack(pady=5)
             # Apply hover effect to each color button
@@ -491,8 +845,8 @@ class SmartHouseGUI(tk.Tk):
         middle_frame = tk.Frame(layout_frame, bg="#f0f0f0")
         middle_frame.grid(row=0, column=1, padx=150)
 
-        self.light_bulb_label = tk.Label(middle_frame, image=self.lights_off_icon, bg="#f0f0f0")
-        self.light_bulb_label.pack()
+        widgets["light_bulb_label"] = tk.Label(middle_frame, image=self.lights_off_icon, bg="#f0f0f0")
+        widgets["light_bulb_label"].pack()
 
         # Right column (Brightness slider)
         right_frame = tk.Frame(layout_frame, bg="#f0f0f0")
@@ -500,16 +854,35 @@ class SmartHouseGUI(tk.Tk):
 
         tk.Label(right_frame, text="Brightness", font=("Helvetica", 12), bg="#f0f0f0", fg="#333333").pack(pady=10)
 
-        self.brightness_slider = tk.Scale(
+        brightness_slider = tk.Scale(
             right_frame, from_=100, to=0, orient=tk.VERTICAL, length=300, width=100,  # Vertical slider
             font=("Helvetica", 10), bg="#f0f0f0", fg="#333333", 
             highlightbackground="#f0f0f0", troughcolor="#D3D3D3", activebackground="#4CAF50",
-            command=self.change_brightness
+            command=lambda value: self.change_brightness(room, value)
         )
-        self.brightness_slider.set(0)  # Set initial brightness to 0 (off)
-        self.brightness_slider.pack()
-        self.brightness_slider.bind("<Enter>", lambda e: self.set_hovered_component(self.brightness_slider))
-        self.brightness_slider.bind("<Leave>", lambda e: self.clear_hovered_component())    
+        brightness_slider.pack()
+        brightness_slider.bind("<Enter>", lambda e: self.set_hovered_component(brightness_slider))
+        brightness_slider.bind("<Leave>", lambda e: self.clear_hovered_component())
+        widgets["brightness_slider"] = brightness_slider
+
+        # Show the stored state and follow its changes
+        self.render_lights(room, self.devices.get(room, "lights"), LightState.__slots__)
+        self.devices.subscribe(room, "lights", lambda state, changed: self.render_lights(room, state, changed))
+
+    def render_lights(self, room, state, changed):
+        """Update the light widgets of a room for the changed state fields."""
+        widgets = self.room_widgets(room)
+        if "on" in changed or "color" in changed:
+            bulb_icon = self.lights_on_icons[state.color] if state.on else self.lights_off_icon
+            widgets["light_bulb_label"].config(image=bulb_icon)
+        if "on" in changed:
+            # Red when on, green when off
+            widgets["power_button"].config(bg="red" if state.on else "green")
+            self.apply_hover_effect(widgets["power_button"],
+                                    hover_bg="darkred" if state.on else "lightgreen",
+                                    normal_bg="red" if state.on else "green")
+        if "brightness" in changed:
+            widgets["brightness_slider"].set(state.brightness)
 
     def apply_hover_effect(self, button, hover_bg, normal_bg, hover_fg=None, normal_fg=None):
         """Apply hover effect to a button."""
@@ -540,73 +913,62 @@ class SmartHouseGUI(tk.Tk):
         }
         return hover_colors.get(color, "#d9d9d9")  # Default to light gray if color not found
 
-    def toggle_light(self):
+    def toggle_light(self, room):
         """Toggle light state and update icons."""
-        if self.light_on:
-            # Turn off the light
-            self.light_bulb_label.config(image=self.lights_off_icon)
-            self.power_button.config(bg="green")  # Green when off
-            self.brightness_slider.set(0)  # Reset brightness to 0
-            print("Lights turned off")
+        if self.devices.get(room, "lights").on:
+            # Turn off the light and reset brightness to 0
+            self.devices.update(room, "lights", on=False, brightness=0)
+            log.info("Lights turned off", extra={"room": room})
             FeedbackPopUp(self, "Lights turned off", duration=2000)
 
         else:
-            # Turn on the light
-            self.light_bulb_label.config(image=self.lights_on_icons[self.current_color])
-            self.power_button.config(bg="red")  # Red when on
-            self.brightness_slider.set(50)  # Set brightness to 50% by default
-            print("Lights turned on with default brightness 50%")
+            # Turn on the light with brightness 50% by default
+            self.devices.update(room, "lights", on=True, brightness=50)
+            log.info("Lights turned on with default brightness 50%", extra={"room": room})
             FeedbackPopUp(self, "Lights turned on", duration=2000)
 
-        # Update the hover effect based on state
-        self.apply_hover_effect(self.power_button,
-                                hover_bg="darkred" if not self.light_on else "lightgreen",
-                                normal_bg="red" if not self.light_on else "green")
-        self.light_on = not self.light_on  # Toggle the state
-
-    def change_brightness(self, value):
+    def change_brightness(self, room, value):
         """Update the brightness based on the slider's position."""
-        if self.light_on:  # Check if the lights are on
-            self.brightness = int(value)
+        lights = self.devices.get(room, "lights")
+        if lights.on:  # Check if the lights are on
+            self.devices.update(room, "lights", brightness=int(value))
 
-        else:
+        elif int(value) != 0:
             # Reset the slider to 0 if lights are off
-            self.brightness_slider.set(0)
-            print("Brightness adjustment is disabled because lights are off.")
+            self.room_widgets(room)["brightness_slider"].set(0)
+            log.debug("Brightness adjustment is disabled because lights are off.", extra={"room": room})
             FeedbackPopUp(self, "Turn on the light before adjusting the brightness!", duration=2000)
 
-    def change_bulb_color(self, color):
+    def change_bulb_color(self, room, color):
         """Change the bulb's color when a color button is clicked."""
-        if self.light_on:
-            self.current_color = color
-            self.light_bulb_label.config(image=self.lights_on_icons[color])
+        if self.devices.get(room, "lights").on:
+            self.devices.update(room, "lights", color=color)
             # Show feedback pop-up
             FeedbackPopUp(self, f"Light color changed to {color.capitalize()}!", duration=2000)
         else:
             FeedbackPopUp(self, "Turn on the light before changing the color.", duration=2000)
 
-    def add_tv_controls(self, window):
+    def add_tv_controls(self, window, room):
         """Add TV controls."""
         frame = tk.LabelFrame(window, text="TV", font=("Helvetica", 16), bg="#f0f0f0", fg="#000000")
         frame.pack(pady=10, fill="x")
+        self.devices.add(room, "tv", MediaState())
+        widgets = self.room_widgets(room)
 
         # Left panel for TV image and On/Off button
         left_panel = tk.Frame(frame, bg="#f0f0f0")
         left_panel.pack(side=tk.LEFT, padx=10)
 
         try:
-            tv_icon_path = os.path.join(self.icons_folder, "tv_icon.png")
-            self.tv_icon = Image.open(tv_icon_path).resize((200, 150), Image.LANCZOS)  # Resize the image
-            self.tv_icon_photo = ImageTk.PhotoImage(self.tv_icon)  # Convert to PhotoImage
-            self.tv_label = tk.Label(left_panel, image=self.tv_icon_photo)  # Use the correct PhotoImage object
-            self.tv_label.pack(pady=10)
+            self.tv_icon_photo = self.icons.get("tv_icon.png", (200, 150))
+            tv_label = tk.Label(left_panel, image=self.tv_icon_photo)  # Use the correct PhotoImage object
+            tv_label.pack(pady=10)
         except FileNotFoundError:
-            self.tv_label = tk.Label(left_panel, text="[TV Image Missing]", bg="#f0f0f0", font=("Helvetica", 14))
-            self.tv_label.pack(pady=10)
+            tv_label = tk.Label(left_panel, text="[TV Image Missing]", bg="#f0f0f0", font=("Helvetica", 14))
+            tv_label.pack(pady=10)
 
         # On/Off toggle button
-        self.tv_state = False  # TV is initially off
-        self.toggle_button = tk.Button(
+        widgets["tv_toggle_button"] = tk.Button(
             left_panel,
             text="Off",
             bg="red",
@@ -614,10 +976,9 @@ class SmartHouseGUI(tk.Tk):
             font=("Helvetica", 12),
             width=20,
             height=5,
-            command=self.toggle_tv
+            command=lambda: self.toggle_tv(room)
         )
-        self.toggle_button.pack(pady=5)
-        self.apply_hover_effect(self.toggle_button, hover_bg="lightblue", normal_bg="red", hover_fg="black", normal_fg="white")
+        widgets["tv_toggle_button"].pack(pady=5)
 
         # Middle panel for Channel controls
         middle_panel = tk.Frame(frame, bg="#f0f0f0")
@@ -642,42 +1003,50 @@ class SmartHouseGUI(tk.Tk):
         volume_label.pack(pady=5)
 
         # Add the TV Volume Slider
-        self.tv_volume_slider = tk.Scale(
+        tv_volume_slider = tk.Scale(
             right_panel, from_=100, to=0, orient=tk.VERTICAL, length=250, width=75,  # Vertical slider
             font=("Helvetica", 10), bg="#f0f0f0", fg="#333333", 
             highlightbackground="#f0f0f0", troughcolor="#D3D3D3", activebackground="#4CAF50",
-            command=self.change_volume  # Use an appropriate method
+            command=lambda val: self.change_volume(room, val)
         )
-        self.tv_volume_slider.set(50)  # Default volume
-        self.tv_volume_slider.pack()
+        tv_volume_slider.pack()
+        widgets["tv_volume_slider"] = tv_volume_slider
 
         # Bind hover events for volume slider
-        self.tv_volume_slider.bind("<Enter>", lambda e: self.set_hovered_component(self.tv_volume_slider))
-        self.tv_volume_slider.bind("<Leave>", lambda e: self.clear_hovered_component())
+        tv_volume_slider.bind("<Enter>", lambda e: self.set_hovered_component(tv_volume_slider))
+        tv_volume_slider.bind("<Leave>", lambda e: self.clear_hovered_component())
+
+        self.render_media(room, "tv", self.devices.get(room, "tv"), MediaState.__slots__)
+        self.devices.subscribe(room, "tv", lambda state, changed: self.render_media(room, "tv", state, changed))
+
+    def render_media(self, room, device, state, changed):
+        """Update the On/Off button and volume slider of a room's TV or music system."""
+        widgets = self.room_widgets(room)
+        if "on" in changed:
+            button = widgets[f"{device}_toggle_button"]
+            button.config(text="On" if state.on else "Off", bg="green" if state.on else "red", fg="white")
+            self.apply_hover_effect(button, hover_bg="lightblue", normal_bg="green" if state.on else "red",
+                                    hover_fg="black", normal_fg="white")
+        if "volume" in changed:
+            widgets[f"{device}_volume_slider"].set(state.volume)
         
-    def toggle_tv(self):
+    def toggle_tv(self, room):
         """Toggle the TV on and off."""
-        self.tv_state = not self.tv_state
-        if self.tv_state:
-            self.toggle_button.config(text="On", bg="green", fg="white")
-            self.apply_hover_effect(self.toggle_button, hover_bg="lightblue", normal_bg="green", hover_fg="black", normal_fg="white")
-            FeedbackPopUp(self, "TV ON", duration=2000)
-
-        else:
-            self.toggle_button.config(text="Off", bg="red", fg="white")
-            self.apply_hover_effect(self.toggle_button, hover_bg="lightblue", normal_bg="red", hover_fg="black", normal_fg="white")
-            FeedbackPopUp(self, "TV OFF", duration=2000)
+        tv_on = not self.devices.get(room, "tv").on
+        self.devices.update(room, "tv", on=tv_on)
+        FeedbackPopUp(self, "TV ON" if tv_on else "TV OFF", duration=2000)
 
     def channel_up(self):
-        print("Channel Up")
+        log.info("Channel Up")
         FeedbackPopUp(self, "Channel Up", duration=2000)
 
     def channel_down(self):
-        print("Channel Down")
+        log.info("Channel Down")
         FeedbackPopUp(self, "Channel Down", duration=2000)
 
-    def change_volume(self, val):
-        print(f"Volume: {int(float(val))}")
+    def change_volume(self, room, val):
+        if self.devices.update(room, "tv", volume=int(float(val))):
+            log.debug("TV volume changed", extra={"room": room, "volume": int(float(val))})
 
 
     def add_ac_controls(self, window):
@@ -688,10 +1057,12 @@ class SmartHouseGUI(tk.Tk):
         for btn_text in buttons:
             tk.Button(frame, text=btn_text, width=15).pack(side=tk.LEFT, padx=5, pady=5)
 
-    def add_music_controls(self, window):
+    def add_music_controls(self, window, room):
         """Add Music System controls."""
         frame = tk.LabelFrame(window, text="Music System", font=("Helvetica", 16), bg="#f0f0f0", fg="#000000")
         frame.pack(pady=10, fill="x")
+        self.devices.add(room, "music", MediaState())
+        widgets = self.room_widgets(room)
 
         # Left panel for Icon and On/Off button
         left_panel = tk.Frame(frame, bg="#f0f0f0")
@@ -699,18 +1070,15 @@ class SmartHouseGUI(tk.Tk):
 
         # Load and display Music Icon
         try:
-            music_icon_path = os.path.join(self.icons_folder, "music_icon.png")  # Ensure you have this file
-            self.music_icon = Image.open(music_icon_path).resize((200, 200), Image.LANCZOS)  # Resize the image
-            self.music_icon_photo = ImageTk.PhotoImage(self.music_icon)
-            self.music_icon_label = tk.Label(left_panel, image=self.music_icon_photo, bg="#f0f0f0")
-            self.music_icon_label.pack(pady=10)
+            self.music_icon_photo = self.icons.get("music_icon.png", (200, 200))  # Ensure you have this file
+            music_icon_label = tk.Label(left_panel, image=self.music_icon_photo, bg="#f0f0f0")
+            music_icon_label.pack(pady=10)
         except FileNotFoundError:
-            self.music_icon_label = tk.Label(left_panel, text="[Music Icon Missing]", bg="#f0f0f0", font=("Helvetica", 12))
-            self.music_icon_label.pack(pady=10)
+            music_icon_label = tk.Label(left_panel, text="[Music Icon Missing]", bg="#f0f0f0", font=("Helvetica", 12))
+            music_icon_label.pack(pady=10)
 
         # On/Off button
-        self.music_state = False  # Music system initially off
-        self.music_toggle_button = tk.Button(
+        widgets["music_toggle_button"] = tk.Button(
             left_panel,
             text="Off",
             bg="red",
@@ -718,10 +1086,9 @@ class SmartHouseGUI(tk.Tk):
             font=("Helvetica", 12),
             width=20,
             height=5,
-            command=self.toggle_music
+            command=lambda: self.toggle_music(room)
         )
-        self.music_toggle_button.pack(pady=5)
-        self.apply_hover_effect(self.music_toggle_button, hover_bg="lightblue", normal_bg="red", hover_fg="black", normal_fg="white")
+        widgets["music_toggle_button"].pack(pady=5)
 
         # Middle panel for volume controls
         middle_panel = tk.Frame(frame, bg="#f0f0f0")
@@ -730,18 +1097,18 @@ class SmartHouseGUI(tk.Tk):
         volume_label = tk.Label(middle_panel, text="Volume", bg="#f0f0f0", font=("Helvetica", 12))
         volume_label.pack(pady=5)
 
-        self.music_volume_slider = tk.Scale(
+        music_volume_slider = tk.Scale(
             middle_panel, from_=100, to=0, orient=tk.VERTICAL, length=250, width=75,  # Vertical slider
             font=("Helvetica", 10), bg="#f0f0f0", fg="#333333", 
             highlightbackground="#f0f0f0", troughcolor="#D3D3D3", activebackground="#4CAF50",
-            command=self.change_music_volume  # Calls method to adjust music volume
+            command=lambda val: self.change_music_volume(room, val)  # Calls method to adjust music volume
         )
-        self.music_volume_slider.set(50)  # Default volume level
-        self.music_volume_slider.pack()
+        music_volume_slider.pack()
+        widgets["music_volume_slider"] = music_volume_slider
 
         # Add hover effects to the slider
-        self.music_volume_slider.bind("<Enter>", lambda e: self.set_hovered_component(self.music_volume_slider))
-        self.music_volume_slider.bind("<Leave>", lambda e: self.clear_hovered_component())
+        music_volume_slider.bind("<Enter>", lambda e: self.set_hovered_component(music_volume_slider))
+        music_volume_slider.bind("<Leave>", lambda e: self.clear_hovered_component())
 
 
         # Right panel for song controls
@@ -773,42 +1140,38 @@ class SmartHouseGUI(tk.Tk):
         next_button.pack(side=tk.LEFT, padx=5)
         self.apply_hover_effect(next_button, hover_bg="lightblue", normal_bg="SystemButtonFace")
 
+        self.render_media(room, "music", self.devices.get(room, "music"), MediaState.__slots__)
+        self.devices.subscribe(room, "music", lambda state, changed: self.render_media(room, "music", state, changed))
+
     def set_hovered_component(self, component):
         self.hovered_component = component
-        print(f"Hovered over: {component}")
+        log.debug("Hovered over: %s", component)
 
     def clear_hovered_component(self):
         self.hovered_component = None
-        print("No component hovered.")
+        log.debug("No component hovered.")
 
-    def toggle_music(self):
+    def toggle_music(self, room):
         """Toggle the music system on and off."""
-        self.music_state = not self.music_state
-        if self.music_state:
-            self.music_toggle_button.config(text="On", bg="green", fg="white")
-            self.apply_hover_effect(self.music_toggle_button, hover_bg="lightblue", normal_bg="green", hover_fg="black", normal_fg="white")
-            print("Music System: On")
-            FeedbackPopUp(self, "Music System: On", duration=2000)
+        music_on = not self.devices.get(room, "music").on
+        self.devices.update(room, "music", on=music_on)
+        log.info("Music System: %s", "On" if music_on else "Off", extra={"room": room})
+        FeedbackPopUp(self, f"Music System: {'On' if music_on else 'Off'}", duration=2000)
 
-        else:
-            self.music_toggle_button.config(text="Off", bg="red", fg="white")
-            self.apply_hover_effect(self.music_toggle_button, hover_bg="lightblue", normal_bg="red", hover_fg="black", normal_fg="white")
-            print("Music System: Off")
-            FeedbackPopUp(self, "Music System: Off", duration=2000)
-
-    def change_music_volume(self, val):
+    def change_music_volume(self, room, val):
         """Adjust the music volume."""
         volume = int(float(val))
-        print(f"Music Volume: {volume}")
+        if self.devices.update(room, "music", volume=volume):
+            log.debug("Music volume changed", extra={"room": room, "volume": volume})
 
     def next_song(self):
         """Skip to the next song."""
-        print("Playing Next Song")
+        log.info("Playing Next Song")
         FeedbackPopUp(self, "Playing Next Song", duration=2000)
 
     def previous_song(self):
         """Play the previous song."""
-        print("Playing Previous Song")
+        log.info("Playing Previous Song")
         FeedbackPopUp(self, "Playing Previous Song", duration=2000)
 
     def add_vacuum_controls(self, window):
@@ -819,35 +1182,32 @@ class SmartHouseGUI(tk.Tk):
         for btn_text in buttons:
             tk.Button(frame, text=btn_text, width=15).pack(side=tk.LEFT, padx=5, pady=5)
 
-    def add_appliance_controls(self, window, appliance_name, button_texts):
+    def add_appliance_controls(self, window, appliance_name, button_texts, room):
         """Add controls for a specific appliance with 'On' and 'Off' buttons."""
         frame = tk.LabelFrame(window, text=appliance_name, font=("Helvetica", 16), bg="#f0f0f0", fg="#000000")
         frame.pack(pady=10, fill="x")
 
-        # State tracking for the button
-        if not hasattr(self, 'appliance_states'):
-            self.appliance_states = {}  # Initialize state dictionary if it doesn't exist
-
-        # Set initial state to False (Off) for the appliance
-        self.appliance_states[appliance_name] = False
+        # Initial state is Off for the appliance
+        self.devices.add(room, appliance_name, ApplianceState())
 
         # Create the button
         button = tk.Button(
             frame, text="Off", width=15, bg="red", fg="white",
-            command=lambda: self.toggle_button_state(button, appliance_name)
+            command=lambda: self.toggle_button_state(room, appliance_name)
         )
         button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.room_widgets(room)[appliance_name] = button
 
-        # Apply hover effect
-        self.apply_hover_effect(button, hover_bg="lightgreen", normal_bg="red", hover_fg="black", normal_fg="white")
+        self.render_appliance(button, self.devices.get(room, appliance_name), ApplianceState.__slots__)
+        self.devices.subscribe(room, appliance_name, lambda state, changed: self.render_appliance(button, state, changed))
 
-    def toggle_button_state(self, btn, name):
-        """Toggle the state of the button and change its appearance."""
-        # Toggle the appliance state
-        current_state = self.appliance_states.get(name, False)
-        self.appliance_states[name] = not current_state
+    def toggle_button_state(self, room, name):
+        """Toggle the state of an appliance."""
+        self.devices.update(room, name, on=not self.devices.get(room, name).on)
 
-        if self.appliance_states[name]:  # If appliance is On
+    def render_appliance(self, btn, state, changed):
+        """Change the appearance of an appliance button to match its state."""
+        if state.on:  # If appliance is On
             btn.config(text="On", bg="green", fg="white")
             self.apply_hover_effect(btn, hover_bg="lightblue", normal_bg="green", hover_fg="black", normal_fg="white")
         else:  # If appliance is Off
@@ -864,20 +1224,16 @@ class SmartHouseGUI(tk.Tk):
         """Revert button background color when not hovering."""
         button.config(bg=default_bg)
 
-    def add_thermostat_controls(self, window):
+    def add_thermostat_controls(self, window, room):
         """Add thermostat controls with Temperature, Mode, Fan, and a centered fan icon."""
         frame = tk.LabelFrame(window, text="Thermostat", font=("Helvetica", 16), bg="#f0f0f0", fg="#000000")
         frame.pack(pady=10, fill="x")
 
-        # Initialize current fan state
-        self.current_fan_state = "low"
+        # Initial thermostat state (fan on low)
+        self.devices.add(room, "thermostat", ThermostatState())
+        widgets = self.room_widgets(room)
         # Initialize fan icons dictionary
-        self.fan_icons = {
-            "low": os.path.join(self.icons_folder, "fan_on_low_icon.png"),
-            "medium": os.path.join(self.icons_folder, "fan_on_medium_icon.png"),
-            "high": os.path.join(self.icons_folder, "fan_on_high_icon.png"),
-            "off": os.path.join(self.icons_folder, "fan_off_icon.png"),
-        }
+        self.fan_icons = FAN_ICONS
 
         # Create a container frame for the layout
         layout_frame = tk.Frame(frame, bg="#f0f0f0")
@@ -888,19 +1244,19 @@ class SmartHouseGUI(tk.Tk):
         temp_frame.grid(row=0, column=0, padx=10)
 
         tk.Label(temp_frame, text="Temperature", font=("Helvetica", 14), bg="#f0f0f0").pack(pady=5)
-        self.temp_slider = tk.Scale(
+        temp_slider = tk.Scale(
             temp_frame, from_=32, to=18, orient=tk.VERTICAL, length=200, width=100,
             bg="#f0f0f0", troughcolor="#d3d3d3", activebackground="#4CAF50",
-            font=("Helvetica", 10), command=self.update_temperature
+            font=("Helvetica", 10), command=lambda value: self.update_temperature(room, value)
         )
-        self.temp_slider.set(22)  # Default temperature
-        self.temp_slider.pack(pady=5)
+        temp_slider.pack(pady=5)
+        widgets["temp_slider"] = temp_slider
 
-        self.temp_label = tk.Label(temp_frame, text="22°C", font=("Helvetica", 14), bg="#f0f0f0")
-        self.temp_label.pack(pady=5)
+        widgets["temp_label"] = tk.Label(temp_frame, text="22°C", font=("Helvetica", 14), bg="#f0f0f0")
+        widgets["temp_label"].pack(pady=5)
         # Bind hover events to set or clear hovered component
-        self.temp_slider.bind("<Enter>", lambda e: self.set_hovered_component(self.temp_slider))
-        self.temp_slider.bind("<Leave>", lambda e: self.clear_hovered_component())
+        temp_slider.bind("<Enter>", lambda e: self.set_hovered_component(temp_slider))
+        temp_slider.bind("<Leave>", lambda e: self.clear_hovered_component())
 
         # Column 2: Mode Control
         mode_frame = tk.Frame(layout_frame, bg="#f0f0f0")
@@ -908,14 +1264,14 @@ class SmartHouseGUI(tk.Tk):
 
         tk.Label(mode_frame, text="Mode", font=("Helvetica", 14), bg="#f0f0f0").pack(pady=5)
 
-        self.mode_buttons = {}
+        widgets["mode_buttons"] = {}
         for mode, color in [("Heating", "orange"), ("Cooling", "light blue"), ("Auto", "light green")]:
             button = tk.Button(
                 mode_frame, text=mode, bg=color, font=("Helvetica", 25),
-                command=lambda m=mode: self.set_mode(m)
+                command=lambda m=mode: self.set_mode(room, m)
             )
             button.pack(pady=5, fill=tk.X)
-            self.mode_buttons[mode] = button
+            widgets["mode_buttons"][mode] = button
 
             # Add hover effect
             button.bind("<Enter>", lambda e, btn=button, hover_bg="#ffcccb": self.on_hover(e, btn, hover_bg))
@@ -927,96 +1283,102 @@ class SmartHouseGUI(tk.Tk):
 
         tk.Label(fan_frame, text="Fan", font=("Helvetica", 14), bg="#f0f0f0").pack(pady=5)
 
-        self.fan_buttons = {}
+        widgets["fan_buttons"] = {}
         for state in ["Low", "Medium", "High", "Off"]:
             button = tk.Button(
                 fan_frame, text=state, font=("Helvetica", 20),
-                command=lambda s=state.lower(): self.set_fan_state(s)
+                command=lambda s=state.lower(): self.set_fan_state(room, s)
             )
             button.pack(pady=5, fill=tk.X)
-            self.fan_buttons[state.lower()] = button
+            widgets["fan_buttons"][state.lower()] = button
 
             # Add hover effect
             button.bind("<Enter>", lambda e, btn=button, hover_bg="#ffcccb": self.on_hover(e, btn, hover_bg))
             button.bind("<Leave>", lambda e, btn=button, default_bg="#f0f0f0": self.on_leave(e, btn, default_bg))
 
-        # Highlight default fan state
-        self.highlight_fan_button("low")
-
         # Center Fan Icon
         fan_icon_frame = tk.Frame(layout_frame, bg="#f0f0f0")
         fan_icon_frame.grid(row=0, column=2, padx=50)
 
-        self.fan_icon_label = tk.Label(fan_icon_frame, bg="#f0f0f0")
-        self.update_fan_icon()
-        self.fan_icon_label.pack(pady=5)
+        widgets["fan_icon_label"] = tk.Label(fan_icon_frame, bg="#f0f0f0")
+        widgets["fan_icon_label"].pack(pady=5)
+
+        # Show the stored state (default temperature 22, fan low) and follow its changes
+        self.render_thermostat(room, self.devices.get(room, "thermostat"), ThermostatState.__slots__)
+        self.devices.subscribe(room, "thermostat", lambda state, changed: self.render_thermostat(room, state, changed))
+
+    def render_thermostat(self, room, state, changed):
+        """Update the thermostat widgets of a room for the changed state fields."""
+        widgets = self.room_widgets(room)
+        if "temperature" in changed:
+            widgets["temp_slider"].set(state.temperature)
+            widgets["temp_label"].config(text=f"{state.temperature}°C")
+        if "mode" in changed:
+            for mode, button in widgets["mode_buttons"].items():
+                button.config(relief=tk.SUNKEN if mode == state.mode else tk.RAISED)
+        if "fan" in changed:
+            self.update_fan_icon(room)
+            self.highlight_fan_button(room, state.fan)
 
     def load_and_resize_icon(self, filename, width, height):
         """Load and resize an image file."""
         try:
-            image_path = os.path.join(self.icons_folder, filename)
-            img = Image.open(image_path)  # Open the image file
-            img = img.resize((width, height), Image.Resampling.LANCZOS)  # Resize the image
-            return ImageTk.PhotoImage(img)  # Convert to PhotoImage for tkinter
+            return self.icons.get(filename, (width, height))
         except Exception as e:
-            print(f"Error loading fan icon: {e}")
+            log.warning("Error loading fan icon: %s", e)
             return None  # Return None if there's an error
 
-    def update_temperature(self, value):
-        """Update the temperature label dynamically."""
-        self.temp_label.config(text=f"{int(float(value))}°C")
+    def update_temperature(self, room, value):
+        """Update the stored temperature when the slider moves."""
+        self.devices.update(room, "thermostat", temperature=int(float(value)))
 
-    def set_mode(self, mode):
+    def set_mode(self, room, mode):
         """Update the mode state and print the current selection."""
-        for button in self.mode_buttons.values():
-            button.config(relief=tk.RAISED)
-        self.mode_buttons[mode].config(relief=tk.SUNKEN)
-        print(f"Mode set to: {mode}")
+        self.devices.update(room, "thermostat", mode=mode)
+        log.info("Mode set to: %s", mode, extra={"room": room})
         FeedbackPopUp(self, f"Mode set to: {mode}", duration=2000)
 
 
-    def set_fan_state(self, state):
-        """Update the fan state and icon dynamically."""
-        self.current_fan_state = state
-        self.update_fan_icon()
-        self.highlight_fan_button(state)
-        print(f"Fan set to: {state.capitalize()}")
+    def set_fan_state(self, room, state):
+        """Update the fan state; the subscribed view updates the icon and buttons."""
+        self.devices.update(room, "thermostat", fan=state)
+        log.info("Fan set to: %s", state.capitalize(), extra={"room": room})
         FeedbackPopUp(self, f"Fan set to: {state.capitalize()}", duration=2000)
 
 
-    def update_fan_icon(self, width=185, height=185):
+    def update_fan_icon(self, room, width=185, height=185):
         """Update the displayed fan icon based on the current state and specified size."""
+        fan_state = self.devices.get(room, "thermostat").fan
+        fan_icon_label = self.room_widgets(room)["fan_icon_label"]
         try:
-            # Retrieve the file path for the current fan state
-            img_path = self.fan_icons.get(self.current_fan_state)
-            
-            if not img_path:
-                raise FileNotFoundError(f"Icon for state '{self.current_fan_state}' not found.")
+            # Retrieve the file name for the current fan state
+            icon_file = self.fan_icons.get(fan_state)
             
-            # Open and resize the image
-            img = Image.open(img_path).resize((width, height), Image.Resampling.LANCZOS)
+            if not icon_file:
+                raise FileNotFoundError(f"Icon for state '{fan_state}' not found.")
             
-            # Convert the resized image to a PhotoImage for tkinter
-            self.fan_icon = ImageTk.PhotoImage(img)
+            # Fetch the resized PhotoImage from the icon cache
+            fan_icon = self.icons.get(icon_file, (width, height))
             
             # Update the fan icon label with the new image
-            self.fan_icon_label.config(image=self.fan_icon)
+            fan_icon_label.config(image=fan_icon)
+            fan_icon_label.image = fan_icon  # Keep a reference to avoid garbage collection
         except FileNotFoundError as fnfe:
-            print(f"File not found: {fnfe}")
-            self.fan_icon_label.config(text="Icon Missing", image="")
+            log.warning("File not found: %s", fnfe)
+            fan_icon_label.config(text="Icon Missing", image="")
         except Exception as e:
-            print(f"Error updating fan icon: {e}")
-            self.fan_icon_label.config(text="Error", image="")
+            log.warning("Error updating fan icon: %s", e)
+            fan_icon_label.config(text="Error", image="")
 
     def continuously_adjust_value(self, gesture):
         if not self.hovered_component:
-            print("No hovered component to adjust.")
+            log.debug("No hovered component to adjust.")
             return
 
         def adjust():
             try:
                 if not self.hovered_component:
-                    print("Lost hover, reassigning hovered component.")
+                    log.debug("Lost hover, reassigning hovered component.")
                     return  # Stop adjustment if hover is lost
 
                 current_value = self.hovered_component.get()
@@ -1028,29 +1390,73 @@ class SmartHouseGUI(tk.Tk):
                     return  # Exit if the gesture is invalid
 
                 self.hovered_component.set(new_value)
-                print(f"Value adjusted to {new_value}")
+                log.debug("Value adjusted", extra={"value": new_value, **SAMPLED})
 
                 # Explicitly reassign the hovered component to keep focus
                 self.set_hovered_component(self.hovered_component)
 
-                # Continue adjustment if the same gesture persists
-                if self.last_gesture == gesture:
-                    self.after(250, adjust)  # Repeat every 100 ms
-            except Exception as e:
-                print(f"Error adjusting value: {e}")
+                # Continue adjustment until the gesture is released
+                if self.active_gesture == gesture:
+                    self.after(250, adjust)  # Repeat every 250 ms
+            except Exception:
+                log.exception("Error adjusting value")
 
         adjust()
 
-    def highlight_fan_button(self, state):
+    def highlight_fan_button(self, room, state):
         """Highlight the active fan button."""
-        for s, button in self.fan_buttons.items():
+        for s, button in self.room_widgets(room)["fan_buttons"].items():
             button.config(relief=tk.SUNKEN if s == state else tk.RAISED)
 
 
 if __name__ == "__main__":
+    # SMARTHOUSE_LOG_LEVEL sets the log level; SMARTHOUSE_LOG_RING names a folder for post-mortem ring buffers
+    log_level = os.environ.get("SMARTHOUSE_LOG_LEVEL", "INFO")
+    ring_folder = os.environ.get("SMARTHOUSE_LOG_RING")
+    configure_logging(log_level, ring_buffer=os.path.join(ring_folder, "gui.ring") if ring_folder else None)
+    # SMARTHOUSE_METRICS_PORT serves the GUI metrics on that localhost port and the recognizer's on the next one;
+    # SMARTHOUSE_METRICS_DIR writes them to gui.prom and recognizer.prom in that folder
+    metrics_port = int(os.environ["SMARTHOUSE_METRICS_PORT"]) if os.environ.get("SMARTHOUSE_METRICS_PORT") else None
+    metrics_folder = os.environ.get("SMARTHOUSE_METRICS_DIR")
+    # SMARTHOUSE_GESTURE_MODEL names a model trained with gesture_model.py; the rule cascade is used otherwise
+    classifier = os.environ.get("SMARTHOUSE_GESTURE_MODEL", "rules")
+    # SMARTHOUSE_INPUT=os moves the OS pointer and clicks with pyautogui instead of the in-app pointer
+    input_backend = os.environ.get("SMARTHOUSE_INPUT", "app")
+    # SMARTHOUSE_DWELL sets the in-app pointer's dwell-to-click time in seconds; 0 turns it off
+    dwell_time = float(os.environ.get("SMARTHOUSE_DWELL", "0.8")) or None
+
     queue = Queue()
-    p = Process(target=gesture_recognition, args=(queue,))
+    window_bounds = Array("i", 4)  # (x1, y1, x2, y2) of the GUI window, all zeros until it is mapped
+    stop_recognition = Event()
+    hand_channel = HandChannel()  # Latest landmarks and cursor, shared with the recognizer
+    recognizer_options = {
+        "threaded": True,
+        "bounds": window_bounds,
+        "roi": True,
+        "governor": FrameGovernor(),
+        "preview": None,  # Headless; use "debug" to watch the camera feed at a capped rate
+        "stop": stop_recognition,
+        "hand_channel": hand_channel.name,
+        "classifier": classifier,
+        "input_backend": input_backend,
+        "log_config": {
+            "level": log_level,
+            "ring_buffer": os.path.join(ring_folder, "recognizer.ring") if ring_folder else None,
+        },
+        "metrics_config": {
+            "port": metrics_port + 1 if metrics_port else None,
+            "textfile": os.path.join(metrics_folder, "recognizer.prom") if metrics_folder else None,
+        },
+    }
+    p = Process(target=gesture_recognition, args=(queue,), kwargs=recognizer_options)
     p.start()
-    app = SmartHouseGUI()
+    exporter = start_exporter(port=metrics_port, prefix="gui_",
+                              textfile=os.path.join(metrics_folder, "gui.prom") if metrics_folder else None)
+    app = SmartHouseGUI(queue, window_bounds=window_bounds, hand_channel=hand_channel.name,
+                        input_backend=input_backend, dwell_time=dwell_time)
     app.mainloop()
-    p.join()
\ No newline at end of file
+    stop_recognition.set()
+    p.join()
+    hand_channel.close()
+    exporter.stop()
+    shutdown_logging()
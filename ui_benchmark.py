@@ -0,0 +1,216 @@
+"""
+Benchmarks for SmartHouseGUI (needs a display; Xvfb works).
+
+Examples:
+    python ui_benchmark.py pages              # page-build time and icon cache hit rate
+    python ui_benchmark.py pages --no-cache   # the same without the icon cache, for comparison
+    python ui_benchmark.py navigation         # first visit vs. revisit latency of every screen
+    python ui_benchmark.py idle               # CPU used by the idle GUI event loop
+    python ui_benchmark.py startup            # time to first frame (build icons.atlas first)
+    python ui_benchmark.py startup --no-atlas # time to first frame decoding the original icons
+    python ui_benchmark.py import             # import time of ui.py and gestures.py in a fresh interpreter
+    python ui_benchmark.py pointer            # hover and click latency of the in-app vs. the OS pointer
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from functools import partial
+from multiprocessing import Queue
+
+from benchmark import summarize
+from hand_channel import HandChannel, HandChannelWriter
+from ui import ROOMS, SmartHouseGUI
+
+
+def time_page(app, build):
+    """Build a page and return the seconds until Tk has laid it out."""
+    start = time.perf_counter()
+    build()
+    app.update_idletasks()
+    return time.perf_counter() - start
+
+
+def discard_screens(app):
+    """Destroy the GUI's retained screens, so the next navigation builds its page from scratch."""
+    for screen in app.screens.values():
+        screen.destroy()
+    app.screens.clear()
+    app.screen_callbacks.clear()
+    app.devices.unsubscribe_all()  # The rebuilt screens subscribe again; keep no callbacks into dead widgets
+    app.widgets.clear()
+    app.room_canvases.clear()
+    app.current_screen = None
+    app.active_canvas = None
+
+
+def benchmark_pages(app, rounds, retain=False):
+    """
+    Show every page of the GUI repeatedly.
+    :param app: SmartHouseGUI instance.
+    :param rounds: Number of passes over all pages.
+    :param retain: Keep the retained screens between visits (first visit builds, later ones swap
+        frames); otherwise every visit builds its page from scratch.
+    :return: Dict mapping page name to the list of times in seconds.
+    """
+    pages = [("main menu", app.show_main_menu), ("room list", app.open_room_list)]
+    pages += [(room, partial(app.on_room_click, room)) for room in ROOMS]
+    timings = {name: [] for name, _ in pages}
+    for _ in range(rounds):
+        for name, build in pages:
+            if not retain:
+                discard_screens(app)
+            timings[name].append(time_page(app, build))
+    return timings
+
+
+def measure_idle_cpu(app, seconds):
+    """
+    Run the Tk event loop without input and return the CPU time it used as a fraction of wall time.
+    """
+    app.after(int(seconds * 1000), app.quit)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    app.mainloop()
+    return (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+
+
+def format_navigation(timings):
+    """Split page timings into the first visit (build) and later visits (retained screen swap)."""
+    lines = [f"{'page':<16}{'first ms':>10}{'revisit mean ms':>18}{'revisit p95 ms':>17}"]
+    for name, samples in timings.items():
+        revisits = summarize(samples[1:])
+        lines.append(f"{name:<16}{samples[0] * 1000:>10.2f}{revisits['mean']:>18.2f}{revisits['p95']:>17.2f}")
+    return "\n".join(lines)
+
+
+def time_to_first_frame(use_atlas):
+    """Return the seconds from creating SmartHouseGUI until its first screen and warm-up are drawn."""
+    start = time.perf_counter()
+    app = SmartHouseGUI(Queue(), use_atlas=use_atlas)
+    app.update()  # Draws the main menu and runs the after_idle icon warm-up
+    elapsed = time.perf_counter() - start
+    app.on_close()
+    return elapsed
+
+
+def time_import(module, rounds):
+    """
+    Import a module in fresh interpreters.
+    :return: List of import times in seconds, without the interpreter start-up time.
+    """
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return time.perf_counter() - start
+
+    baseline = min(run("pass") for _ in range(rounds))
+    return [run(f"import {module}") - baseline for _ in range(rounds)]
+
+
+def visible_buttons(widget):
+    """Return the mapped tk.Button widgets below a widget."""
+    buttons = []
+    for child in widget.winfo_children():
+        if child.winfo_class() == "Button" and child.winfo_ismapped():
+            buttons.append(child)
+        buttons.extend(visible_buttons(child))
+    return buttons
+
+
+def benchmark_pointer(rounds):
+    """
+    Move the gesture cursor over every button of the room list and click it, once with the in-app
+    pointer (cursor published on the hand channel, hit-testing and invoke() in the GUI) and once
+    with the OS backend (pyautogui moveTo and click).
+    :return: Dict mapping "<backend> hover" / "<backend> click" to lists of latencies in seconds.
+    """
+    import pyautogui
+
+    channel = HandChannel()
+    writer = HandChannelWriter(channel.name)
+    app = SmartHouseGUI(Queue(), warm_up_icons=False, hand_channel=channel.name, input_backend="app")
+    app.open_room_list()
+    app.update()
+    timings = {"app hover": [], "app click": [], "os hover": [], "os click": []}
+    for _ in range(rounds):
+        for button in visible_buttons(app.screens["room list"]):
+            x = button.winfo_rootx() + button.winfo_width() // 2
+            y = button.winfo_rooty() + button.winfo_height() // 2
+
+            start = time.perf_counter()
+            writer.publish([], (x, y))
+            while app.pointer_widget is not button and time.perf_counter() - start < 1.0:
+                app.update()
+            timings["app hover"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            app.click()
+            app.update_idletasks()
+            timings["app click"].append(time.perf_counter() - start)
+            app.open_room_list()
+
+            start = time.perf_counter()
+            pyautogui.moveTo(x, y)
+            app.update()
+            timings["os hover"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            pyautogui.click()
+            app.update()
+            timings["os click"].append(time.perf_counter() - start)
+            app.open_room_list()
+            app.update()
+    app.on_close()
+    writer.close()
+    channel.close()
+    return timings
+
+
+def format_timings(timings):
+    lines = [f"{'page':<16}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}"]
+    for name, samples in timings.items():
+        stats = summarize(samples)
+        lines.append(f"{name:<16}{stats['mean']:>10.2f}{stats['p50']:>10.2f}{stats['p95']:>10.2f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SmartHouseGUI.")
+    parser.add_argument("mode", choices=["pages", "navigation", "startup", "idle", "import", "pointer"])
+    parser.add_argument("--rounds", type=int, default=5, help="Passes over all pages")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the icon cache")
+    parser.add_argument("--no-atlas", action="store_true", help="Ignore icons/icons.atlas")
+    parser.add_argument("--seconds", type=float, default=30, help="Idle measurement duration")
+    args = parser.parse_args()
+
+    if args.mode == "import":
+        print(format_timings({module: time_import(module, args.rounds) for module in ("gestures", "ui")}))
+        return
+
+    if args.mode == "pointer":
+        print(format_timings(benchmark_pointer(args.rounds)))
+        return
+
+    if args.mode == "startup":
+        samples = [time_to_first_frame(not args.no_atlas) for _ in range(args.rounds)]
+        print(format_timings({"first frame": samples}))
+        return
+
+    app = SmartHouseGUI(Queue(), warm_up_icons=False, use_atlas=not args.no_atlas)
+    if args.no_cache:
+        app.icons.max_entries = 0
+    app.update()
+
+    if args.mode == "idle":
+        print(f"Idle CPU: {measure_idle_cpu(app, args.seconds) * 100:.2f}% of one core over {args.seconds:.0f} s")
+        app.on_close()
+        return
+
+    timings = benchmark_pages(app, args.rounds, retain=args.mode == "navigation")
+    print(format_navigation(timings) if args.mode == "navigation" else format_timings(timings))
+    print(f"Icon cache: {app.icons.stats()}")
+    app.on_close()
+
+
+if __name__ == "__main__":
+    main()